@@ -8,11 +8,35 @@ from routes.rdg_routes import bp_rdg
 from routes.log_routes import log_bp
 
 import os
+import threading
 
 os.environ["PYTHON_ORACLEDB_THIN"] = "1"     # 무조건 Thin
 for k in ("ORACLE_HOME", "TNS_ADMIN", "TWO_TASK", "LOCAL"):
     os.environ.pop(k, None)                  # TNS/Thick 경로 강제 차단
 
+def _init_mongo_indexes(app):
+    """
+    워커 기동 시 MongoTxService 싱글톤 생성 + ensure_indexes 1회.
+    MONGO_INDEX_ADVISOR=report|create 이면 템플릿 explain 점검(+ 빠진 인덱스 생성)도 이어서.
+    Mongo가 아직 안 떠 있어도 앱 기동을 막지 않도록 백그라운드에서 실행.
+    """
+    mode = app.config.get("MONGO_INDEX_ADVISOR", "off")
+
+    def _run():
+        from services.mongo_tx_service import get_mongo_tx_service
+        try:
+            with app.app_context():
+                svc = get_mongo_tx_service()
+                svc.ensure_indexes()
+            print("[FLASK] mongo indexes ready")
+            if mode in ("report", "create"):
+                from services.mongo_index_advisor import advise, format_report
+                report = advise(svc.db, create=(mode == "create"))
+                print("[FLASK] mongo index advisor\n" + "\n".join(format_report(report)))
+        except Exception as e:
+            print(f"[FLASK] mongo index init skipped: {e}")
+    threading.Thread(target=_run, name="mongo-init", daemon=True).start()
+
 def create_app():
     app = Flask(__name__)
     CORS(app) #CORS 허용
@@ -24,6 +48,22 @@ def create_app():
     app.register_blueprint(bp_rdg, url_prefix="/rdg")
     app.register_blueprint(log_bp)
 
+    # 쿼리 템플릿 선로드 (요청 경로에서 파일 I/O 제거)
+    from services.file_sql_service import templates
+    templates.reload_sec = app.config.get("TEMPLATE_RELOAD_SEC", 2)
+    templates.refresh(force=True)
+
+    from services.result_cache import result_cache
+    result_cache.max_entries = app.config.get("RESULT_CACHE_MAX_ENTRIES", 256)
+    result_cache.invalidate_procs = {p.lower() for p in app.config.get("RESULT_CACHE_INVALIDATE_PROCS", [])}
+
+    if app.config.get("HOLD_SWEEP_INTERVAL_SEC", 0) > 0:
+        from services.hold_sweeper import sweeper
+        sweeper.start(app)
+
+    if app.config.get("MONGO_INIT_INDEXES") or app.config.get("MONGO_INDEX_ADVISOR", "off") != "off":
+        _init_mongo_indexes(app)
+
     # ---- /healthz (liveness) ----
     @app.get("/healthz")
     def healthz():
@@ -0,0 +1,117 @@
+# BE/async_app.py
+"""
+프로시저 엔드포인트 async 서버 (aiohttp).
+/db/proc/exec, /mongo_proc/* 를 sync 앱(app.py)과 같은 요청/응답 형식으로 제공한다.
+워커 1개가 이벤트 루프 하나로 수백 개의 in-flight 호출을 처리 (sync gunicorn 워커는 1개씩).
+
+실행:  cd BE && python async_app.py            (ASYNC_PORT, 기본 5001)
+       gunicorn --chdir BE "async_app:create_app()" --worker-class aiohttp.GunicornWebWorker
+"""
+import datetime as _dt
+import decimal
+import json
+import uuid
+from functools import partial
+
+from aiohttp import web
+from werkzeug.http import http_date
+
+from config.settings import load_config
+from db.async_adapters import AsyncAdapterRegistry
+from services.proc_service import exec_proc_async
+
+# sync 앱의 mongo_proc 라우트 → MongoTxService 메서드
+MONGO_OPS = {
+    "remittance/hold": "remittance_hold",
+    "receive/prepare": "receive_prepare",
+    "confirm/debit/local": "confirm_debit_local",
+    "confirm/credit/local": "confirm_credit_local",
+    "transfer/confirm/internal": "transfer_confirm_internal",
+    "remittance/release": "remittance_release",
+}
+
+REGISTRY = web.AppKey("registry", AsyncAdapterRegistry)
+CONFIG = web.AppKey("config", dict)
+
+
+class _Config:
+    """load_config(app)가 app.config 만 쓰므로 Flask 없이 설정만 로드"""
+    def __init__(self):
+        self.config = {}
+
+
+def _default(o):
+    # Flask 기본 JSON provider와 같은 변환 (응답 포맷을 sync 앱과 맞춤)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if isinstance(o, (_dt.date, _dt.datetime)):
+        return http_date(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+_dumps = partial(json.dumps, default=_default, sort_keys=True)
+
+
+def ok(data, status: int = 200):
+    return web.json_response({"ok": True, "data": data}, status=status, dumps=_dumps)
+
+def fail(message: str, status: int = 400):
+    return web.json_response({"ok": False, "error": message}, status=status, dumps=_dumps)
+
+
+async def _json_body(request: web.Request):
+    try:
+        return await request.json() or {}
+    except json.JSONDecodeError:
+        return {}
+
+
+async def proc_exec(request: web.Request):
+    try:
+        d = await _json_body(request)
+        adapter = request.app[REGISTRY].get(d.get("dbms"))
+        return ok(await exec_proc_async(d, adapter))
+    except Exception as e:
+        return fail(str(e), 400)
+
+
+async def mongo_proc(request: web.Request):
+    method = MONGO_OPS.get(request.match_info["op"])
+    if method is None:
+        return fail("Not Found", 404)
+    try:
+        body = await _json_body(request)
+        return ok(await request.app[REGISTRY].get("mongo").run(method, body))
+    except Exception as e:
+        return fail(str(e), 400)
+
+
+async def healthz(request: web.Request):
+    return web.json_response({"status": "ok", "server": "async"})
+
+
+async def db_pools(request: web.Request):
+    return ok(request.app[REGISTRY].stats())
+
+
+async def _close_registry(app: web.Application):
+    await app[REGISTRY].close()
+
+
+def create_app() -> web.Application:
+    cfg = _Config()
+    load_config(cfg)
+
+    app = web.Application()
+    app[REGISTRY] = AsyncAdapterRegistry(cfg.config)
+    app[CONFIG] = cfg.config
+    app.router.add_post("/db/proc/exec", proc_exec)
+    app.router.add_post("/mongo_proc/{op:.+}", mongo_proc)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/system/db-pools", db_pools)
+    app.on_cleanup.append(_close_registry)
+    return app
+
+
+if __name__ == "__main__":
+    application = create_app()
+    web.run_app(application, host="0.0.0.0", port=application[CONFIG]["ASYNC_PORT"])
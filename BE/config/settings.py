@@ -14,6 +14,18 @@ def _env_int(key: str, default: int) -> int:
     except (TypeError, ValueError):
         return default
 
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float(os.getenv(key, default))
+    except (TypeError, ValueError):
+        return default
+
+def _env_bool(key: str, default: bool) -> bool:
+    v = os.getenv(key)
+    if v is None:
+        return default
+    return v.strip().lower() in ("1", "true", "y", "yes", "on")
+
 def load_config(app) -> None:
     # BE 절대경로
     be_dir = Path(__file__).resolve().parents[1]  # /app/BE
@@ -45,6 +57,16 @@ def load_config(app) -> None:
         "db": _env("MYSQL_DB", ""),
         "charset": "utf8mb4",
     }
+    # 커넥션 풀 (gunicorn 워커당 1개)
+    # 프로시저 1회 왕복 호출 (opt-in). MULTI_STATEMENTS 커넥션은 프로시저 호출 전용 풀에만 (풀 크기 설정 동일)
+    app.config["MYSQL_FAST_CALL"] = _env_bool("MYSQL_FAST_CALL", False)
+    app.config["MYSQL_POOL"]: Dict[str, Any] = {
+        "min_size": _env_int("MYSQL_POOL_MIN", 1),
+        "max_size": _env_int("MYSQL_POOL_MAX", 10),
+        "idle_recycle_sec": _env_float("MYSQL_POOL_RECYCLE_SEC", 300),
+        "pre_ping": _env_bool("MYSQL_POOL_PRE_PING", True),
+        "wait_timeout_sec": _env_float("MYSQL_POOL_TIMEOUT_SEC", 5),
+    }
 
     # ───── PostgreSQL ─────
     # (.env.dev 기준 키: PG_HOST, PG_PORT, PG_DB, PG_USER, PG_PASSWORD)
@@ -55,11 +77,40 @@ def load_config(app) -> None:
         "password": _env("PG_PASSWORD", ""),
         "db": _env("PG_DB", "postgres"),
     }
+    app.config["POSTGRES_FAST_CALL"] = _env_bool("PG_FAST_CALL", False)
+    app.config["POSTGRES_POOL"]: Dict[str, Any] = {
+        "min_size": _env_int("PG_POOL_MIN", 1),
+        "max_size": _env_int("PG_POOL_MAX", 10),
+        "idle_recycle_sec": _env_float("PG_POOL_RECYCLE_SEC", 300),
+        "pre_ping": _env_bool("PG_POOL_PRE_PING", True),
+        "wait_timeout_sec": _env_float("PG_POOL_TIMEOUT_SEC", 5),
+    }
 
     # ───── MongoDB ─────
     # (.env.dev 기준 키: MONGO_URL)  ← 기존 코드의 MONGO_URI로 매핑
     app.config["MONGO_URI"] = _env("MONGO_URL", "mongodb://localhost:27017/appdb")
     app.config["MONGO_DB"] = _env("MONGO_DB", "mdbs")
+    app.config["MONGO_MAX_POOL_SIZE"] = _env_int("MONGO_MAX_POOL_SIZE", 50)
+    app.config["MONGO_MIN_POOL_SIZE"] = _env_int("MONGO_MIN_POOL_SIZE", 5)
+    # 워커 기동 시 MongoTxService 인덱스 생성 (백그라운드 1회)
+    app.config["MONGO_INIT_INDEXES"] = _env_bool("MONGO_INIT_INDEXES", True)
+    # MongoTxService 엔진: idempotent(기본, 세션 없음) | transaction(레플리카셋 필요)
+    app.config["MONGO_TX_ENGINE"] = _env("MONGO_TX_ENGINE", "idempotent").strip().lower()
+    # 내구성 프로파일: default | bench(w=1,j=false) | safe(w=majority,j=true) | "bench,ledger=safe" (작업별 덮어쓰기)
+    # 작업: txn / hold / ledger / balance. 요청 body의 "durability"가 우선
+    app.config["MONGO_DURABILITY"] = _env("MONGO_DURABILITY", "default").strip().lower()
+    # 금액 저장 표현: decimal128(기본) | int64(소수 4자리 최소 단위 정수). 바꾸면 scripts/migrate_mongo_amounts.py 실행
+    app.config["MONGO_AMOUNT_MODE"] = _env("MONGO_AMOUNT_MODE", "decimal128").strip().lower()
+    # 인덱스 점검 (services/mongo_index_advisor.py): off | report(로그만) | create(빠진 인덱스 생성)
+    app.config["MONGO_INDEX_ADVISOR"] = _env("MONGO_INDEX_ADVISOR", "off").strip().lower()
+    # 잔액 버킷: hot 계좌 잔액을 슬롯 N개로 분산 (0/1 = 끔). 변경 후 /mongo_proc/reset 또는 /system/reset 필요
+    # 출금/보류 1건은 슬롯 1개 안에서 처리 → 리셋 직후 hot 계좌 1건 상한 ≈ 초기 잔액/N
+    app.config["MONGO_BALANCE_SLOTS"] = _env_int("MONGO_BALANCE_SLOTS", 0)
+    app.config["MONGO_HOT_ACCOUNTS"] = [a.strip() for a in _env("MONGO_HOT_ACCOUNTS", "100001,100101").split(",")
+                                        if a.strip()]
+    # /db/file/mongo 스트리밍(NDJSON): 서버 batch 크기 / 최대 행 수 (비스트리밍은 limit 최대 1000)
+    app.config["MONGO_STREAM_BATCH_SIZE"] = _env_int("MONGO_STREAM_BATCH_SIZE", 500)
+    app.config["MONGO_STREAM_MAX_ROWS"] = _env_int("MONGO_STREAM_MAX_ROWS", 100000)
 
         # ───── Oracle ─────
     # 우선 ORACLE_DSN이 있으면 그대로 사용 (SID/Service 자동 판별)
@@ -84,3 +135,52 @@ def load_config(app) -> None:
         "user": _env("ORACLE_USER", "system"),
         "password": _env("ORACLE_PASSWORD", "oracle"),
     }
+    app.config["ORACLE_FAST_CALL"] = _env_bool("ORACLE_FAST_CALL", False)
+    # oracledb 세션 풀 (워커당 1개)
+    app.config["ORACLE_POOL"]: Dict[str, Any] = {
+        "min": _env_int("ORACLE_POOL_MIN", 1),
+        "max": _env_int("ORACLE_POOL_MAX", 10),
+        "increment": _env_int("ORACLE_POOL_INCREMENT", 1),
+        "stmtcachesize": _env_int("ORACLE_STMT_CACHE_SIZE", 50),
+        "wait_timeout_ms": _env_int("ORACLE_POOL_TIMEOUT_MS", 5000),
+        "idle_timeout_sec": _env_int("ORACLE_POOL_IDLE_SEC", 300),
+        "call_timeout_ms": _env_int("ORACLE_CALL_TIMEOUT_MS", 60000),
+    }
+
+    # ───── async 서버 (async_app.py) ─────
+    app.config["ASYNC_PORT"] = _env_int("ASYNC_PORT", 5001)
+    # MongoTxService를 돌릴 스레드 수 (in-flight Mongo 호출 상한)
+    app.config["ASYNC_MONGO_THREADS"] = _env_int("ASYNC_MONGO_THREADS", 32)
+
+    # ───── 오래된 hold 정리 (services/hold_sweeper.py) ─────
+    # 주기(초). 0이면 백그라운드 정리 끔 (POST /db/holds/sweep 수동 실행은 항상 가능)
+    app.config["HOLD_SWEEP_INTERVAL_SEC"] = _env_int("HOLD_SWEEP_INTERVAL_SEC", 0)
+    app.config["HOLD_SWEEP_TTL_SEC"] = _env_int("HOLD_SWEEP_TTL_SEC", 300)        # 이보다 오래된 OPEN hold 해제
+    app.config["HOLD_SWEEP_BATCH"] = _env_int("HOLD_SWEEP_BATCH", 100)
+    app.config["HOLD_SWEEP_MAX_BATCHES"] = _env_int("HOLD_SWEEP_MAX_BATCHES", 10)  # 1회 실행당 batch 상한
+    app.config["HOLD_SWEEP_PAUSE_MS"] = _env_int("HOLD_SWEEP_PAUSE_MS", 50)        # batch 사이 대기
+    app.config["HOLD_SWEEP_DBMS"] = [d.strip().lower() for d in
+                                     _env("HOLD_SWEEP_DBMS", "mysql,postgres,oracle,mongo").split(",") if d.strip()]
+
+    # BE/sql 템플릿 레지스트리: 파일 변경 점검 주기(초). 0 = 기동 시 1회만 로드 (POST /db/templates/reload로 갱신)
+    app.config["TEMPLATE_RELOAD_SEC"] = _env_float("TEMPLATE_RELOAD_SEC", 2)
+
+    # /db/file/sql 스트리밍(NDJSON/CSV): fetch 단위 / 최대 행 수 / 응답 버퍼 flush 크기 / 쿼리 타임아웃
+    app.config["SQL_STREAM_CHUNK_ROWS"] = _env_int("SQL_STREAM_CHUNK_ROWS", 500)
+    app.config["SQL_STREAM_MAX_ROWS"] = _env_int("SQL_STREAM_MAX_ROWS", 100000)
+    app.config["SQL_STREAM_FLUSH_BYTES"] = _env_int("SQL_STREAM_FLUSH_BYTES", 256 * 1024)
+    app.config["SQL_STREAM_TIMEOUT_MS"] = _env_int("SQL_STREAM_TIMEOUT_MS", 60000)
+
+    # /db/file/fanout: DBMS별 기본 타임아웃(요청 timeout_ms로 덮어쓰기) / 워커당 공용 스레드 수
+    app.config["FANOUT_TIMEOUT_MS"] = _env_int("FANOUT_TIMEOUT_MS", 5000)
+    app.config["FANOUT_MAX_WORKERS"] = _env_int("FANOUT_MAX_WORKERS", 8)
+
+    # readonly 템플릿 결과 캐시 (services/result_cache.py): 워커당 최대 항목 수 (0 = 끔). TTL은 템플릿 cache_ttl_sec
+    app.config["RESULT_CACHE_MAX_ENTRIES"] = _env_int("RESULT_CACHE_MAX_ENTRIES", 256)
+    # 호출이 끝나면 그 DBMS 캐시를 비우는 프로시저 (빈 값 = 자동 무효화 끔, TTL 만료만)
+    app.config["RESULT_CACHE_INVALIDATE_PROCS"] = [p.strip() for p in _env(
+        "RESULT_CACHE_INVALIDATE_PROCS",
+        "sp_transfer_confirm_internal,sp_confirm_debit_local,sp_confirm_credit_local").split(",") if p.strip()]
+
+    # /db/proc/batch 1회 요청당 최대 항목 수
+    app.config["PROC_BATCH_MAX"] = _env_int("PROC_BATCH_MAX", 500)
@@ -0,0 +1,390 @@
+# db/async_adapters.py
+"""
+asyncio용 어댑터 (async_app.py 전용).
+sync 어댑터와 같은 메서드명(execute_query / call_procedure / call_function / signature / stats / close)을
+코루틴으로 제공한다. 드라이버(aiomysql, asyncpg)는 선택 의존성이라 사용할 때 import 한다.
+"""
+import asyncio
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .metrics import RoundTripCounter
+from .signatures import ProcSignature, SignatureCache, split_owner
+from . import mysql_adapter as _my
+from . import postgres_adapter as _pg
+from . import oracle_adapter as _ora
+
+
+class _AsyncSignatures:
+    """시그니처 캐시 공용 부분 (_load_signature만 DBMS별 구현)"""
+
+    def _init_sigs(self):
+        self._sigs = SignatureCache()
+
+    async def signature(self, name: str) -> ProcSignature:
+        sig = self._sigs.lookup(name)
+        if sig is None:
+            sig = self._sigs.put(name, await self._load_signature(name))
+        return sig
+
+    def invalidate_signatures(self, name: Optional[str] = None) -> int:
+        return self._sigs.invalidate(name)
+
+    def cached_signatures(self) -> List[Dict[str, Any]]:
+        return self._sigs.snapshot()
+
+
+# ───────────────────────────── MySQL (aiomysql) ─────────────────────────────
+class AsyncMySQLAdapter(_AsyncSignatures):
+    def __init__(self, cfg: Dict[str, Any], pool_cfg: Optional[Dict[str, Any]] = None):
+        """cfg/pool_cfg: MySQLAdapter와 동일 (pool_cfg의 min_size/max_size/idle_recycle_sec 사용)"""
+        self.cfg = cfg
+        self.pool_cfg = pool_cfg or {}
+        self.rt = RoundTripCounter()
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._init_sigs()
+
+    async def _get_pool(self):
+        if self._pool is not None:
+            return self._pool
+        async with self._pool_lock:      # 첫 요청이 동시에 몰려도 풀은 1개만
+            if self._pool is not None:
+                return self._pool
+            import aiomysql
+            from pymysql.constants import CLIENT
+            self._pool = await aiomysql.create_pool(
+                host=self.cfg["host"],
+                port=int(self.cfg["port"]),
+                user=self.cfg["user"],
+                password=self.cfg["password"],
+                db=self.cfg["db"] or None,
+                charset=self.cfg.get("charset", "utf8mb4"),
+                autocommit=True,
+                cursorclass=aiomysql.DictCursor,
+                client_flag=CLIENT.MULTI_STATEMENTS,     # CALL + SELECT OUT 한 번에 전송
+                minsize=int(self.pool_cfg.get("min_size", 1)),
+                maxsize=int(self.pool_cfg.get("max_size", 10)),
+                pool_recycle=int(self.pool_cfg.get("idle_recycle_sec", 300)),
+            )
+        return self._pool
+
+    async def execute_query(self, sql: str, params=None):
+        pool = await self._get_pool()
+        async with pool.acquire() as conn, conn.cursor() as cur:
+            await cur.execute(sql, params or ())
+            self.rt.add("execute_query", 1)
+            if cur.description:
+                return await cur.fetchall()
+            return {"affected": cur.rowcount}
+
+    async def _load_signature(self, name: str) -> ProcSignature:
+        owner, obj = split_owner(name)
+        return _my.signature_from_rows(name, await self.execute_query(_my.SIGNATURE_SQL, (owner, obj)))
+
+    async def call_procedure(self, name: str, params: Optional[List[Any]] = None, out_count: int = 0):
+        """MySQLAdapter(fast_call=True)와 같은 방식: CALL + SELECT OUT 을 한 번에 (왕복 1회)"""
+        argv = _my.pad_out_args(params or [], out_count)      # MySQLAdapter와 같은 OUT 자리 채우기
+        in_count = len(argv) - out_count
+        sql = _my.fast_call_sql(name, len(argv), out_count)
+        var_names = _my.out_var_names(name, len(argv), out_count) if out_count > 0 else ()
+
+        pool = await self._get_pool()
+        async with pool.acquire() as conn, conn.cursor() as cur:
+            await cur.execute(sql, argv[:in_count])
+            result_sets = []
+            while True:
+                if cur.description:
+                    result_sets.append(await cur.fetchall())
+                if not await cur.nextset():
+                    break
+            self.rt.add("call_procedure", 1)
+
+        out_vals = None
+        if var_names:
+            row = result_sets.pop()[0]
+            out_vals = {f"out{i}": row[var_names[i]] for i in range(out_count)}
+        return {"resultset": result_sets[0] if result_sets else None, "out": out_vals}
+
+    def stats(self) -> Dict[str, Any]:
+        p = self._pool
+        pool = {"name": "mysql-async", "open": p.size, "idle": p.freesize, "max_size": p.maxsize} if p else None
+        return {"pool": pool, "round_trips": self.rt.snapshot()}
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+
+# ───────────────────────────── PostgreSQL (asyncpg) ─────────────────────────────
+_INT_TYPES = ("smallint", "integer", "bigint")
+_NUM_TYPES = ("numeric", "real", "double precision")
+
+def _pg_coerce(value: Any, pg_type: str) -> Any:
+    """asyncpg는 바인딩 타입을 엄격히 검사 → 시그니처 타입에 맞춰 JSON 값 변환"""
+    if value is None:
+        return None
+    t = pg_type.split("(")[0]
+    if t in _INT_TYPES:
+        return int(value)
+    if t in _NUM_TYPES:
+        return Decimal(str(value))
+    if t in ("text", "character varying", "character", "bpchar"):
+        return str(value)
+    return value
+
+def _pg_numbered(sql: str) -> str:
+    """%s → $1, $2, ... (asyncpg 플레이스홀더)"""
+    n = itertools.count(1)
+    return re.sub(r"%s", lambda _: f"${next(n)}", sql)
+
+@lru_cache(maxsize=256)
+def _pg_call_sql(verb: str, name: str, argc: int) -> str:
+    return _pg_numbered(_pg.call_sql(verb, name, argc))
+
+_PG_SIGNATURE_SQL = _pg_numbered(_pg.SIGNATURE_SQL).replace("$3 IS NULL", "$3::text IS NULL")
+
+
+class AsyncPostgresAdapter(_AsyncSignatures):
+    def __init__(self, cfg: Dict[str, Any], pool_cfg: Optional[Dict[str, Any]] = None):
+        """cfg/pool_cfg: PostgresAdapter와 동일. 호출은 항상 autocommit (fast_call과 같은 왕복 수)"""
+        self.cfg = cfg
+        self.pool_cfg = pool_cfg or {}
+        self.rt = RoundTripCounter()
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._init_sigs()
+
+    async def _get_pool(self):
+        if self._pool is not None:
+            return self._pool
+        async with self._pool_lock:
+            if self._pool is not None:
+                return self._pool
+            import asyncpg
+            self._pool = await asyncpg.create_pool(
+                host=self.cfg["host"],
+                port=int(self.cfg["port"]),
+                user=self.cfg["user"],
+                password=self.cfg["password"],
+                database=self.cfg["db"],
+                min_size=int(self.pool_cfg.get("min_size", 1)),
+                max_size=int(self.pool_cfg.get("max_size", 10)),
+                max_inactive_connection_lifetime=float(self.pool_cfg.get("idle_recycle_sec", 300)),
+                statement_cache_size=100,     # 이름/인자수별 prepared statement 재사용
+            )
+        return self._pool
+
+    async def execute_query(self, sql: str, params=None):
+        """sql 플레이스홀더는 $1, $2, ... (asyncpg 규칙)"""
+        pool = await self._get_pool()
+        rows = await pool.fetch(sql, *(params or ()))
+        self.rt.add("execute_query", 1)
+        return [dict(r) for r in rows]
+
+    async def _load_signature(self, name: str) -> ProcSignature:
+        owner, obj = split_owner(name)
+        return _pg.signature_from_rows(name, await self.execute_query(_PG_SIGNATURE_SQL, (obj, owner, owner)))
+
+    async def _typed_args(self, name: str, params) -> List[Any]:
+        sig = await self.signature(name)
+        return [_pg_coerce(v, sig.params[i].data_type) if i < len(sig.params) else v
+                for i, v in enumerate(params or ())]
+
+    async def call_procedure(self, name: str, params=None):
+        args = await self._typed_args(name, params)
+        pool = await self._get_pool()
+        rows = await pool.fetch(_pg_call_sql("CALL", name, len(args)), *args)
+        self.rt.add("call_procedure", 1)
+        if rows:                       # OUT/INOUT이 있으면 CALL이 그 값을 행 1개로 반환
+            return [dict(r) for r in rows]
+        return {"rows_affected": -1}   # psycopg2 rowcount와 동일 (CALL은 행 수 없음)
+
+    async def call_function(self, name: str, params=None):
+        args = await self._typed_args(name, params)
+        pool = await self._get_pool()
+        rows = await pool.fetch(_pg_call_sql("SELECT * FROM", name, len(args)), *args)
+        self.rt.add("call_function", 1)
+        return [dict(r) for r in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        p = self._pool
+        pool = {"name": "postgres-async", "open": p.get_size(), "idle": p.get_idle_size(),
+                "max_size": p.get_max_size()} if p else None
+        return {"pool": pool, "round_trips": self.rt.snapshot()}
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+# ───────────────────────────── Oracle (oracledb thin async) ─────────────────────────────
+class AsyncOracleAdapter(_AsyncSignatures):
+    def __init__(self, cfg: Dict[str, Any], pool_cfg: Optional[Dict[str, Any]] = None):
+        """cfg/pool_cfg: OracleAdapter와 동일. 프로시저 호출은 autocommit (fast_call과 같은 왕복 수)"""
+        self.cfg = cfg
+        self.pool_cfg = pool_cfg or {}
+        self.call_timeout_ms = int(self.pool_cfg.get("call_timeout_ms", 60000))
+        self.rt = RoundTripCounter()
+        self._pool = None
+        self._init_sigs()
+
+    def _get_pool(self):
+        if self._pool is None:
+            import oracledb
+            c = self.pool_cfg
+            self._pool = oracledb.create_pool_async(
+                user=self.cfg["user"], password=self.cfg["password"], dsn=self.cfg["dsn"],
+                min=int(c.get("min", 1)),
+                max=int(c.get("max", 10)),
+                increment=int(c.get("increment", 1)),
+                stmtcachesize=int(c.get("stmtcachesize", 50)),
+                getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                wait_timeout=int(c.get("wait_timeout_ms", 5000)),
+                timeout=int(c.get("idle_timeout_sec", 300)),
+            )
+        return self._pool
+
+    async def execute_query(self, sql, params=None):
+        async with self._get_pool().acquire() as cx:
+            cx.call_timeout = self.call_timeout_ms
+            cur = cx.cursor()
+            await cur.execute(sql, params or {})
+            if cur.description:
+                cols = [d[0].lower() for d in cur.description]
+                self.rt.add("execute_query", 1)
+                return [dict(zip(cols, r)) for r in await cur.fetchall()]
+            await cx.commit()
+            self.rt.add("execute_query", 2)
+            return {"affected": cur.rowcount}
+
+    async def _load_signature(self, name: str) -> ProcSignature:
+        owner, obj = split_owner(name)
+        return _ora.signature_from_rows(
+            name, await self.execute_query(_ora.SIGNATURE_SQL, {"obj": obj, "owner": owner})
+        )
+
+    async def call_procedure(self, name, params=None, out_count: int = 0, out_types=None):
+        """OracleAdapter.call_procedure와 같은 반환 형태 {"out": [...], "all": [...]}"""
+        params = list(params or [])
+        out_types = list(out_types or [])
+        async with self._get_pool().acquire() as cx:
+            cx.call_timeout = self.call_timeout_ms
+            cx.autocommit = True
+            try:
+                cur = cx.cursor()
+                binds, out_idx = [], []
+                first_out = len(params) - out_count
+                for i, a in enumerate(params):
+                    if out_count > 0 and i >= first_out:
+                        j = i - first_out
+                        binds.append(cur.var(_ora.out_var_type(out_types[j] if j < len(out_types) else "")))
+                        out_idx.append(i)
+                    else:
+                        if isinstance(a, str) and "." in a:
+                            try: a = Decimal(a)
+                            except Exception: pass
+                        binds.append(a)
+                res = await cur.callproc(name, binds)
+                self.rt.add("call_procedure", 1)
+            finally:
+                cx.autocommit = False
+
+        def _val(x):
+            return x.getvalue() if hasattr(x, "getvalue") else x
+
+        return {"out": [_val(res[i]) for i in out_idx], "all": [_val(x) for x in res]}
+
+    def stats(self) -> Dict[str, Any]:
+        p = self._pool
+        pool = {"name": "oracle-async", "open": p.opened, "busy": p.busy, "max": p.max} if p else None
+        return {"pool": pool, "round_trips": self.rt.snapshot()}
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close(force=True)
+            self._pool = None
+
+
+# ───────────────────────────── Mongo ─────────────────────────────
+class AsyncMongoProc:
+    """
+    MongoTxService(동기 pymongo)를 전용 스레드 풀에서 실행.
+    motor도 내부적으로 pymongo를 스레드 풀에서 돌리는 구조라 같은 동시성을 얻으면서
+    서비스 로직(멱등/조건부 갱신)을 sync 라우트와 공유한다.
+    """
+
+    def __init__(self, service, max_threads: int = 32):
+        self.svc = service
+        self.max_threads = int(max_threads)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="mongo-async")
+
+    async def run(self, method: str, *args):
+        fn = getattr(self.svc, method)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"threads": self.max_threads}
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+        self.svc.client.close()
+
+
+class AsyncAdapterRegistry:
+    """이벤트 루프(=프로세스)당 DBMS별 async 어댑터 1개"""
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self._adapters: Dict[str, Any] = {}
+
+    def get(self, dbms: str):
+        d = (dbms or "").lower()
+        a = self._adapters.get(d)
+        if a is None:
+            a = self._adapters[d] = self._build(d)
+        return a
+
+    def _build(self, d: str):
+        c = self.cfg
+        if d == "mysql":
+            return AsyncMySQLAdapter(c["MYSQL"], c.get("MYSQL_POOL"))
+        if d == "postgres":
+            return AsyncPostgresAdapter(c["POSTGRES"], c.get("POSTGRES_POOL"))
+        if d == "oracle":
+            return AsyncOracleAdapter(c["ORACLE"], c.get("ORACLE_POOL"))
+        if d == "mongo":
+            from .mongo_adapter import MongoAdapter
+            from services.mongo_tx_service import build_mongo_tx_service
+            mongo = MongoAdapter({
+                "uri": c["MONGO_URI"],
+                "db": c.get("MONGO_DB", "mdbs"),
+                "max_pool_size": c.get("MONGO_MAX_POOL_SIZE"),
+                "min_pool_size": c.get("MONGO_MIN_POOL_SIZE"),
+            })
+            svc = build_mongo_tx_service(c.get("MONGO_TX_ENGINE", "idempotent"), mongo,
+                                         balance_slots=c.get("MONGO_BALANCE_SLOTS", 0),
+                                         hot_accounts=c.get("MONGO_HOT_ACCOUNTS", ()),
+                                         durability=c.get("MONGO_DURABILITY", "default"),
+                                         amount_mode=c.get("MONGO_AMOUNT_MODE", "decimal128"))
+            return AsyncMongoProc(svc, max_threads=c.get("ASYNC_MONGO_THREADS", 32))
+        raise ValueError(f"Unsupported DBMS: {d}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {d: a.stats() for d, a in self._adapters.items()}
+
+    async def close(self):
+        adapters = list(self._adapters.values())
+        self._adapters.clear()
+        for a in adapters:
+            try:
+                await a.close()
+            except Exception:
+                pass
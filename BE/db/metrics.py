@@ -0,0 +1,37 @@
+# db/metrics.py
+import threading
+from typing import Any, Dict
+
+
+class RoundTripCounter:
+    """
+    어댑터 연산별 호출 수 / 네트워크 왕복 수 누적 (워커 프로세스 단위).
+    왕복 수는 드라이버 프로토콜 기준 추정치 (예: PyMySQL callproc = SET + CALL + SELECT OUT → 3)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._trips: Dict[str, int] = {}
+
+    def add(self, op: str, trips: int, calls: int = 1) -> None:
+        with self._lock:
+            self._calls[op] = self._calls.get(op, 0) + calls
+            self._trips[op] = self._trips.get(op, 0) + trips
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            out = {}
+            for op, calls in self._calls.items():
+                trips = self._trips.get(op, 0)
+                out[op] = {
+                    "calls": calls,
+                    "round_trips": trips,
+                    "per_call": round(trips / calls, 2) if calls else 0,
+                }
+            return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._trips.clear()
@@ -1,6 +1,9 @@
 # db/mongo_adapter.py
-from typing import Any, Dict, List, Optional, Union
+import json
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 from pymongo import MongoClient
+from bson import decode_all
 from bson.decimal128 import Decimal128
 from bson.objectid import ObjectId
 from bson.binary import Binary
@@ -8,6 +11,11 @@ from bson.timestamp import Timestamp
 import datetime as _dt
 import base64
 
+try:
+    import orjson
+except ImportError:     # 없으면 표준 json C 인코더로
+    orjson = None
+
 def _to_jsonable(x: Any) -> Any:
     """BSON -> JSON 직렬화 가능한 값으로 재귀 변환"""
     if x is None or isinstance(x, (bool, int, float, str)):
@@ -34,22 +42,79 @@ def _to_jsonable(x: Any) -> Any:
 def _to_jsonable_list(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [_to_jsonable(r) for r in rows]
 
+_UNPACK_BID = struct.Struct("<QQ").unpack
+
+def _d128_str(x: Decimal128) -> str:
+    """
+    str(x.to_decimal())과 같은 문자열을 BID 비트에서 직접 생성 (Decimal 객체 생성 생략).
+    일반 표기 범위의 유한값만 빠른 경로, 나머지(NaN/Inf/지수 표기)는 to_decimal()로.
+    """
+    low, high = _UNPACK_BID(x.bid)
+    if (high >> 61) & 3 == 3:
+        return str(x.to_decimal())
+    exp = ((high >> 49) & 0x3FFF) - 6176
+    digits = str(((high & 0x1FFFFFFFFFFFF) << 64) | low)
+    left = exp + len(digits)
+    if exp > 0 or left <= -6:
+        return str(x.to_decimal())
+    sign = "-" if high >> 63 else ""
+    if exp == 0:
+        return sign + digits
+    if left > 0:
+        return f"{sign}{digits[:left]}.{digits[left:]}"
+    return f"{sign}0.{'0' * -left}{digits}"
+
+def _json_default(x: Any) -> Any:
+    """인코더가 모르는 BSON 스칼라만 변환 (dict/list 순회는 인코더가 C/Rust로)"""
+    if isinstance(x, Decimal128):
+        return _d128_str(x)
+    if isinstance(x, ObjectId):
+        return str(x)
+    if isinstance(x, _dt.datetime):
+        return x.isoformat()
+    return _to_jsonable(x)
+
+def dumps_json(obj: Any) -> bytes:
+    """
+    BSON 디코딩 결과 → JSON bytes. 값 형식은 _to_jsonable 과 같다
+    (Decimal128/ObjectId → 문자열, datetime → ISO). 키 정렬/공백 없음은 Flask jsonify 기본값과 같다.
+    디코딩한 JSON 값은 jsonify와 같지만 orjson 경로의 바이트는 다르다:
+    - 비ASCII 문자(한글 이름 등)를 \\uXXXX 대신 UTF-8 그대로 출력
+    - float NaN/Infinity는 null (jsonify는 JSON 표준이 아닌 NaN 토큰)
+    표준 json 경로(orjson 없음)는 ensure_ascii 기본값이라 jsonify와 바이트까지 같다.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, default=_json_default, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def _ndjson(raw_batches: Iterable[bytes]) -> Iterator[bytes]:
+    """raw BSON batch 1개 → NDJSON 청크 1개 (메모리는 batch 크기만큼만)"""
+    for batch in raw_batches:
+        docs = decode_all(batch)
+        if docs:
+            yield b"\n".join(dumps_json(d) for d in docs) + b"\n"
+
 class MongoAdapter:
     def __init__(self, cfg: Union[str, Dict[str, Any]]):
         """
-        cfg: 문자열(URI) 또는 {"uri": "...", "db": "mdbs"}
+        cfg: 문자열(URI) 또는 {"uri": "...", "db": "mdbs", "max_pool_size": 50, "min_pool_size": 5}
         """
+        client_opts: Dict[str, Any] = {}
         if isinstance(cfg, str):
             uri = cfg
             db_name = None
         else:
             uri = cfg.get("uri") or cfg.get("url")
             db_name = cfg.get("db")
+            if cfg.get("max_pool_size"):
+                client_opts["maxPoolSize"] = int(cfg["max_pool_size"])
+            if cfg.get("min_pool_size"):
+                client_opts["minPoolSize"] = int(cfg["min_pool_size"])
 
         if not uri:
             raise ValueError("Mongo URI is missing in config")
 
-        self.client = MongoClient(uri)
+        self.client = MongoClient(uri, **client_opts)
         if db_name:
             self.db = self.client[db_name]
         else:
@@ -72,6 +137,32 @@ class MongoAdapter:
         cur = self.db[collection].aggregate(pipeline, **kwargs)
         return _to_jsonable_list(list(cur))
 
+    def aggregate_docs(self, collection: str, pipeline: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+        """aggregate 결과를 BSON 타입 그대로 (ObjectId/Decimal128 유지, 직렬화는 호출자가 dumps_json으로)"""
+        kwargs.setdefault("allowDiskUse", False)
+        return list(self.db[collection].aggregate(pipeline, **kwargs))
+
+    def aggregate_json(self, collection: str, pipeline: List[Dict[str, Any]], **kwargs) -> bytes:
+        """aggregate 결과를 JSON 배열 bytes로 (raw BSON batch → C 디코더 → dumps_json, 문서별 재귀 변환 없음)"""
+        kwargs.setdefault("allowDiskUse", False)
+        docs: List[Dict[str, Any]] = []
+        for batch in self.db[collection].aggregate_raw_batches(pipeline, **kwargs):
+            docs.extend(decode_all(batch))
+        return dumps_json(docs)
+
+    def aggregate_ndjson(self, collection: str, pipeline: List[Dict[str, Any]], batch_size: int = 500,
+                         **kwargs) -> Iterator[bytes]:
+        """aggregate 결과를 NDJSON 청크로 스트리밍 (cursor를 batch_size 단위로 소비)"""
+        kwargs.setdefault("allowDiskUse", False)
+        return _ndjson(self.db[collection].aggregate_raw_batches(pipeline, batchSize=int(batch_size), **kwargs))
+
+    def find_ndjson(self, collection: str, query: Dict[str, Any],
+                    projection: Optional[Dict[str, int]] = None, limit: int = 0,
+                    batch_size: int = 500, **kwargs) -> Iterator[bytes]:
+        """find 결과를 NDJSON 청크로 스트리밍 (limit=0 → 제한 없음)"""
+        cur = self.db[collection].find_raw_batches(query, projection, batch_size=int(batch_size), **kwargs)
+        return _ndjson(cur.limit(int(limit)))
+
     def delete_many(self, collection: str, query: Dict[str, Any]) -> int:
         """Delete multiple documents and return count of deleted documents"""
         result = self.db[collection].delete_many(query)
@@ -85,3 +176,6 @@ class MongoAdapter:
     def drop_collection(self, collection: str) -> None:
         """Drop entire collection (fast delete)"""
         self.db[collection].drop()
+
+    def close(self) -> None:
+        self.client.close()
@@ -1,28 +1,163 @@
 # db/mysql_adapter.py
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 import pymysql
+import pymysql.constants.CLIENT
 import re
+from contextlib import contextmanager
+from functools import lru_cache
+from .metrics import RoundTripCounter
+from .pool import ConnectionPool, shared_pool
+from .session import QuerySession, is_select, isolation_level, with_select_hint
+from .signatures import ProcParam, ProcSignature, SignatureCache, split_owner
 
 Params = Optional[Union[Iterable[Any], Dict[str, Any]]]
 
+# 연결 자체가 끊긴 경우의 클라이언트 에러 코드 (CR_CONN_HOST_ERROR, CR_SERVER_GONE_ERROR, CR_SERVER_LOST)
+_CONN_LOST_CODES = {2003, 2006, 2013}
+
+def _is_broken(conn, exc: BaseException) -> bool:
+    """with 블록 예외 시 커넥션 폐기 여부 (SQL 에러는 재사용, 연결/프로토콜 에러는 폐기)"""
+    if not conn.open:
+        return True
+    if isinstance(exc, pymysql.err.InterfaceError):
+        return True
+    if isinstance(exc, pymysql.err.OperationalError):
+        return bool(exc.args) and exc.args[0] in _CONN_LOST_CODES
+    # 드라이버 밖 예외는 결과셋이 덜 읽혔을 수 있으므로 폐기
+    return not isinstance(exc, pymysql.err.MySQLError)
+
+def _reset(conn):
+    """반납 전: 닫힌 커넥션(stream 중단/SET TRANSACTION 실패 시 session이 닫음)은 풀에 돌려놓지 않고 폐기"""
+    if not conn.open:
+        raise pymysql.err.InterfaceError("connection is closed")
+
+SIGNATURE_SQL = """
+SELECT r.ROUTINE_TYPE AS rtype, p.PARAMETER_NAME AS pname, p.PARAMETER_MODE AS pmode, p.DATA_TYPE AS dtype
+  FROM information_schema.routines r
+  LEFT JOIN information_schema.parameters p
+    ON p.SPECIFIC_SCHEMA = r.ROUTINE_SCHEMA
+   AND p.SPECIFIC_NAME = r.SPECIFIC_NAME
+   AND p.ORDINAL_POSITION > 0
+ WHERE r.ROUTINE_SCHEMA = COALESCE(%s, DATABASE())
+   AND r.ROUTINE_NAME = %s
+ ORDER BY p.ORDINAL_POSITION
+"""
+
+def signature_from_rows(name: str, rows: List[Dict[str, Any]]) -> ProcSignature:
+    """SIGNATURE_SQL 결과 → ProcSignature (sync/async 어댑터 공용)"""
+    if not rows:
+        raise ValueError(f"procedure not found: {name}")
+    params = tuple(
+        ProcParam(r["pname"], (r["pmode"] or "IN").upper(), (r["dtype"] or "").lower())
+        for r in rows if r["pname"]
+    )
+    kind = "func" if rows[0]["rtype"] == "FUNCTION" else "proc"
+    return ProcSignature(name, kind, params)
+
+def pad_out_args(argv: List[Any], out_count: int) -> List[Any]:
+    """OUT 자리 자동 채우기 (끝에서 out_count개 None — 이미 None으로 보낸 자리는 그대로)"""
+    argv = list(argv)
+    if out_count > 0:
+        need = out_count
+        if len(argv) >= out_count:
+            tail = argv[-out_count:]
+            have = sum(1 for t in tail if t is None)
+            need = out_count - have
+        if need > 0:
+            argv += [None] * need
+    return argv
+
+@lru_cache(maxsize=256)
+def out_var_names(name: str, argc: int, out_count: int) -> Tuple[str, ...]:
+    var_base = re.sub(r"[^0-9A-Za-z_]", "_", name)  # MDBS.sp_x -> MDBS_sp_x
+    return tuple(f"@_{var_base}_{i}" for i in range(argc - out_count, argc))
+
+@lru_cache(maxsize=256)
+def fast_call_sql(name: str, argc: int, out_count: int) -> str:
+    """fast_call용 'CALL p(%s.., @out..); SELECT @out..' 템플릿 (이름/인자수별 1회 생성)"""
+    var_names = out_var_names(name, argc, out_count) if out_count > 0 else ()
+    placeholders = ["%s"] * (argc - out_count) + list(var_names)
+    sql = f"CALL {name}({', '.join(placeholders)})"
+    if var_names:
+        sql += "; SELECT " + ", ".join(var_names)
+    return sql
+
 class MySQLAdapter:
-    def __init__(self, cfg: Dict[str, Any]):
+    def __init__(self, cfg: Dict[str, Any], pool_cfg: Optional[Dict[str, Any]] = None,
+                 fast_call: bool = False):
         """
         cfg 예:
         {
           "host":"localhost","port":3306,"user":"root","password":"",
           "db":"test","charset":"utf8mb4"
         }
+        pool_cfg 예: {"min_size":1,"max_size":10,"idle_recycle_sec":300,"pre_ping":True,"wait_timeout_sec":5}
+        fast_call: True면 call_procedure를 멀티 스테이트먼트 1회 왕복으로 실행
+                   (CLIENT.MULTI_STATEMENTS 커넥션은 프로시저 호출 전용 풀에만 — execute_query/session의
+                    사용자 SQL 템플릿은 기존 풀에서 단일 문장만 허용)
         """
         self.cfg = cfg
+        self.fast_call = bool(fast_call)
+        self.rt = RoundTripCounter()
+        self._sigs = SignatureCache()
+        key = ("mysql", cfg.get("host"), cfg.get("port"), cfg.get("user"), cfg.get("db"))
+        self._pool = self._shared_pool(key, pool_cfg, multi=False)
+        self._call_pool = self._shared_pool(key + ("multi",), pool_cfg, multi=True) if self.fast_call else None
 
-    def _conn(self):
+    def _shared_pool(self, key, pool_cfg: Optional[Dict[str, Any]], multi: bool) -> ConnectionPool:
+        return shared_pool(key, lambda: ConnectionPool(
+            lambda: self._connect(multi),
+            ping=self._ping,
+            reset=_reset,
+            is_broken=_is_broken,
+            name="mysql-call" if multi else "mysql",
+            **(pool_cfg or {}),
+        ))
+
+    def _connect(self, multi: bool = False):
+        extra = {"client_flag": pymysql.constants.CLIENT.MULTI_STATEMENTS} if multi else {}
         return pymysql.connect(
             **self.cfg,
             cursorclass=pymysql.cursors.DictCursor,
             autocommit=True,
+            **extra,
         )
 
+    def _ping(self, conn):
+        self.rt.add("ping", 1)
+        conn.ping(reconnect=False)
+
+    def _conn(self):
+        """풀에서 커넥션 체크아웃 (with 블록 종료 시 반납)"""
+        return self._pool.connection()
+
+    def _call_conn(self):
+        """fast_call 전용 풀(MULTI_STATEMENTS)에서 체크아웃"""
+        return self._call_pool.connection()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pool": self._pool.stats(), "call_pool": self._call_pool.stats() if self._call_pool else None,
+                "fast_call": self.fast_call, "round_trips": self.rt.snapshot()}
+
+    def close(self):
+        self._pool.close_all()
+        if self._call_pool is not None:
+            self._call_pool.close_all()
+
+    # ───────────── 프로시저 시그니처 ─────────────
+    def signature(self, name: str) -> ProcSignature:
+        return self._sigs.get(name, self._load_signature)
+
+    def invalidate_signatures(self, name: Optional[str] = None) -> int:
+        return self._sigs.invalidate(name)
+
+    def cached_signatures(self) -> List[Dict[str, Any]]:
+        return self._sigs.snapshot()
+
+    def _load_signature(self, name: str) -> ProcSignature:
+        owner, obj = split_owner(name)
+        return signature_from_rows(name, self.execute_query(SIGNATURE_SQL, (owner, obj)))
+
     def execute_query(self, sql: str, params: Params = None):
         """
         SELECT/INSERT/UPDATE/DELETE 모두 처리.
@@ -30,49 +165,100 @@ class MySQLAdapter:
         """
         with self._conn() as conn, conn.cursor() as cur:
             cur.execute(sql, params or ())
+            self.rt.add("execute_query", 1)
             if cur.description:  # SELECT 계열
                 return cur.fetchall()
             return {"affected": cur.rowcount}
 
+    @contextmanager
+    def session(self, timeout_ms: Optional[int] = None, readonly: bool = False, isolation: Optional[str] = None):
+        """
+        프라그마를 쿼리와 같은 풀 커넥션에 적용 → QuerySession.
+        - timeout_ms: SELECT에 /*+ MAX_EXECUTION_TIME(n) */ 힌트 (추가 왕복 없음).
+          MAX_EXECUTION_TIME은 원래 SELECT에만 적용되므로 그 외 문장은 그대로
+        - isolation / readonly: autocommit이라 SET TRANSACTION은 다음 문장 1개에만 적용 (+1 왕복).
+          autocommit SELECT는 InnoDB가 이미 읽기 전용 트랜잭션으로 처리하므로 readonly만이면 생략
+        SET TRANSACTION 뒤 쿼리가 실패하면 설정이 남을 수 있어 커넥션을 닫는다 (풀에서 폐기)
+        stream(): SSDictCursor(unbuffered)로 fetchmany. 다 읽기 전에 멈추면 남은 행을 읽어 버리지 않고 커넥션째 폐기
+        """
+        level = isolation_level(isolation)
+        with self._conn() as conn:
+            def run(sql: str, params: Params = None):
+                select = is_select(sql)
+                modes = [f"ISOLATION LEVEL {level}"] if level else []
+                if readonly and not select:
+                    modes.append("READ ONLY")
+                if timeout_ms and select:
+                    sql = with_select_hint(sql, f"MAX_EXECUTION_TIME({int(timeout_ms)})")
+                with conn.cursor() as cur:
+                    if modes:
+                        cur.execute("SET TRANSACTION " + ", ".join(modes))
+                    try:
+                        cur.execute(sql, params or ())
+                    except BaseException:
+                        if modes:
+                            conn.close()
+                        raise
+                    self.rt.add("session_query", 2 if modes else 1)
+                    if cur.description:
+                        return cur.fetchall()
+                    return {"affected": cur.rowcount}
+
+            def stream(sql: str, params: Params = None, chunk_rows: int = 500):
+                if timeout_ms:
+                    sql = with_select_hint(sql, f"MAX_EXECUTION_TIME({int(timeout_ms)})")
+                cur = conn.cursor(pymysql.cursors.SSDictCursor)
+                done = False
+                try:
+                    if level:
+                        cur.execute(f"SET TRANSACTION ISOLATION LEVEL {level}")
+                    cur.execute(sql, params or ())
+                    self.rt.add("session_stream", 2 if level else 1)
+                    while True:
+                        rows = cur.fetchmany(chunk_rows)
+                        if not rows:
+                            break
+                        yield rows
+                    done = True
+                finally:
+                    if done:
+                        cur.close()
+                    else:
+                        conn.close()
+            yield QuerySession(run, stream)
+
     def execute_multi_query(self, sql: str):
         """
         여러 SQL 문장을 한 번에 실행 (세미콜론으로 구분)
         autocommit=False로 트랜잭션 처리
         """
-        conn = pymysql.connect(
-            **self.cfg,
-            cursorclass=pymysql.cursors.DictCursor,
-            autocommit=False,  # 트랜잭션 모드
-        )
-        try:
-            with conn.cursor() as cur:
-                # 세미콜론으로 split하여 각 문장 실행
-                statements = [s.strip() for s in sql.split(';') if s.strip()]
-                for stmt in statements:
-                    cur.execute(stmt)
-                conn.commit()
-            return {"status": "OK"}
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+        with self._conn() as conn:
+            conn.autocommit(False)  # 트랜잭션 모드 (반납 전 원복)
+            try:
+                with conn.cursor() as cur:
+                    # 세미콜론으로 split하여 각 문장 실행
+                    statements = [s.strip() for s in sql.split(';') if s.strip()]
+                    for stmt in statements:
+                        cur.execute(stmt)
+                    conn.commit()
+                    # autocommit 토글 2 + 문장 수 + COMMIT 1
+                    self.rt.add("execute_multi_query", len(statements) + 3)
+                return {"status": "OK"}
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                conn.autocommit(True)
 
     def call_procedure(self, name: str, params: Optional[List[Any]] = None, out_count: int = 0):
-        argv = list(params or [])
-
-        # OUT 자리 자동 채우기 (끝에서 out_count개 None)
-        if out_count > 0:
-            need = out_count
-            if len(argv) >= out_count:
-                tail = argv[-out_count:]
-                have = sum(1 for t in tail if t is None)
-                need = out_count - have
-            if need > 0:
-                argv += [None] * need
+        argv = pad_out_args(params or [], out_count)
+
+        if self.fast_call:
+            return self._call_procedure_fast(name, argv, out_count)
 
         with self._conn() as conn, conn.cursor() as cur:
             cur.callproc(name, argv)
+            trips = 2 if argv else 1  # SET @_p_i = ... ; CALL p(...)
 
             # --- 첫 결과셋 잡기 (PyMySQL 방식) ---
             first_rs = None
@@ -88,11 +274,38 @@ class MySQLAdapter:
             # --- OUT 읽기 ---
             out_vals = None
             if out_count > 0:
-                var_base = re.sub(r"[^0-9A-Za-z_]", "_", name)  # MDBS.sp_x -> MDBS_sp_x
-                start = len(argv) - out_count
-                var_names = [f"@_{var_base}_{i}" for i in range(start, len(argv))]
+                var_names = out_var_names(name, len(argv), out_count)
                 cur.execute("SELECT " + ", ".join(var_names))
+                trips += 1
                 row = cur.fetchone()
                 out_vals = {f"out{i}": row[var_names[i]] for i in range(out_count)}
 
-            return {"resultset": first_rs, "out": out_vals}
\ No newline at end of file
+            self.rt.add("call_procedure", trips)
+            return {"resultset": first_rs, "out": out_vals}
+
+    def _call_procedure_fast(self, name: str, argv: List[Any], out_count: int):
+        """
+        CALL p(%s, ..., @out...); SELECT @out...  를 한 번에 전송 → 왕복 1회.
+        IN 값은 드라이버 이스케이프로 바인딩, OUT 자리는 세션 변수.
+        결과셋 순서: [프로시저 결과셋...] → CALL 상태 → [SELECT OUT]
+        """
+        in_count = len(argv) - out_count
+        sql = fast_call_sql(name, len(argv), out_count)
+        var_names = out_var_names(name, len(argv), out_count) if out_count > 0 else ()
+
+        with self._call_conn() as conn, conn.cursor() as cur:
+            cur.execute(sql, argv[:in_count])
+            result_sets = []
+            while True:
+                if cur.description:
+                    result_sets.append(cur.fetchall())
+                if not cur.nextset():
+                    break
+            self.rt.add("call_procedure", 1)
+
+        out_vals = None
+        if var_names:
+            row = result_sets.pop()[0]
+            out_vals = {f"out{i}": row[var_names[i]] for i in range(out_count)}
+        first_rs = result_sets[0] if result_sets else None
+        return {"resultset": first_rs, "out": out_vals}
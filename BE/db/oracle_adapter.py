@@ -1,16 +1,163 @@
 # db/oracle_adapter.py
 import os
+import threading
+import time
 import oracledb
+from contextlib import contextmanager
 from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from .metrics import RoundTripCounter
+from .pool import shared_pool
+from .session import QuerySession, is_select, isolation_level
+from .signatures import ProcParam, ProcSignature, SignatureCache, split_owner
 
 os.environ["PYTHON_ORACLEDB_THIN"] = "1"     # 혹시 모를 순서 문제 방지
 for k in ("ORACLE_HOME", "TNS_ADMIN", "TWO_TASK", "LOCAL"):
     os.environ.pop(k, None)
 
 
+class _SessionPool:
+    """
+    oracledb.ConnectionPool + 대기 통계.
+    oracledb는 busy/opened만 알려주므로 대기 횟수/시간/타임아웃은 여기서 센다.
+    """
+
+    def __init__(self, user: str, password: str, dsn: str, pool_cfg: Dict[str, Any]):
+        self.call_timeout_ms = int(pool_cfg.get("call_timeout_ms", 60000))
+        self.pool = oracledb.create_pool(
+            user=user, password=password, dsn=dsn,
+            min=int(pool_cfg.get("min", 1)),
+            max=int(pool_cfg.get("max", 10)),
+            increment=int(pool_cfg.get("increment", 1)),
+            stmtcachesize=int(pool_cfg.get("stmtcachesize", 50)),
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=int(pool_cfg.get("wait_timeout_ms", 5000)),
+            timeout=int(pool_cfg.get("idle_timeout_sec", 300)),
+        )
+        self._lock = threading.Lock()
+        self._counters = {"acquires": 0, "waits": 0, "wait_ms": 0.0, "timeouts": 0, "dropped": 0}
+
+    def acquire(self):
+        p = self.pool
+        must_wait = p.opened >= p.max and p.busy >= p.opened
+        t0 = time.perf_counter()
+        try:
+            conn = p.acquire()
+        except oracledb.Error:
+            with self._lock:
+                self._counters["timeouts"] += 1
+            raise
+        waited_ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self._counters["acquires"] += 1
+            if must_wait:
+                self._counters["waits"] += 1
+                self._counters["wait_ms"] += waited_ms
+        conn.call_timeout = self.call_timeout_ms   # 세션마다 적용 (반납 후에도 남으므로 매번 덮어씀)
+        return conn
+
+    def release(self, conn, broken: bool = False):
+        if broken:
+            with self._lock:
+                self._counters["dropped"] += 1
+            self.pool.drop(conn)
+        else:
+            self.pool.release(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        p = self.pool
+        with self._lock:
+            c = dict(self._counters)
+        c["wait_ms"] = round(c["wait_ms"], 2)
+        return {
+            "name": "oracle",
+            "min": p.min, "max": p.max, "increment": p.increment,
+            "open": p.opened, "busy": p.busy, "idle": p.opened - p.busy,
+            "stmtcachesize": p.stmtcachesize,
+            "call_timeout_ms": self.call_timeout_ms,
+            **c,
+        }
+
+    def close(self):
+        try:
+            self.pool.close(force=True)
+        except oracledb.Error:
+            pass
+
+
+# position 0 = 함수 반환값, 인자 없는 프로시저는 argument_name이 NULL인 행 1개
+SIGNATURE_SQL = """
+SELECT argument_name, position, in_out, data_type
+  FROM all_arguments
+ WHERE object_name = UPPER(:obj)
+   AND owner = NVL(UPPER(:owner), SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA'))
+   AND package_name IS NULL
+   AND data_level = 0
+ ORDER BY position
+"""
+
+_ORA_MODES = {"IN": "IN", "OUT": "OUT", "IN/OUT": "INOUT"}
+
+def signature_from_rows(name: str, rows: List[Dict[str, Any]]) -> ProcSignature:
+    """SIGNATURE_SQL 결과 → ProcSignature (sync/async 어댑터 공용)"""
+    if not rows:
+        raise ValueError(f"procedure not found: {name}")
+    kind = "func" if any(r["position"] == 0 for r in rows) else "proc"
+    params = tuple(
+        ProcParam(r["argument_name"], _ORA_MODES.get(r["in_out"], "IN"), (r["data_type"] or "").lower())
+        for r in rows if r["position"] and r["argument_name"]
+    )
+    return ProcSignature(name, kind, params)
+
+
+def out_var_type(hint: str):
+    """OUT 타입 힌트 → oracledb DB 타입 (sync/async 공용)"""
+    hint = (hint or "").lower()
+    if hint.startswith("varchar"):
+        return oracledb.DB_TYPE_VARCHAR
+    if hint in ("date", "timestamp"):
+        return oracledb.DB_TYPE_DATE
+    return oracledb.DB_TYPE_NUMBER
+
+
 class OracleAdapter:
-    def __init__(self, cfg):
+    def __init__(self, cfg, pool_cfg: Optional[Dict[str, Any]] = None, fast_call: bool = False):
+        """
+        cfg 예: {"dsn":"host:1521/XEPDB1","user":"mdbs","password":"..."}
+        pool_cfg 예: {"min":1,"max":10,"increment":1,"stmtcachesize":50,
+                      "wait_timeout_ms":5000,"idle_timeout_sec":300,"call_timeout_ms":60000}
+        fast_call: True면 프로시저 호출을 autocommit으로 실행 → COMMIT이 callproc 메시지에
+                   실려 가므로 별도 cx.commit() 왕복이 없다 (프로시저 내부 COMMIT과 중복 제거)
+        """
         self.cfg = cfg
+        self.fast_call = bool(fast_call)
+        self.rt = RoundTripCounter()
+        self._sigs = SignatureCache()
+        dsn = self._normalize_dsn(cfg["dsn"])
+        self._pool = shared_pool(
+            ("oracle", dsn, cfg.get("user")),
+            lambda: _SessionPool(cfg["user"], cfg["password"], dsn, pool_cfg or {}),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pool": self._pool.stats(), "fast_call": self.fast_call, "round_trips": self.rt.snapshot()}
+
+    def close(self):
+        self._pool.close()
+
+    # ───────────── 프로시저 시그니처 ─────────────
+    def signature(self, name: str) -> ProcSignature:
+        return self._sigs.get(name, self._load_signature)
+
+    def invalidate_signatures(self, name: Optional[str] = None) -> int:
+        return self._sigs.invalidate(name)
+
+    def cached_signatures(self) -> List[Dict[str, Any]]:
+        return self._sigs.snapshot()
+
+    def _load_signature(self, name: str) -> ProcSignature:
+        owner, obj = split_owner(name)
+        return signature_from_rows(name, self.execute_query(SIGNATURE_SQL, {"obj": obj, "owner": owner}))
 
     def _normalize_dsn(self, dsn: str) -> str:
         s = (dsn or "").strip()
@@ -21,23 +168,92 @@ class OracleAdapter:
             )
         return s
 
+    @contextmanager
     def _conn(self):
-        dsn = self._normalize_dsn(self.cfg["dsn"])
-        conn = oracledb.connect(user=self.cfg["user"], password=self.cfg["password"], dsn=dsn)
+        """세션 풀에서 체크아웃 (with 블록 종료 시 반납, 죽은 세션은 풀에서 제거)"""
+        conn = self._pool.acquire()
         try:
-            conn.callTimeout = 60000  # 쿼리 타임아웃(ms) - 60초로 증가
-        except Exception:
-            pass
-        return conn
+            yield conn
+        except BaseException:
+            self._pool.release(conn, broken=not conn.is_healthy())
+            raise
+        else:
+            self._pool.release(conn)
+
+    @contextmanager
+    def _call_conn(self):
+        """프로시저 호출용: fast_call이면 autocommit(로컬 설정), 반납 전 원복"""
+        with self._conn() as cx:
+            cx.autocommit = self.fast_call
+            try:
+                yield cx
+            finally:
+                cx.autocommit = False
+
+    @contextmanager
+    def session(self, timeout_ms: Optional[int] = None, readonly: bool = False, isolation: Optional[str] = None):
+        """
+        프라그마를 쿼리와 같은 세션에 적용 → QuerySession.
+        - timeout_ms: cx.call_timeout (클라이언트 설정, 왕복 없음. 다음 체크아웃 때 풀 기본값으로 덮어씀)
+        - readonly: SELECT가 아닐 때만 SET TRANSACTION READ ONLY (단일 SELECT는 원래 문장 단위 읽기 일관성)
+        - isolation: read_committed | serializable → SET TRANSACTION ISOLATION LEVEL
+        SET TRANSACTION을 썼으면 끝에 COMMIT(실패 시 ROLLBACK)으로 트랜잭션을 닫는다
+        stream(): arraysize/prefetchrows = chunk_rows 로 fetchmany (왕복 1회에 chunk 1개).
+        도중에 멈추면 열린 트랜잭션은 풀 반납 시 rollback
+        """
+        level = isolation_level(isolation, "oracle")
+        with self._conn() as cx:
+            if timeout_ms:
+                cx.call_timeout = int(timeout_ms)
+
+            def run(sql: str, params=None):
+                txn = "READ ONLY" if readonly and not is_select(sql) else (f"ISOLATION LEVEL {level}" if level else None)
+                with cx.cursor() as cur:
+                    if txn:
+                        cur.execute("SET TRANSACTION " + txn)
+                    try:
+                        cur.execute(sql, params or {})
+                        rows = None
+                        if cur.description:
+                            cols = [d[0].lower() for d in cur.description]
+                            rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+                        if txn or rows is None:
+                            cx.commit()
+                    except BaseException:
+                        if txn and cx.is_healthy():
+                            cx.rollback()
+                        raise
+                    self.rt.add("session_query", 1 + (txn is not None) + (txn is not None or rows is None))
+                    return rows if rows is not None else {"affected": cur.rowcount}
+
+            def stream(sql: str, params=None, chunk_rows: int = 500):
+                with cx.cursor() as cur:
+                    cur.arraysize = chunk_rows
+                    cur.prefetchrows = chunk_rows + 1       # execute 응답에 첫 chunk까지
+                    if level:
+                        cur.execute(f"SET TRANSACTION ISOLATION LEVEL {level}")
+                    cur.execute(sql, params or {})
+                    cols = [d[0].lower() for d in cur.description]
+                    while True:
+                        rows = cur.fetchmany(chunk_rows)
+                        self.rt.add("session_stream", 1)
+                        if not rows:
+                            break
+                        yield [dict(zip(cols, r)) for r in rows]
+                    if level:
+                        cx.commit()
+            yield QuerySession(run, stream)
 
     def execute_query(self, sql, params=None):
         with self._conn() as cx, cx.cursor() as cur:
             cur.execute(sql, params or {})
             if cur.description:                      # SELECT 등 결과셋
                 cols = [d[0].lower() for d in cur.description]
+                self.rt.add("execute_query", 1)
                 return [dict(zip(cols, r)) for r in cur.fetchall()]
             else:                                     # DML → 커밋 필요
                 cx.commit()
+                self.rt.add("execute_query", 2)
                 return {"affected": cur.rowcount}
         
     def call_procedure(self, name, params=None, out_count: int = 0, out_types: list[str] | None = None):
@@ -51,7 +267,7 @@ class OracleAdapter:
         """
         params = list(params or [])
         out_types = list(out_types or [])
-        with self._conn() as cx, cx.cursor() as cur:
+        with self._call_conn() as cx, cx.cursor() as cur:
             binds = []
             created_out_vars_idx = []
 
@@ -60,13 +276,7 @@ class OracleAdapter:
                 # OUT 범위면 변수 생성
                 if out_count > 0 and i >= total - out_count:
                     j = i - (total - out_count)
-                    hint = (out_types[j] if j < len(out_types) else "").lower()
-                    if hint.startswith("varchar"):
-                        v = cur.var(oracledb.DB_TYPE_VARCHAR)
-                    elif hint in ("date", "timestamp"):
-                        v = cur.var(oracledb.DB_TYPE_DATE)
-                    else:
-                        v = cur.var(oracledb.DB_TYPE_NUMBER)
+                    v = cur.var(out_var_type(out_types[j] if j < len(out_types) else ""))
                     binds.append(v)
                     created_out_vars_idx.append(i)
                 else:
@@ -77,7 +287,11 @@ class OracleAdapter:
                     binds.append(a)
 
             res = cur.callproc(name, binds)
-            cx.commit() 
+            if self.fast_call:
+                self.rt.add("call_procedure", 1)
+            else:
+                cx.commit()
+                self.rt.add("call_procedure", 2)
             # OUT 값만 추출
             outs = []
             for i in created_out_vars_idx:
@@ -99,7 +313,7 @@ class OracleAdapter:
         반환: OUT 커서가 1개면 list[dict], 여러 개면 {"out0":[..], "out1":[..]}
         """
         params = list(params or [])
-        with self._conn() as conn:
+        with self._call_conn() as conn:
             with conn.cursor() as cur:
                 bind_list = []
                 out_positions = []
@@ -117,7 +331,12 @@ class OracleAdapter:
                         pi += 1
 
                 res = cur.callproc(name, bind_list)
-                conn.commit() 
+                # callproc 1 + (fast_call이 아니면) COMMIT 1 + OUT 커서별 fetch 1
+                trips = 1 + len(out_positions)
+                if not self.fast_call:
+                    conn.commit()
+                    trips += 1
+                self.rt.add("call_procedure_with_cursor", trips)
 
                 if not out_positions:
                     return {"rows_affected": cur.rowcount}
@@ -0,0 +1,245 @@
+# db/pool.py
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class PoolTimeout(Exception):
+    """wait_timeout_sec 안에 커넥션을 얻지 못함 (풀 고갈)"""
+
+
+class ConnectionPool:
+    """
+    드라이버 중립 스레드-세이프 커넥션 풀 (gunicorn 워커 프로세스 단위).
+
+    - factory():            새 커넥션 생성
+    - close(conn):          커넥션 종료
+    - ping(conn):           체크아웃 시 생존 확인 (실패 시 예외) - pre_ping=True일 때만
+    - reset(conn):          반납 직전 상태 정리 (rollback 등), 예외 나면 폐기
+    - is_broken(conn, exc): with 블록에서 예외 발생 시 폐기 여부 판단 (기본: 항상 폐기)
+
+    idle_recycle_sec 이상 놀던 커넥션은 체크아웃 시 닫고 새로 만든다.
+    fork 감지: 생성 pid와 현재 pid가 다르면 부모의 소켓을 닫지 않고 버린 뒤 새로 시작.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        *,
+        close: Optional[Callable[[Any], None]] = None,
+        ping: Optional[Callable[[Any], None]] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+        is_broken: Optional[Callable[[Any, BaseException], bool]] = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_recycle_sec: float = 300,
+        pre_ping: bool = True,
+        wait_timeout_sec: float = 5.0,
+        name: str = "pool",
+    ):
+        self.factory = factory
+        self._close = close or (lambda c: c.close())
+        self._ping = ping
+        self._reset = reset
+        self._is_broken = is_broken or (lambda c, e: True)
+        self.min_size = max(0, int(min_size))
+        self.max_size = max(1, int(max_size))
+        self.idle_recycle_sec = float(idle_recycle_sec)
+        self.pre_ping = bool(pre_ping)
+        self.wait_timeout_sec = float(wait_timeout_sec)
+        self.name = name
+        self._init_state()
+
+    def _init_state(self):
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._idle = deque()        # (conn, last_used) - 오른쪽이 최근 반납
+        self._open = 0              # idle + 사용중
+        self._warmed = False
+        self._counters = {"created": 0, "closed": 0, "checkouts": 0,
+                          "waits": 0, "timeouts": 0, "broken": 0, "recycled": 0}
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            # 부모 프로세스 커넥션은 소켓을 공유하므로 close 하지 않고 버린다
+            self._init_state()
+
+    # ───────────── 내부 ─────────────
+    def _new(self):
+        conn = self.factory()
+        with self._cond:
+            self._counters["created"] += 1
+        return conn
+
+    def _discard(self, conn, counter: Optional[str] = None):
+        try:
+            self._close(conn)
+        except Exception:
+            pass
+        with self._cond:
+            self._open -= 1
+            self._counters["closed"] += 1
+            if counter:
+                self._counters[counter] += 1
+            self._cond.notify()
+
+    def _warmup(self):
+        """첫 체크아웃 시 min_size 까지 미리 채움 (실패는 무시, 실제 체크아웃에서 드러남)"""
+        with self._cond:
+            if self._warmed:
+                return
+            self._warmed = True
+            need = max(0, min(self.min_size, self.max_size) - self._open)
+            self._open += need
+        made = []
+        try:
+            for _ in range(need):
+                made.append(self._new())
+        except Exception:
+            pass
+        with self._cond:
+            self._open -= need - len(made)
+            now = time.monotonic()
+            for c in made:
+                self._idle.appendleft((c, now))
+            self._cond.notify_all()
+
+    # ───────────── 공개 API ─────────────
+    def acquire(self):
+        self._check_fork()
+        if not self._warmed:
+            self._warmup()
+
+        deadline = time.monotonic() + self.wait_timeout_sec
+        waited = False
+        while True:
+            conn, last_used, create = None, 0.0, False
+            with self._cond:
+                while not self._idle and self._open >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"[{self.name}] no connection available within "
+                            f"{self.wait_timeout_sec}s (max_size={self.max_size})"
+                        )
+                    if not waited:
+                        self._counters["waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, last_used = self._idle.pop()      # LIFO: 최근 반납분 재사용
+                else:
+                    self._open += 1
+                    create = True
+                self._counters["checkouts"] += 1
+
+            if create:
+                try:
+                    return self._new()
+                except BaseException:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+
+            if self.idle_recycle_sec > 0 and time.monotonic() - last_used > self.idle_recycle_sec:
+                self._discard(conn, "recycled")
+                continue
+            if self.pre_ping and self._ping is not None:
+                try:
+                    self._ping(conn)
+                except Exception:
+                    self._discard(conn, "broken")
+                    continue
+            return conn
+
+    def release(self, conn, broken: bool = False):
+        if self._pid != os.getpid():
+            return
+        if broken:
+            self._discard(conn, "broken")
+            return
+        if self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception:
+                self._discard(conn, "broken")
+                return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """with pool.connection() as conn: ...  (블록 종료 시 반납, 깨진 커넥션은 폐기)"""
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException as e:
+            try:
+                broken = bool(self._is_broken(conn, e))
+            except Exception:
+                broken = True
+            self.release(conn, broken=broken)
+            raise
+        else:
+            self.release(conn)
+
+    def close_all(self):
+        """idle 커넥션 모두 종료 (사용중인 커넥션은 반납 시점에 정상 처리됨)"""
+        self._check_fork()
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+            self._warmed = False
+        for conn, _ in idle:
+            try:
+                self._close(conn)
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "name": self.name,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": self._open,
+                "idle": idle,
+                "in_use": self._open - idle,
+                **self._counters,
+            }
+
+
+# ───────────── 워커 단위 공유 풀 ─────────────
+_SHARED: Dict[Hashable, Any] = {}
+_SHARED_LOCK = threading.Lock()
+_SHARED_PID = os.getpid()
+
+
+def shared_pool(key: Hashable, build: Callable[[], Any]):
+    """
+    key별로 프로세스당 풀 1개를 돌려준다. (어댑터 객체를 매 요청마다 만들어도 풀은 공유)
+    fork 후 첫 호출이면 부모의 풀은 버리고 새로 만든다.
+    """
+    global _SHARED_PID
+    with _SHARED_LOCK:
+        if _SHARED_PID != os.getpid():
+            _SHARED.clear()
+            _SHARED_PID = os.getpid()
+        pool = _SHARED.get(key)
+        if pool is None:
+            pool = _SHARED[key] = build()
+        return pool
+
+
+def drop_shared_pool(key: Hashable):
+    """shared_pool 등록 해제 (풀 종료는 호출 측에서)"""
+    with _SHARED_LOCK:
+        return _SHARED.pop(key, None)
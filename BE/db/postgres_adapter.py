@@ -1,20 +1,135 @@
 # db/postgres_adapter.py
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Optional, Union
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+from .metrics import RoundTripCounter
+from .pool import ConnectionPool, shared_pool
+from .session import QuerySession, isolation_level
+from .signatures import ProcParam, ProcSignature, SignatureCache, split_owner
 
 Params = Optional[Union[Iterable[Any], Dict[str, Any]]]
 
+def _ping(conn):
+    """
+    체크아웃 시 생존 확인 (pre_ping=True일 때만): 로컬 상태 확인 후 SELECT 1 왕복 1회.
+    서버 쪽에서 끊긴 커넥션(idle 타임아웃, 페일오버)도 여기서 걸러져 호출자 첫 쿼리가 실패하지 않는다.
+    autocommit으로 잠깐 바꿔 BEGIN/ROLLBACK 없이 실행 (idle 상태에서 autocommit 전환은 왕복 없음)
+    """
+    if conn.closed or conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+        raise psycopg2.InterfaceError("connection is closed")
+    autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+    finally:
+        if not conn.closed:
+            conn.autocommit = autocommit
+
+def _reset(conn):
+    """반납 전: 열린 트랜잭션이 남아 있으면 rollback"""
+    if conn.closed:
+        raise psycopg2.InterfaceError("connection is closed")
+    if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+        conn.rollback()
+
+def _is_broken(conn, exc: BaseException) -> bool:
+    return bool(conn.closed) or isinstance(exc, (psycopg2.OperationalError, psycopg2.InterfaceError))
+
+# 이름이 같은 오버로드가 여러 개면 가장 먼저 만들어진 것 기준
+SIGNATURE_SQL = """
+SELECT p.prokind,
+       p.proargnames,
+       p.proargmodes::text[] AS proargmodes,
+       ARRAY(SELECT format_type(t.oid, NULL)
+               FROM unnest(COALESCE(p.proallargtypes, p.proargtypes::oid[])) WITH ORDINALITY AS t(oid, ord)
+              ORDER BY t.ord) AS argtypes
+  FROM pg_proc p
+  JOIN pg_namespace n ON n.oid = p.pronamespace
+ WHERE p.proname = lower(%s)
+   AND (n.nspname = lower(%s) OR (%s IS NULL AND pg_function_is_visible(p.oid)))
+ ORDER BY p.oid
+ LIMIT 1
+"""
+
+_PG_MODES = {"i": "IN", "o": "OUT", "b": "INOUT", "v": "IN", "t": "OUT"}
+
+def signature_from_rows(name: str, rows: List[Dict[str, Any]]) -> ProcSignature:
+    """SIGNATURE_SQL 결과 → ProcSignature (sync/async 어댑터 공용)"""
+    if not rows:
+        raise ValueError(f"procedure not found: {name}")
+    r = rows[0]
+    types = r["argtypes"] or []
+    names = r["proargnames"] or []
+    modes = r["proargmodes"] or ["i"] * len(types)   # NULL이면 전부 IN
+    params = tuple(
+        ProcParam(names[i] if i < len(names) and names[i] else f"arg{i}", _PG_MODES.get(m, "IN"), types[i])
+        for i, m in enumerate(modes)
+    )
+    return ProcSignature(name, "proc" if r["prokind"] == "p" else "func", params)
+
+@lru_cache(maxsize=256)
+def call_sql(verb: str, name: str, argc: int) -> str:
+    """'CALL p(%s, ..)' / 'SELECT * FROM f(%s, ..)' 템플릿 (이름/인자수별 1회 생성)"""
+    return f"{verb} {name}({', '.join(['%s'] * argc)})"
+
 class PostgresAdapter:
-    def __init__(self, cfg: Dict[str, Any]):
+    def __init__(self, cfg: Dict[str, Any], pool_cfg: Optional[Dict[str, Any]] = None,
+                 fast_call: bool = False):
         """
         cfg 예: 
         { "host":"localhost","port":5432,"user":"postgres","password":"",
           "db":"postgres" }
+        pool_cfg 예: {"min_size":1,"max_size":10,"idle_recycle_sec":300,"pre_ping":True,"wait_timeout_sec":5}
+        fast_call: True면 call_function/call_procedure를 autocommit으로 실행
+                   (BEGIN/COMMIT 왕복 생략, 함수 호출 1회 왕복)
         """
         self.cfg = cfg
+        self.fast_call = bool(fast_call)
+        self.rt = RoundTripCounter()
+        self._sigs = SignatureCache()
+        key = ("postgres", cfg.get("host"), cfg.get("port"), cfg.get("user"), cfg.get("db"))
+        self._pool = shared_pool(key, lambda: ConnectionPool(
+            self._connect,
+            ping=self._ping,
+            reset=_reset,
+            is_broken=_is_broken,
+            name="postgres",
+            **(pool_cfg or {}),
+        ))
+
+    def _ping(self, conn):
+        self.rt.add("ping", 1)
+        _ping(conn)
 
     def _conn(self):
+        """풀에서 커넥션 체크아웃 (with 블록 종료 시 반납)"""
+        return self._pool.connection()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pool": self._pool.stats(), "fast_call": self.fast_call, "round_trips": self.rt.snapshot()}
+
+    def close(self):
+        self._pool.close_all()
+
+    # ───────────── 프로시저/함수 시그니처 ─────────────
+    def signature(self, name: str) -> ProcSignature:
+        return self._sigs.get(name, self._load_signature)
+
+    def invalidate_signatures(self, name: Optional[str] = None) -> int:
+        return self._sigs.invalidate(name)
+
+    def cached_signatures(self) -> List[Dict[str, Any]]:
+        return self._sigs.snapshot()
+
+    def _load_signature(self, name: str) -> ProcSignature:
+        owner, obj = split_owner(name)
+        return signature_from_rows(name, self.execute_query(SIGNATURE_SQL, (obj, owner, owner)))
+
+    def _connect(self):
         return psycopg2.connect(
             host=self.cfg["host"],
             port=self.cfg["port"],
@@ -23,25 +138,84 @@ class PostgresAdapter:
             dbname=self.cfg["db"],
             cursor_factory=psycopg2.extras.RealDictCursor,
         )
+
+    # `with conn:` 은 commit/rollback 만 하고 닫지 않음 → 반납은 바깥 with(_conn)가 담당
     def execute_query(self, sql: str, params: Params = None):
-        with self._conn() as conn, conn.cursor() as cur:
-            cur.execute(sql, params or ())
-            if cur.description:
-                return cur.fetchall()
-            return {"affected": cur.rowcount}
-        
+        with self._conn() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute(sql, params or ())
+                self.rt.add("execute_query", 3)  # BEGIN + 쿼리 + COMMIT
+                if cur.description:
+                    return cur.fetchall()
+                return {"affected": cur.rowcount}
+
+    @contextmanager
+    def session(self, timeout_ms: Optional[int] = None, readonly: bool = False, isolation: Optional[str] = None):
+        """
+        프라그마를 쿼리와 같은 풀 커넥션에 적용 → QuerySession.
+        SET TRANSACTION ... / SET LOCAL statement_timeout 을 쿼리 앞에 붙여 한 번에 전송
+        (BEGIN + 쿼리 + COMMIT = execute_query와 같은 3왕복). 트랜잭션 범위 설정이라 COMMIT/ROLLBACK 때 원복
+        stream(): named cursor(DECLARE ... CURSOR)로 FETCH chunk_rows씩. 설정은 같은 트랜잭션에서 먼저 실행
+        """
+        level = isolation_level(isolation)
+        modes = ([f"ISOLATION LEVEL {level}"] if level else []) + (["READ ONLY"] if readonly else [])
+        prefix = ("SET TRANSACTION " + ", ".join(modes) + "; ") if modes else ""
+        if timeout_ms:
+            prefix += f"SET LOCAL statement_timeout = {int(timeout_ms)}; "
+        with self._conn() as conn:
+            def run(sql: str, params: Params = None):
+                with conn, conn.cursor() as cur:
+                    cur.execute(prefix + sql, params or ())
+                    self.rt.add("session_query", 3)
+                    if cur.description:
+                        return cur.fetchall()
+                    return {"affected": cur.rowcount}
+
+            def stream(sql: str, params: Params = None, chunk_rows: int = 500):
+                with conn:
+                    if prefix:
+                        with conn.cursor() as pre:
+                            pre.execute(prefix)
+                    with conn.cursor(name="mdbs_stream", cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                        cur.itersize = chunk_rows
+                        cur.execute(sql, params or ())
+                        while True:
+                            rows = cur.fetchmany(chunk_rows)
+                            self.rt.add("session_stream", 1)
+                            if not rows:
+                                break
+                            yield rows
+            yield QuerySession(run, stream)
+
+    @contextmanager
+    def _call_conn(self):
+        """프로시저/함수 호출용: fast_call이면 autocommit(로컬 설정, 왕복 없음), 반납 전 원복"""
+        with self._conn() as conn:
+            if not self.fast_call:
+                with conn:
+                    yield conn
+                return
+            conn.autocommit = True
+            try:
+                yield conn
+            finally:
+                if not conn.closed:
+                    conn.autocommit = False
+
     def call_procedure(self, name: str, params=None):
-        """CALL proc(…): 결과셋 없음(보통), rowcount만 의미 있음"""
-        placeholders = ", ".join(["%s"] * len(params or ()))
-        sql = f"CALL {name}({placeholders})"
-        with self._conn() as conn, conn.cursor() as cur:
+        """CALL proc(…): OUT/INOUT이 있으면 그 값이 담긴 행 1개, 없으면 rowcount"""
+        sql = call_sql("CALL", name, len(params or ()))
+        with self._call_conn() as conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             cur.execute(sql, params or [])
+            self.rt.add("call_procedure", 1 if self.fast_call else 3)
+            if cur.description:
+                return cur.fetchall()
             return {"rows_affected": cur.rowcount}
 
     def call_function(self, name: str, params=None):
         """SELECT * FROM func(…): 결과셋 반환"""
-        placeholders = ", ".join(["%s"] * len(params or ()))
-        sql = f"SELECT * FROM {name}({placeholders})"
-        with self._conn() as conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        sql = call_sql("SELECT * FROM", name, len(params or ()))
+        with self._call_conn() as conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             cur.execute(sql, params or [])
-            return cur.fetchall()
\ No newline at end of file
+            self.rt.add("call_function", 1 if self.fast_call else 3)
+            return cur.fetchall()
@@ -1,26 +1,83 @@
 # db/router.py
+import atexit
+import os
+import threading
+from typing import Any, Dict
 from flask import current_app
 from .mysql_adapter import MySQLAdapter
 from .postgres_adapter import PostgresAdapter
 from .oracle_adapter import OracleAdapter
 from .mongo_adapter import MongoAdapter
 
+SUPPORTED_DBMS = ("mysql", "postgres", "oracle", "mongo")
+
+# 워커 프로세스당 DBMS별 어댑터 1개 (fork 후에는 새로 생성)
+_ADAPTERS: Dict[str, Any] = {}
+_OVERRIDES: Dict[str, Any] = {}
+_LOCK = threading.Lock()
+_PID = os.getpid()
+
+def _build(d: str, cfg) -> Any:
+    if d == "mysql":
+        return MySQLAdapter(cfg["MYSQL"], cfg.get("MYSQL_POOL"), fast_call=cfg.get("MYSQL_FAST_CALL", False))
+    if d == "postgres":
+        return PostgresAdapter(cfg["POSTGRES"], cfg.get("POSTGRES_POOL"), fast_call=cfg.get("POSTGRES_FAST_CALL", False))
+    if d == "oracle":
+        return OracleAdapter(cfg["ORACLE"], cfg.get("ORACLE_POOL"), fast_call=cfg.get("ORACLE_FAST_CALL", False))
+    return MongoAdapter({
+        "uri": cfg["MONGO_URI"],
+        "db": cfg.get("MONGO_DB", "mdbs"),
+        "max_pool_size": cfg.get("MONGO_MAX_POOL_SIZE"),
+        "min_pool_size": cfg.get("MONGO_MIN_POOL_SIZE"),
+    })
+
 def get_adapter(dbms: str):
     """
     dbms: 'mysql' | 'postgres' | 'oracle' | 'mongo'
+    최초 호출 시 생성해 두고 이후에는 같은 어댑터(풀/MongoClient)를 재사용한다.
     """
+    global _PID
     d = (dbms or "").lower()
-    cfg = current_app.config
+    if d not in SUPPORTED_DBMS:
+        raise ValueError(f"Unsupported DBMS: {dbms}")
 
-    if d == "mysql":
-        return MySQLAdapter(cfg["MYSQL"])
-    if d == "postgres":
-        return PostgresAdapter(cfg["POSTGRES"])
-    if d == "oracle":
-        return OracleAdapter(cfg["ORACLE"])
-    if d == "mongo":
-        return MongoAdapter({
-            "uri": cfg["MONGO_URI"],
-            "db": cfg.get("MONGO_DB", "mdbs")
-        })
-    raise ValueError(f"Unsupported DBMS: {dbms}")
+    override = _OVERRIDES.get(d)
+    if override is not None:
+        return override
+
+    with _LOCK:
+        if _PID != os.getpid():
+            # 부모 프로세스의 클라이언트/소켓은 닫지 않고 버린다
+            _ADAPTERS.clear()
+            _PID = os.getpid()
+        adapter = _ADAPTERS.get(d)
+        if adapter is None:
+            adapter = _ADAPTERS[d] = _build(d, current_app.config)
+        return adapter
+
+def set_adapter(dbms: str, adapter: Any) -> None:
+    """테스트용: get_adapter(dbms)가 돌려줄 어댑터를 교체 (None이면 교체 해제)"""
+    d = dbms.lower()
+    if adapter is None:
+        _OVERRIDES.pop(d, None)
+    else:
+        _OVERRIDES[d] = adapter
+
+def clear_adapter_overrides() -> None:
+    _OVERRIDES.clear()
+
+def close_adapters() -> None:
+    """워커 종료 시 풀/클라이언트 정리"""
+    with _LOCK:
+        if _PID != os.getpid():
+            _ADAPTERS.clear()
+            return
+        adapters = list(_ADAPTERS.values())
+        _ADAPTERS.clear()
+    for a in adapters:
+        try:
+            a.close()
+        except Exception:
+            pass
+
+atexit.register(close_adapters)
@@ -0,0 +1,59 @@
+# db/session.py
+"""
+어댑터 session() 공용: 템플릿 프라그마(timeout_ms / readonly / isolation)를
+쿼리와 같은 풀 커넥션에 적용한다. DBMS별 적용 방식은 각 어댑터 session() 참고.
+"""
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# 프라그마 값 → SQL 표준 표기
+ISOLATION_LEVELS = {
+    "read_uncommitted": "READ UNCOMMITTED",
+    "read_committed": "READ COMMITTED",
+    "repeatable_read": "REPEATABLE READ",
+    "serializable": "SERIALIZABLE",
+}
+
+# Oracle은 READ COMMITTED / SERIALIZABLE만 지원
+_SUPPORTED = {"oracle": ("read_committed", "serializable")}
+
+# 맨 앞 공백/한 줄 주석(-- 프라그마) 뒤의 SELECT
+_LEADING_SELECT_RE = re.compile(r"^((?:\s*--[^\n]*\n)*\s*)(select)\b", re.I)
+
+
+def isolation_level(name: Optional[str], dbms: str = "") -> Optional[str]:
+    """'read_committed' → 'READ COMMITTED' (None이면 None, 모르는 값/그 DBMS 미지원 값은 ValueError)"""
+    if not name:
+        return None
+    key = name.strip().lower().replace(" ", "_").replace("-", "_")
+    allowed = _SUPPORTED.get(dbms, tuple(ISOLATION_LEVELS))
+    if key not in allowed:
+        raise ValueError(f"unsupported isolation: {name} (use {', '.join(allowed)})")
+    return ISOLATION_LEVELS[key]
+
+
+def is_select(sql: str) -> bool:
+    return _LEADING_SELECT_RE.match(sql or "") is not None
+
+
+def with_select_hint(sql: str, hint: str) -> str:
+    """첫 SELECT 바로 뒤에 옵티마이저 힌트 삽입 (SELECT가 아니면 그대로)"""
+    return _LEADING_SELECT_RE.sub(lambda m: f"{m.group(1)}{m.group(2)} /*+ {hint} */", sql, count=1)
+
+
+class QuerySession:
+    """
+    session() 블록 안에서 쓰는 핸들.
+    - execute_query(): 어댑터 execute_query와 같은 반환 형식
+    - stream(): 서버 측 커서로 chunk_rows개씩 list[dict] 를 내보내는 generator (블록 안에서 소비)
+    """
+
+    def __init__(self, run: Callable[[str, Any], Any], stream: Callable[..., Iterator[List[Dict[str, Any]]]]):
+        self._run = run
+        self._stream = stream
+
+    def execute_query(self, sql: str, params: Any = None):
+        return self._run(sql, params)
+
+    def stream(self, sql: str, params: Any = None, chunk_rows: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        return self._stream(sql, params, max(1, int(chunk_rows)))
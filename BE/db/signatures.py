@@ -0,0 +1,103 @@
+# db/signatures.py
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ProcParam:
+    name: str
+    mode: str                  # "IN" | "OUT" | "INOUT"
+    data_type: str             # DBMS 원본 타입명 (소문자)
+
+
+@dataclass(frozen=True)
+class ProcSignature:
+    """
+    프로시저/함수 시그니처 (information_schema.parameters / pg_proc / ALL_ARGUMENTS 에서 1회 조회)
+    호출마다 필요한 값(IN 개수, OUT 이름/타입)을 미리 계산해 둔다.
+    INOUT은 인자 자리 1개 — 값을 받으므로 in_count에, 결과로 돌아오므로 out_count에도 들어간다.
+    """
+    name: str
+    kind: str                                  # "proc" | "func"
+    params: Tuple[ProcParam, ...]
+    in_count: int = field(init=False)
+    out_count: int = field(init=False)
+    out_names: Tuple[str, ...] = field(init=False)    # 'p_' 접두사 제거
+    out_types: Tuple[str, ...] = field(init=False)
+    # OUT이 전부 IN 뒤에 있고 INOUT이 없음 (MySQL/Oracle 어댑터의 '마지막 out_count개 = OUT' 호출 규칙)
+    tail_outs: bool = field(init=False)
+
+    def __post_init__(self):
+        outs = [p for p in self.params if p.mode in ("OUT", "INOUT")]
+        object.__setattr__(self, "in_count", sum(1 for p in self.params if p.mode in ("IN", "INOUT")))
+        object.__setattr__(self, "out_count", len(outs))
+        object.__setattr__(self, "out_names", tuple(_clean_name(p.name) for p in outs))
+        object.__setattr__(self, "out_types", tuple(p.data_type for p in outs))
+        first_out = next((i for i, p in enumerate(self.params) if p.mode != "IN"), len(self.params))
+        object.__setattr__(self, "tail_outs", all(p.mode == "OUT" for p in self.params[first_out:]))
+
+    def bind_args(self, in_args: List[Any]) -> List[Any]:
+        """IN 값만 받은 경우 전체 인자 목록: 선언 순서대로 IN/INOUT 자리는 값, OUT 자리는 None"""
+        if len(in_args) != self.in_count:
+            raise ValueError(f"{self.name}: expected {self.in_count} IN args, got {len(in_args)}")
+        it = iter(in_args)
+        return [None if p.mode == "OUT" else next(it) for p in self.params]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "params": [{"name": p.name, "mode": p.mode, "type": p.data_type} for p in self.params],
+            "in_count": self.in_count,
+            "out_names": list(self.out_names),
+            "out_types": list(self.out_types),
+        }
+
+
+def _clean_name(name: str) -> str:
+    n = (name or "").lower()
+    return n[2:] if n.startswith("p_") else n
+
+
+def split_owner(name: str) -> Tuple[Optional[str], str]:
+    """'MDBS.sp_x' -> ('MDBS', 'sp_x'), 'sp_x' -> (None, 'sp_x')"""
+    if "." in name:
+        owner, _, obj = name.rpartition(".")
+        return owner, obj
+    return None, name
+
+
+class SignatureCache:
+    """이름별 시그니처 캐시 (명시적 invalidate 전까지 유지, 워커 프로세스 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sigs: Dict[str, ProcSignature] = {}
+
+    def get(self, name: str, loader: Callable[[str], ProcSignature]) -> ProcSignature:
+        sig = self.lookup(name)
+        if sig is None:
+            sig = self.put(name, loader(name))
+        return sig
+
+    def lookup(self, name: str) -> Optional[ProcSignature]:
+        return self._sigs.get(name.lower())
+
+    def put(self, name: str, sig: ProcSignature) -> ProcSignature:
+        """async 어댑터용: 로더를 await 한 뒤 직접 저장"""
+        with self._lock:
+            self._sigs[name.lower()] = sig
+        return sig
+
+    def invalidate(self, name: Optional[str] = None) -> int:
+        with self._lock:
+            if name is None:
+                n = len(self._sigs)
+                self._sigs.clear()
+                return n
+            return 1 if self._sigs.pop(name.lower(), None) is not None else 0
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [s.to_dict() for s in self._sigs.values()]
@@ -1,24 +1,67 @@
 # BE/routes/db_routes.py
-from flask import Blueprint, request
-from utils.response import ok, fail
-from services.file_sql_service import run_sql_file, run_mongo_file
+import json
+import time
+from flask import Blueprint, Response, current_app, request
+from utils.response import ok, ok_raw, fail
+from services.file_sql_service import (STREAM_FORMATS, page_mongo_file, page_sql_file, run_sql_file,
+                                       run_mongo_file, stream_mongo_file, stream_sql_file, templates)
+from services.fanout_service import FANOUT_DBMS, fanout_file
+from services.proc_service import exec_batch, exec_proc
+from services.hold_sweeper import SWEEP_DBMS, HoldSweeper, sweep_all, sweeper
+from services.result_cache import result_cache
 from db.router import get_adapter
 
 db_bp = Blueprint("db", __name__)
 
+def _stream_response(chunks, mimetype: str = "application/x-ndjson"):
+    """
+    청크 iterator → 스트리밍 응답. 스트리밍 도중 오류는 마지막 줄로 알림
+    (NDJSON: {"error": ...}, CSV: # error: ...)
+    """
+    def gen():
+        try:
+            yield from chunks
+        except Exception as e:
+            if mimetype == "text/csv":
+                yield f"# error: {e}\n".encode("utf-8")
+            else:
+                yield json.dumps({"error": str(e)}, ensure_ascii=False).encode("utf-8") + b"\n"
+    return Response(gen(), mimetype=mimetype)
+
 @db_bp.post("/file/sql")
 def file_sql():
     """
     Body: {
       "dbms": "mysql|postgres|oracle",
       "id":   "query.accounts.list_all",
-      "params": { "limit": 50, "offset": 0 }
+      "params": { "limit": 50, "offset": 0 },
+      "stream": false, "format": "ndjson|csv", "chunk_rows": 500,
+      "cursor": null
     }
     -> 파일 규칙: BE/sql/{dbms}/{id}.sql
+    stream=true → 서버 측 커서로 읽어 NDJSON/CSV 스트리밍 (최대 SQL_STREAM_MAX_ROWS행)
+    "cursor" 키가 있으면 keyset 페이지 (paginate=keyset 템플릿, null=첫 페이지, params.limit=페이지 크기)
+      -> {"ok": true, "data": [...], "next_cursor": "..." | null}
     """
     d = request.get_json(force=True) or {}
-    
+
+    if d.get("stream"):
+        cfg = current_app.config
+        fmt = (d.get("format") or "ndjson").lower()
+        try:
+            chunks = stream_sql_file(d["dbms"], d["id"], d.get("params", {}), fmt=fmt,
+                                     chunk_rows=d.get("chunk_rows") or cfg.get("SQL_STREAM_CHUNK_ROWS", 500),
+                                     max_rows=cfg.get("SQL_STREAM_MAX_ROWS", 100000),
+                                     flush_bytes=cfg.get("SQL_STREAM_FLUSH_BYTES", 256 * 1024),
+                                     timeout_ms=cfg.get("SQL_STREAM_TIMEOUT_MS", 60000))
+        except Exception as e:
+            return fail(str(e), 400)
+        return _stream_response(chunks, STREAM_FORMATS[fmt])
+
     try:
+        if "cursor" in d:
+            rows, nxt = page_sql_file(d["dbms"], d["id"], d.get("params", {}), d["cursor"])
+            return ok(rows, next_cursor=nxt)
         res = run_sql_file(d["dbms"], d["id"], d.get("params", {}))
         return ok(res)
     except Exception as e:
@@ -26,91 +69,151 @@ def file_sql():
 
 @db_bp.post("/file/mongo")
 def file_mongo():
+    """
+    Body: {"collection": "ledger_entries", "id": "query.ledger_entries.by_account_id", "params": {...},
+           "stream": false, "batch_size": 500, "cursor": null}
+    stream=true → NDJSON(문서 1개/줄) 스트리밍. limit 최대 MONGO_STREAM_MAX_ROWS (비스트리밍은 1000)
+    "cursor" 키가 있으면 keyset 페이지 (/db/file/sql과 같은 규칙)
+    """
     d = request.get_json(force=True) or {}
     collection = d["collection"]          # ← 반드시 받기
     qid = d["id"]
     params = d.get("params", {})
-    res = run_mongo_file(collection, qid, params)
-    return ok(res)
+    if d.get("stream"):
+        cfg = current_app.config
+        try:
+            chunks = stream_mongo_file(collection, qid, params,
+                                       batch_size=d.get("batch_size") or cfg.get("MONGO_STREAM_BATCH_SIZE", 500),
+                                       max_rows=cfg.get("MONGO_STREAM_MAX_ROWS", 100000))
+        except Exception as e:
+            return fail(str(e), 400)
+        return _stream_response(chunks)
+    if "cursor" in d:
+        try:
+            data, nxt = page_mongo_file(collection, qid, params, d["cursor"])
+        except Exception as e:
+            return fail(str(e), 400)
+        return ok_raw(data, next_cursor=nxt)
+    res = run_mongo_file(collection, qid, params, as_json=True)
+    return ok_raw(res) if isinstance(res, bytes) else ok(res)
+
+@db_bp.post("/file/fanout")
+def file_fanout():
+    """
+    Body: {"id": "query.accounts.all_balance", "dbms": ["mysql", "postgres", "oracle", "mongo"](생략 시 전체),
+           "params": {...}, "timeout_ms": 5000 | {"oracle": 8000, ...}, "collection": null}
+    같은 템플릿을 DBMS별로 동시에 실행 (mongo 컬렉션은 id에서, 다르면 "collection")
+    -> {"ok": true, "data": {dbms: {"ok", "data", "elapsed_ms"} | {"ok": false, "error", "timeout"}},
+        "failed": [...], "elapsed_ms": n}   (일부 실패여도 200)
+    """
+    d = request.get_json(force=True) or {}
+    dbms_list = d.get("dbms") or list(FANOUT_DBMS)
+    if isinstance(dbms_list, str):
+        dbms_list = [dbms_list]
+    t0 = time.perf_counter()
+    try:
+        results, failed = fanout_file(current_app._get_current_object(), d["id"], dbms_list, d.get("params", {}),
+                                      timeout_ms=d.get("timeout_ms"),
+                                      default_timeout_ms=current_app.config.get("FANOUT_TIMEOUT_MS", 5000),
+                                      collection=d.get("collection"))
+    except Exception as e:
+        return fail(str(e), 400)
+    return ok(results, failed=failed, elapsed_ms=round((time.perf_counter() - t0) * 1000, 2))
+
+@db_bp.get("/templates")
+def templates_list():
+    """워커에 로드된 쿼리 템플릿 목록 (?dbms=mongo 로 필터). error: 로드/검증 실패 사유"""
+    only = (request.args.get("dbms") or "").lower() or None
+    return ok({"reload_sec": templates.reload_sec, "reloads": templates.reloads, "templates": templates.list(only)})
+
+@db_bp.post("/templates/reload")
+def templates_reload():
+    """전체 다시 로드 (워커별 캐시 → 워커 수만큼 호출하거나 재시작)"""
+    try:
+        return ok({"compiled": templates.refresh(force=True)})
+    except Exception as e:
+        return fail(str(e), 500)
+
+@db_bp.get("/cache")
+def cache_stats():
+    """템플릿 결과 캐시 통계 (워커별): entries, hits, misses, hit_ratio, evictions, expired, invalidations"""
+    return ok(result_cache.stats())
+
+@db_bp.post("/cache/invalidate")
+def cache_invalidate():
+    """Body(선택): {"dbms": "mysql|postgres|oracle|mongo"} (생략 시 전체) -> data: {"removed": n}"""
+    d = request.get_json(silent=True) or {}
+    return ok({"removed": result_cache.invalidate((d.get("dbms") or "").lower() or None)})
 
 @db_bp.post("/proc/exec")
 def proc_exec():
-    from utils.response import ok, fail
-    from db.router import get_adapter
     try:
         d = request.get_json(force=True) or {}
-        dbms = (d.get("dbms") or "").lower()
-        name = d["name"]
-        args = d.get("args", []) or []
-        out_names = d.get("out_names")  # 예: ["txn_id", "status"]
-        adapter = get_adapter(dbms)
-
-        result = None
-
-        if dbms == "postgres":
-            # FUNCTION 결과셋: SELECT * FROM func(...)
-            # PROCEDURE: CALL proc(...)
-            mode = (d.get("mode") or "proc").lower()
-            if mode == "func":
-                result = adapter.call_function(name, args)
-            else:
-                result = adapter.call_procedure(name, args)
-
-            # PostgreSQL 정규화: [{"p_txn_id": 123, "p_status": "1"}] → {"txn_id": 123, "status": "1"}
-            if out_names and isinstance(result, list) and len(result) > 0:
-                first_row = result[0]
-                normalized = {}
-                # 컬럼 이름에서 'p_' 접두사를 제거하고 매핑
-                for key, value in first_row.items():
-                    clean_key = key.replace('p_', '') if key.startswith('p_') else key
-                    normalized[clean_key] = value
-                return ok(normalized)
-
-            return ok(result)
-
-        if dbms == "oracle":
-            # ★ 추가: out_count / out_types / timeout_ms 전달
-            out_count  = int(d.get("out_count", 0))
-            out_types  = d.get("out_types") or []
-
-            out_spec = d.get("out")
-            if out_spec:
-                result = adapter.call_procedure_with_cursor(name, args, out_spec=out_spec)
-            else:
-                result = adapter.call_procedure(
-                    name,
-                    args,
-                    out_count=out_count,
-                    out_types=out_types
-                )
-
-            # Oracle 정규화: {"out": [123, "1"], "all": [...]} → {"txn_id": 123, "status": "1"}
-            if out_names and isinstance(result, dict) and "out" in result:
-                out_values = result["out"]
-                normalized = {}
-                for i, name_key in enumerate(out_names):
-                    if i < len(out_values):
-                        normalized[name_key] = out_values[i]
-                return ok(normalized)
-
-            return ok(result)
-
-        if dbms == "mysql":
-            out_count = int(d.get("out_count", 0))
-            result = adapter.call_procedure(name, args, out_count=out_count)
-
-            # MySQL 정규화: {"resultset": ..., "out": {"out0": 123, "out1": "1"}} → {"txn_id": 123, "status": "1"}
-            if out_names and isinstance(result, dict) and "out" in result and result["out"]:
-                out_dict = result["out"]
-                normalized = {}
-                for i, name_key in enumerate(out_names):
-                    out_key = f"out{i}"
-                    if out_key in out_dict:
-                        normalized[name_key] = out_dict[out_key]
-                return ok(normalized)
-
-            return ok(result)
+        return ok(exec_proc(d))
+    except Exception as e:
+        return fail(str(e), 400)
+
+@db_bp.post("/proc/batch")
+def proc_batch():
+    """
+    Body: {"items": [{"dbms": "mysql", "name": "sp_x", "args": [...], "out_names": [...]}, ...]}
+    -> data: [{"ok": true, "data": ...} | {"ok": false, "error": "..."}, ...] (items 순서)
+    """
+    try:
+        d = request.get_json(force=True) or {}
+        items = d.get("items")
+        if not isinstance(items, list) or not items:
+            return fail("items must be a non-empty list", 400)
+        limit = current_app.config.get("PROC_BATCH_MAX", 500)
+        if len(items) > limit:
+            return fail(f"too many items: {len(items)} > {limit}", 400)
+        return ok(exec_batch(items))
+    except Exception as e:
+        return fail(str(e), 400)
+
+@db_bp.get("/proc/signatures")
+def proc_signatures():
+    """워커에 캐시된 프로시저 시그니처 (?dbms=mysql 로 필터)"""
+    try:
+        only = (request.args.get("dbms") or "").lower()
+        dbms_list = [only] if only else ["mysql", "postgres", "oracle"]
+        return ok({d: get_adapter(d).cached_signatures() for d in dbms_list})
+    except Exception as e:
+        return fail(str(e), 400)
 
+@db_bp.post("/proc/signatures/invalidate")
+def proc_signatures_invalidate():
+    """
+    Body: {"dbms": "mysql|postgres|oracle"(생략 시 전체), "name": "sp_x"(생략 시 전체)}
+    프로시저 DDL 변경 후 호출 (워커별 캐시이므로 각 워커에 반영되려면 워커 수만큼 호출하거나 재시작)
+    """
+    try:
+        d = request.get_json(silent=True) or {}
+        only = (d.get("dbms") or "").lower()
+        dbms_list = [only] if only else ["mysql", "postgres", "oracle"]
+        return ok({x: get_adapter(x).invalidate_signatures(d.get("name")) for x in dbms_list})
     except Exception as e:
         return fail(str(e), 400)
-    
\ No newline at end of file
+
+@db_bp.post("/holds/sweep")
+def holds_sweep():
+    """
+    TTL 지난 OPEN hold 즉시 정리 (1회).
+    Body(선택): {"dbms": ["mysql", ...], "ttl_sec": 300, "batch_size": 100, "max_batches": 10, "pause_ms": 50}
+    -> data: {dbms: {scanned, released, skipped, failed, batches, scan_ms, release_ms, avg_release_ms, ...}}
+    """
+    try:
+        d = request.get_json(silent=True) or {}
+        opts = HoldSweeper.options(current_app.config)
+        opts.update({k: int(d[k]) for k in opts if d.get(k) is not None})
+        dbms_list = d.get("dbms") or list(SWEEP_DBMS)
+        if isinstance(dbms_list, str):
+            dbms_list = [dbms_list]
+        return ok(sweep_all(current_app._get_current_object(), dbms_list, **opts))
+    except Exception as e:
+        return fail(str(e), 400)
+
+@db_bp.get("/holds/sweeper")
+def holds_sweeper_status():
+    """백그라운드 정리 상태 + 마지막 실행 결과 (워커별)"""
+    return ok(sweeper.status())
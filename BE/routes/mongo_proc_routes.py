@@ -1,6 +1,7 @@
 # routes/mongo_proc_routes.py
 from flask import Blueprint, request
-from services.mongo_tx_service import MongoTxService
+from services.mongo_tx_service import get_mongo_tx_service
+from services.result_cache import result_cache
 from utils.response import ok, fail
 
 mongo_bp = Blueprint("mongo_proc", __name__)
@@ -8,7 +9,8 @@ mongo_bp = Blueprint("mongo_proc", __name__)
 @mongo_bp.post("/init/indexes")
 def init_indexes():
     try:
-        MongoTxService().ensure_indexes()#인덱스 있는지 체크
+        # 워커 기동 시 자동 생성됨. 수동 재생성용으로 유지
+        get_mongo_tx_service().ensure_indexes(force=True)
         return ok({"initialized": True})
     except Exception as e:
         return fail(str(e), 400)
@@ -16,7 +18,7 @@ def init_indexes():
 @mongo_bp.post("/remittance/hold")
 def remittance_hold():
     try:
-        svc = MongoTxService()
+        svc = get_mongo_tx_service()
         return ok(svc.remittance_hold(request.get_json(force=True)))
     except Exception as e:
         return fail(str(e), 400)
@@ -24,7 +26,7 @@ def remittance_hold():
 @mongo_bp.post("/receive/prepare")
 def receive_prepare():
     try:
-        svc = MongoTxService()
+        svc = get_mongo_tx_service()
         return ok(svc.receive_prepare(request.get_json(force=True)))
     except Exception as e:
         return fail(str(e), 400)
@@ -32,31 +34,37 @@ def receive_prepare():
 @mongo_bp.post("/confirm/debit/local")
 def confirm_debit_local():
     try:
-        svc = MongoTxService()
-        return ok(svc.confirm_debit_local(request.get_json(force=True)))
+        svc = get_mongo_tx_service()
+        res = svc.confirm_debit_local(request.get_json(force=True))
+        result_cache.on_commit("mongo", "sp_confirm_debit_local")
+        return ok(res)
     except Exception as e:
         return fail(str(e), 400)
 
 @mongo_bp.post("/confirm/credit/local")
 def confirm_credit_local():
     try:
-        svc = MongoTxService()
-        return ok(svc.confirm_credit_local(request.get_json(force=True)))
+        svc = get_mongo_tx_service()
+        res = svc.confirm_credit_local(request.get_json(force=True))
+        result_cache.on_commit("mongo", "sp_confirm_credit_local")
+        return ok(res)
     except Exception as e:
         return fail(str(e), 400)
 
 @mongo_bp.post("/transfer/confirm/internal")
 def transfer_confirm_internal():
     try:
-        svc = MongoTxService()
-        return ok(svc.transfer_confirm_internal(request.get_json(force=True)))
+        svc = get_mongo_tx_service()
+        res = svc.transfer_confirm_internal(request.get_json(force=True))
+        result_cache.on_commit("mongo", "sp_transfer_confirm_internal")
+        return ok(res)
     except Exception as e:
         return fail(str(e), 400)
 
 @mongo_bp.post("/remittance/release")
 def remittance_release():
     try:
-        svc = MongoTxService()
+        svc = get_mongo_tx_service()
         return ok(svc.remittance_release(request.get_json(force=True)))
     except Exception as e:
         return fail(str(e), 400)
@@ -70,7 +78,9 @@ def reset_data():
     try:
         body = request.get_json(force=True) or {}
         test_account_ids = body.get("test_account_ids")
-        svc = MongoTxService()
-        return ok(svc.reset_data(test_account_ids))
+        svc = get_mongo_tx_service()
+        res = svc.reset_data(test_account_ids)
+        result_cache.invalidate("mongo")
+        return ok(res)
     except Exception as e:
         return fail(str(e), 400)
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from services.rdg_runner import runner, RDGConfig
+from services.mongo_tx_service import parse_durability
 import os
 
 bp_rdg = Blueprint("rdg", __name__)
@@ -22,6 +23,10 @@ def rdg_start():
         if current_status.get("running"):
             return jsonify(ok=False, error="RDG is already running"), 400
 
+        # Mongo 내구성 프로파일은 시작 전에 검증 (잘못된 값이면 400)
+        if data.get("mongo_durability"):
+            parse_durability(data["mongo_durability"])
+
         cfg = RDGConfig(
             base_url=data.get("base_url", "http://127.0.0.1:5000"),
             rps=int(data.get("rps", 10)),
@@ -31,6 +36,7 @@ def rdg_start():
             max_amount=int(data.get("max_amount", 100_000)),
             allow_same_db=bool(data.get("allow_same_db", False)),
             log_level=data.get("log_level", "DEBUG"),
+            mongo_durability=data.get("mongo_durability") or None,
         )
         runner.start(cfg)
         return jsonify(ok=True, status=runner.status())
@@ -102,6 +102,26 @@ def db_conn_counts():
     except Exception as e:
         return fail(str(e), 500)
 
+@sys_bp.get("/db-pools")
+def db_pools():
+    """
+    워커(프로세스) 단위 커넥션 풀 상태
+    - mysql/postgres: open / idle / in_use / waits / timeouts ...
+    - oracle: open / busy / idle / waits / wait_ms / timeouts / stmtcachesize ...
+    """
+    from db.router import get_adapter
+
+    data = {"pid": os.getpid()}
+    for dbms in ("mysql", "postgres", "oracle"):
+        try:
+            data[dbms] = get_adapter(dbms).stats()
+        except Exception as e:
+            data[dbms] = {"error": str(e)}
+    return ok(data)
+
+# 시스템 리셋 시 초기 잔액을 넣는 Mongo 계좌 (sql/mongo/reset.data_and_sequences.json과 같은 목록)
+MONGO_RESET_ACCOUNTS = ["100001", "100002", "100003", "100004", "100005"]
+
 @sys_bp.post("/reset")
 def reset_environment():
     """
@@ -115,7 +135,8 @@ def reset_environment():
     from flask import current_app
     from services.rdg_runner import runner
     from db.router import get_adapter
-    from services.mongo_tx_service import MongoTxService
+    from services.mongo_tx_service import get_mongo_tx_service
+    from services.result_cache import result_cache
     import oracledb
 
     try:
@@ -180,7 +201,7 @@ def reset_environment():
                 oracle_sql = f.read()
 
             # Oracle은 PL/SQL 블록 또는 여러 문장일 수 있음
-            # OracleAdapter는 pool이 없으므로 execute_query 사용
+            # PL/SQL 익명 블록 하나로 실행 (세션 풀에서 체크아웃)
             oracle_adapter.execute_query(oracle_sql)
             results["oracle"] = "OK"
         except oracledb.Error as e:
@@ -195,15 +216,17 @@ def reset_environment():
             errors.append(f"Oracle: {str(e)}")
             results["oracle"] = f"FAILED: {str(e)}"
 
-        # MongoDB 리셋
+        # MongoDB 리셋: 서비스 reset_data (잔액 버킷 슬롯 재배치 + 인덱스 재생성, 현재 금액 표현으로)
         try:
-            from services.file_sql_service import run_mongo_file
-            mongo_result = run_mongo_file("", "reset.data_and_sequences", {})
+            get_mongo_tx_service().reset_data(MONGO_RESET_ACCOUNTS)
             results["mongo"] = "OK"
         except Exception as e:
             errors.append(f"MongoDB: {str(e)}")
             results["mongo"] = f"FAILED: {str(e)}"
 
+        # 템플릿 결과 캐시(cache_ttl_sec) 전체 비움: 실패한 DBMS도 일부 문장은 반영됐을 수 있음
+        result_cache.invalidate()
+
         # 4. 결과 반환
         if errors:
             return ok({
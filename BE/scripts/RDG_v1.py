@@ -36,6 +36,9 @@ class RDGConfig:
     # 이체 설정
     allow_same_db: bool = True  # 같은 DBMS 내 이체 허용 여부
 
+    # Mongo 내구성 프로파일 (bench | safe | "bench,ledger=safe"), None이면 서버 기본값
+    mongo_durability: Optional[str] = None
+
     def __post_init__(self):
         if self.active_dbms is None or len(self.active_dbms) == 0:
             raise ValueError("active_dbms must be set in rdg_config.py")
@@ -95,6 +98,8 @@ class Stats:
         self.total_fail = 0
         self.start_time = time.time()
         self.last_report = time.time()
+        self.mongo_durability: Optional[str] = None
+        self.mongo_latency: Dict[str, List[float]] = {}   # operation → 응답 시간(ms)
 
     def increment_sent(self):
         self.total_sent += 1
@@ -105,6 +110,9 @@ class Stats:
     def increment_fail(self):
         self.total_fail += 1
 
+    def record_mongo_latency(self, operation: str, ms: float):
+        self.mongo_latency.setdefault(operation, []).append(ms)
+
     def report(self):
         """통계 리포트"""
         elapsed = time.time() - self.start_time
@@ -115,6 +123,15 @@ class Stats:
         logger.info(f"경과 시간: {elapsed:.2f}초")
         logger.info(f"전송: {self.total_sent} | 성공: {self.total_success} | 실패: {self.total_fail}")
         logger.info(f"실제 RPS: {actual_rps:.2f} | 성공률: {success_rate:.2f}%")
+        if self.mongo_latency:
+            all_ms = [ms for v in self.mongo_latency.values() for ms in v]
+            logger.info(f"Mongo 내구성: {self.mongo_durability or 'server-default'} | "
+                        f"평균 지연: {sum(all_ms) / len(all_ms):.2f}ms")
+            for op, v in sorted(self.mongo_latency.items()):
+                v = sorted(v)
+                p99 = v[min(len(v) - 1, int(len(v) * 0.99))]
+                logger.info(f"  mongo/{op}: n={len(v)} avg={sum(v) / len(v):.2f}ms "
+                            f"p50={v[len(v) // 2]:.2f}ms p99={p99:.2f}ms")
         logger.info("=" * 60)
 
 stats = Stats()
@@ -202,48 +219,23 @@ class APIClient:
         dbms: str,
         proc_name: str,
         args: List[Any],
-        out_count: int = 0,
-        out_names: List[str] = None,
-        mode: str = "proc"
+        out_names: List[str] = None
     ) -> Optional[Dict]:
-        """SQL 프로시저 호출 (MySQL, PostgreSQL, Oracle)"""
+        """
+        SQL 프로시저 호출 (MySQL, PostgreSQL, Oracle)
+        IN 값만 보낸다. OUT 개수/타입, 함수/프로시저 구분은 서버가 시그니처 캐시로 채운다.
+        """
         url = f"{self.base_url}/db/proc/exec"
 
         payload = {
             "dbms": dbms,
             "name": proc_name,
-            "args": args,
-            "mode": mode
+            "args": args
         }
 
-        if out_count > 0:
-            payload["out_count"] = out_count
-
         if out_names:
             payload["out_names"] = out_names
 
-        # Oracle 전용: OUT 자리에 placeholder 추가
-        if dbms == "oracle" and out_count > 0:
-            # 프로시저별 OUT 타입 매핑
-            if proc_name == "sp_remittance_hold":
-                payload["out_types"] = ["NUMBER", "VARCHAR2"]  # txn_id, status
-            elif proc_name == "sp_remittance_release":
-                payload["out_types"] = ["VARCHAR2", "VARCHAR2"]  # status, result
-            elif proc_name == "sp_receive_prepare":
-                payload["out_types"] = ["NUMBER", "VARCHAR2"]  # txn_id, status
-            elif proc_name == "sp_confirm_debit_local":
-                payload["out_types"] = ["NUMBER", "VARCHAR2", "VARCHAR2"]  # txn_id, status, result
-            elif proc_name == "sp_confirm_credit_local":
-                payload["out_types"] = ["NUMBER", "VARCHAR2", "VARCHAR2"]  # txn_id, status, result
-            elif proc_name == "sp_transfer_confirm_internal":
-                payload["out_types"] = ["VARCHAR2", "VARCHAR2"]  # status, result
-            else:
-                # 기본값 (기존 로직)
-                payload["out_types"] = ["NUMBER", "VARCHAR2"] * (out_count // 2 + 1)
-
-            # OUT 자리에 None 추가 (Oracle adapter가 이 자리를 OUT 변수로 바인딩)
-            payload["args"] = args + [None] * out_count
-
         # 재시도 로직 (ConnectionError, ContentLengthError 대응)
         max_retries = 2
         for attempt in range(max_retries):
@@ -294,16 +286,20 @@ class APIClient:
         operation: str,
         payload: Dict
     ) -> Optional[Dict]:
-        """MongoDB 프로시저 호출"""
+        """MongoDB 프로시저 호출 (내구성 프로파일 전달 + 응답 시간 기록)"""
         url = f"{self.base_url}/mongo_proc/{operation}"
+        if self.config.mongo_durability:
+            payload = {**payload, "durability": self.config.mongo_durability}
 
         # 재시도 로직 (ConnectionError, ContentLengthError 대응)
         max_retries = 2
         for attempt in range(max_retries):
             try:
+                t0 = time.perf_counter()
                 async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                     result = await resp.json()
                     if resp.status >= 200 and resp.status < 300:
+                        stats.record_mongo_latency(operation, (time.perf_counter() - t0) * 1000)
                         return result.get("data")
                     else:
                         logger.error(f"API 에러 [mongo/{operation}]: {result}")
@@ -391,9 +387,7 @@ class TransactionProcessor:
                 dbms,
                 "sp_remittance_hold",
                 [src_account, dst_account, dst_bank, amount, idem_key, "1"],
-                out_count=2,
-                out_names=["txn_id", "status"],
-                mode="func" if dbms == "postgres" else "proc"
+                out_names=["txn_id", "status"]
             )
 
         if not result or result.get("status") != "1":
@@ -423,9 +417,7 @@ class TransactionProcessor:
                 dbms,
                 "sp_transfer_confirm_internal",
                 [idem_key],
-                out_count=2,
-                out_names=["status", "result"],
-                mode="func" if dbms == "postgres" else "proc"
+                out_names=["status", "result"]
             )
 
         if not result or result.get("status") != "2":
@@ -484,9 +476,7 @@ class TransactionProcessor:
                 src_dbms,
                 "sp_remittance_hold",
                 [src_account, dst_account, dst_bank, amount, idem_key_debit, "2"],
-                out_count=2,
-                out_names=["txn_id", "status"],
-                mode="func" if src_dbms == "postgres" else "proc"
+                out_names=["txn_id", "status"]
             )
 
         if not result or result.get("status") != "1":
@@ -519,9 +509,7 @@ class TransactionProcessor:
                 dst_dbms,
                 "sp_receive_prepare",
                 [src_account, dst_account, dst_bank, amount, idem_key_credit, "3"],
-                out_count=2,
-                out_names=["txn_id", "status"],
-                mode="func" if dst_dbms == "postgres" else "proc"
+                out_names=["txn_id", "status"]
             )
 
         if not result or result.get("status") != "1":
@@ -545,9 +533,7 @@ class TransactionProcessor:
                 src_dbms,
                 "sp_confirm_debit_local",
                 [idem_key_debit],
-                out_count=3,
-                out_names=["txn_id", "status", "result"],
-                mode="func" if src_dbms == "postgres" else "proc"
+                out_names=["txn_id", "status", "result"]
             )
 
         if not result or result.get("status") != "2":
@@ -571,9 +557,7 @@ class TransactionProcessor:
                 dst_dbms,
                 "sp_confirm_credit_local",
                 [idem_key_credit],
-                out_count=3,
-                out_names=["txn_id", "status", "result"],
-                mode="func" if dst_dbms == "postgres" else "proc"
+                out_names=["txn_id", "status", "result"]
             )
 
         if not result or result.get("status") != "2":
@@ -605,9 +589,7 @@ class TransactionProcessor:
                     dbms,
                     "sp_remittance_release",
                     [idempotency_key],
-                    out_count=2,
-                    out_names=["status", "result"],
-                    mode="func" if dbms == "postgres" else "proc"
+                    out_names=["status", "result"]
                 )
 
             if result and result.get("status") == "3":
@@ -665,7 +647,10 @@ class RDGRunner:
         logger.info(f"목표 RPS: {self.config.rps}")
         logger.info(f"활성 DBMS: {', '.join(self.config.active_dbms)}")
         logger.info(f"동시 처리 제한: {self.config.concurrent_limit}")
+        if "mongo" in self.config.active_dbms:
+            logger.info(f"Mongo 내구성: {self.config.mongo_durability or 'server-default'}")
         logger.info("=" * 60)
+        stats.mongo_durability = self.config.mongo_durability
 
         connector = aiohttp.TCPConnector(limit=self.config.concurrent_limit)
         async with aiohttp.ClientSession(connector=connector) as session:
@@ -0,0 +1,75 @@
+# scripts/bench_mongo_json.py
+"""
+Mongo 결과 직렬화 비교 (DB 없이): 원장 형태 문서 N개를 raw BSON batch로 만들어
+  legacy: decode_all → _to_jsonable_list(문서별 재귀 변환) → json.dumps(jsonify 설정)
+  fast  : decode_all → dumps_json(orjson, 없으면 표준 json C 인코더 + default)
+평균/최소 ms와 배수를 출력. 두 경로 출력을 디코딩한 값이 같은지도 확인한다
+(orjson은 비ASCII를 이스케이프하지 않으므로 바이트는 다를 수 있음).
+
+예) cd BE && python scripts/bench_mongo_json.py --docs 1000 --repeat 200
+"""
+import argparse
+import datetime as _dt
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bson import decode_all, encode                                   # noqa: E402
+from bson.decimal128 import Decimal128                                # noqa: E402
+from bson.objectid import ObjectId                                    # noqa: E402
+
+from db import mongo_adapter                                          # noqa: E402
+from db.mongo_adapter import _to_jsonable_list, dumps_json            # noqa: E402
+
+
+def _batch(n: int) -> bytes:
+    now = _dt.datetime(2025, 1, 1, 12, 0, 0, 123000)
+    return b"".join(encode({
+        "_id": ObjectId(),
+        "entry_id": str(i),
+        "txn_id": f"txn-{i // 2}",
+        "account_id": "100001",
+        "amount": Decimal128(f"{'-' if i % 2 else ''}{i}.2500"),
+        "created_at": now,
+    }) for i in range(n))
+
+
+def _legacy(batch: bytes) -> bytes:
+    return json.dumps(_to_jsonable_list(decode_all(batch)), sort_keys=True, separators=(",", ":")).encode()
+
+
+def _fast(batch: bytes) -> bytes:
+    return dumps_json(decode_all(batch))
+
+
+def _time(fn, batch: bytes, repeat: int):
+    fn(batch)
+    ts = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(batch)
+        ts.append((time.perf_counter() - t0) * 1000)
+    return sum(ts) / len(ts), min(ts)
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--docs", type=int, default=1000)
+    p.add_argument("--repeat", type=int, default=200)
+    args = p.parse_args()
+
+    batch = _batch(args.docs)
+    assert json.loads(_legacy(batch)) == json.loads(_fast(batch)), "output mismatch"
+    encoder = "orjson" if mongo_adapter.orjson is not None else "json"
+    legacy = _time(_legacy, batch, args.repeat)
+    fast = _time(_fast, batch, args.repeat)
+    print(f"docs={args.docs} repeat={args.repeat} encoder={encoder}")
+    print(f"  legacy  avg={legacy[0]:.3f}ms min={legacy[1]:.3f}ms")
+    print(f"  fast    avg={fast[0]:.3f}ms min={fast[1]:.3f}ms  x{legacy[0] / fast[0]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
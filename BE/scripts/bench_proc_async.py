@@ -0,0 +1,77 @@
+# scripts/bench_proc_async.py
+"""
+sync 앱(gunicorn, 기본 :5000) vs async 앱(async_app.py, 기본 :5001) 프로시저 호출 비교.
+DB 상태를 바꾸지 않도록 존재하지 않는 멱등키로 sp_remittance_release (HOLD_NOT_FOUND) 를 호출한다.
+
+예) python scripts/bench_proc_async.py --dbms mysql --requests 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import aiohttp
+
+
+def _payload(dbms: str):
+    key = f"bench-{uuid.uuid4().hex}"
+    if dbms == "mongo":
+        return "/mongo_proc/remittance/release", {"idempotency_key": key}
+    return "/db/proc/exec", {"dbms": dbms, "name": "sp_remittance_release", "args": [key]}
+
+
+async def _run(base_url: str, dbms: str, total: int, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+    lat, errors = [], 0
+
+    async def one(session):
+        nonlocal errors
+        path, body = _payload(dbms)
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                async with session.post(base_url + path, json=body) as resp:
+                    await resp.read()
+                    if resp.status >= 300:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+            lat.append((time.perf_counter() - t0) * 1000)
+
+    conn = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=conn, timeout=timeout) as session:
+        await one(session)          # 워밍업 (풀/시그니처 캐시)
+        lat.clear()
+        errors = 0
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(session) for _ in range(total)))
+        elapsed = time.perf_counter() - t0
+
+    lat.sort()
+    pct = lambda p: lat[min(len(lat) - 1, int(len(lat) * p))]
+    return {
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(pct(0.50), 1),
+        "p95_ms": round(pct(0.95), 1),
+        "p99_ms": round(pct(0.99), 1),
+        "errors": errors,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--dbms", default="mysql", choices=["mysql", "postgres", "oracle", "mongo"])
+    p.add_argument("--sync-url", default="http://localhost:5000")
+    p.add_argument("--async-url", default="http://localhost:5001")
+    p.add_argument("--requests", type=int, default=1000)
+    p.add_argument("--concurrency", type=int, default=100)
+    args = p.parse_args()
+
+    for label, url in (("sync", args.sync_url), ("async", args.async_url)):
+        res = asyncio.run(_run(url.rstrip("/"), args.dbms, args.requests, args.concurrency))
+        print(f"[{label:5}] {args.dbms} n={args.requests} c={args.concurrency} -> {res}")
+
+
+if __name__ == "__main__":
+    main()
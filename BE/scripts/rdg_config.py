@@ -76,6 +76,12 @@ MAX_AMOUNT = int(os.getenv("MAX_AMOUNT", 100_000))
 # API 요청으로 전달된 값이 있으면 그것을 사용, 없으면 기본값 사용
 ALLOW_SAME_DB = os.getenv("ALLOW_SAME_DB", "True").lower() in ("true", "1", "yes")
 
+# ==================== Mongo 설정 ====================
+# Mongo 쓰기 내구성 프로파일 (요청 body의 "durability"로 전달)
+# "bench": w=1 j=false / "safe": w=majority j=true / "bench,ledger=safe": 작업별 덮어쓰기
+# 비우면 서버 기본값(MONGO_DURABILITY)
+MONGO_DURABILITY = os.getenv("MONGO_DURABILITY") or None
+
 # ==================== 로그 설정 ====================
 # 로그 레벨
 # "DEBUG": 모든 상세 로그 출력
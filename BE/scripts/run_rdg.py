@@ -20,6 +20,7 @@ try:
         MIN_AMOUNT,
         MAX_AMOUNT,
         ALLOW_SAME_DB,
+        MONGO_DURABILITY,
         LOG_LEVEL,
         LOG_FILE,
         DURATION,
@@ -53,7 +54,8 @@ async def main():
         active_dbms=ACTIVE_DBMS,
         min_amount=MIN_AMOUNT,
         max_amount=MAX_AMOUNT,
-        allow_same_db=ALLOW_SAME_DB
+        allow_same_db=ALLOW_SAME_DB,
+        mongo_durability=MONGO_DURABILITY
     )
 
     # 설정 검증
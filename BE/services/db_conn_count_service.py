@@ -1,13 +1,11 @@
 # BE/services/db_conn_count_service.py
 from typing import Any, Dict, List
-from flask import current_app
+from db.router import get_adapter
 
 
 def get_mysql_session_count() -> Dict[str, Any]:
     try:
-        from db.mysql_adapter import MySQLAdapter
-        cfg = current_app.config["MYSQL"]
-        adapter = MySQLAdapter(cfg)
+        adapter = get_adapter("mysql")
 
         result = adapter.execute_query("SHOW STATUS LIKE 'Threads_connected'")
         sessions = int(result[0]["Value"]) if result else 0
@@ -19,9 +17,7 @@ def get_mysql_session_count() -> Dict[str, Any]:
 
 def get_postgres_session_count() -> Dict[str, Any]:
     try:
-        from db.postgres_adapter import PostgresAdapter
-        cfg = current_app.config["POSTGRES"]
-        adapter = PostgresAdapter(cfg)
+        adapter = get_adapter("postgres")
 
         result = adapter.execute_query("""
             SELECT count(*) as count
@@ -37,9 +33,7 @@ def get_postgres_session_count() -> Dict[str, Any]:
 
 def get_oracle_session_count() -> Dict[str, Any]:
     try:
-        from db.oracle_adapter import OracleAdapter
-        cfg = current_app.config["ORACLE"]
-        adapter = OracleAdapter(cfg)
+        adapter = get_adapter("oracle")
 
         # v$session 대신 현재 세션의 SID를 조회하는 방식으로 변경
         # 일반 사용자도 자신의 세션 정보는 조회 가능
@@ -62,11 +56,7 @@ def get_oracle_session_count() -> Dict[str, Any]:
 
 def get_mongo_session_count() -> Dict[str, Any]:
     try:
-        from db.mongo_adapter import MongoAdapter
-        adapter = MongoAdapter({
-            "uri": current_app.config["MONGO_URI"],
-            "db": current_app.config.get("MONGO_DB", "mdbs")
-        })
+        adapter = get_adapter("mongo")
 
         # serverStatus는 admin 권한 필요, 대신 currentOp 사용 (일반 사용자도 조회 가능)
         try:
@@ -0,0 +1,84 @@
+# services/fanout_service.py
+"""
+/db/file/fanout 본체: 같은 템플릿 id를 여러 DBMS에 동시에 실행.
+- RDB는 run_sql_file, mongo는 run_mongo_file (컬렉션은 id의 query.<collection>.* 에서)
+- DBMS별 timeout_ms: 응답 대기 상한이자 DB 쪽 쿼리 타임아웃 상한 (템플릿 값보다 작으면 이 값)
+- 시간 초과/실패한 DBMS는 결과에 오류로 담고 나머지는 그대로 반환 → 응답 시간 ≈ 가장 느린 DBMS
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from services.file_sql_service import collection_for, run_mongo_file, run_sql_file
+
+FANOUT_DBMS = ("mysql", "postgres", "oracle", "mongo")
+
+# 워커(프로세스)당 공용 풀. 시간 초과된 작업은 DB 쪽 타임아웃으로 끝날 때까지 스레드를 잡고 있으므로
+# 요청마다 만들지 않고 재사용 (with 블록으로 닫으면 느린 DBMS를 기다리게 됨)
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_PID: Optional[int] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool(max_workers: int) -> ThreadPoolExecutor:
+    global _POOL, _POOL_PID
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != os.getpid():
+            _POOL = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fanout")
+            _POOL_PID = os.getpid()
+        return _POOL
+
+
+def _timeouts(dbms_list: List[str], timeout_ms: Union[int, Dict[str, int], None], default: int) -> Dict[str, int]:
+    """timeout_ms: 숫자(전체 공통) 또는 {"oracle": 8000, ...} (없는 DBMS는 default)"""
+    if isinstance(timeout_ms, dict):
+        per = {k.lower(): v for k, v in timeout_ms.items()}
+        return {d: max(1, int(per.get(d, default))) for d in dbms_list}
+    return {d: max(1, int(timeout_ms or default)) for d in dbms_list}
+
+
+def _run_one(app, dbms: str, qid: str, params: Dict[str, Any], collection: Optional[str], timeout_ms: int):
+    with app.app_context():
+        t0 = time.perf_counter()
+        if dbms == "mongo":
+            data = run_mongo_file(collection or collection_for(qid), qid, params, timeout_ms=timeout_ms)
+        else:
+            data = run_sql_file(dbms, qid, params, timeout_ms=timeout_ms)
+        return data, round((time.perf_counter() - t0) * 1000, 2)
+
+
+def fanout_file(app, qid: str, dbms_list: List[str], params: Dict[str, Any],
+                timeout_ms: Union[int, Dict[str, int], None] = None, default_timeout_ms: int = 5000,
+                collection: Optional[str] = None) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    → ({dbms: {"ok": true, "data": [...], "elapsed_ms": n} | {"ok": false, "error": "...", "timeout": bool}},
+       실패한 DBMS 목록). 결과 dict는 dbms_list 순서
+    """
+    dbms_list = list(dict.fromkeys(d.lower() for d in dbms_list))
+    unknown = [d for d in dbms_list if d not in FANOUT_DBMS]
+    if unknown:
+        raise ValueError(f"unsupported dbms: {', '.join(unknown)} (use {', '.join(FANOUT_DBMS)})")
+    limits = _timeouts(dbms_list, timeout_ms, default_timeout_ms)
+
+    start = time.monotonic()
+    pool = _pool(app.config.get("FANOUT_MAX_WORKERS", 8))
+    futures: Dict[str, Future] = {d: pool.submit(_run_one, app, d, qid, params, collection, limits[d])
+                                  for d in dbms_list}
+    results: Dict[str, Dict[str, Any]] = {}
+    failed: List[str] = []
+    # 기한이 이른 DBMS부터 기다림 (모두 동시에 시작했으므로 각자 start + timeout까지)
+    for d in sorted(dbms_list, key=lambda x: limits[x]):
+        left = start + limits[d] / 1000 - time.monotonic()
+        try:
+            data, ms = futures[d].result(timeout=max(0.0, left))
+            results[d] = {"ok": True, "data": data, "elapsed_ms": ms}
+        except FutureTimeout:
+            futures[d].cancel()                # 아직 풀 대기열이면 실행 안 함
+            results[d] = {"ok": False, "error": f"timeout after {limits[d]} ms", "timeout": True}
+            failed.append(d)
+        except Exception as e:
+            results[d] = {"ok": False, "error": str(e), "timeout": False}
+            failed.append(d)
+    return {d: results[d] for d in dbms_list}, [d for d in dbms_list if d in failed]
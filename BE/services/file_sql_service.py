@@ -1,38 +1,32 @@
 # services/file_sql_service.py
-import re, json
+import re, json, csv, io, itertools, threading, time
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Iterator, Optional
+from flask import current_app, has_app_context
+from db.mongo_adapter import dumps_json
 from db.router import get_adapter
+from db.session import is_select, isolation_level
+from services.keyset import (check_mongo_meta, check_sql_meta, decode_cursor, encode_cursor, keyset_pipeline,
+                             keyset_sql, row_key)
+from services.result_cache import cache_key, result_cache
 
 # ───────────────────────── 공통 상수/정규식 ─────────────────────────
 _BASE = Path(__file__).resolve().parent.parent / "sql"
-_SELECT_RE = re.compile(r"^\s*select\b", re.I)
 _ID_RE = re.compile(r"^[a-z0-9_.]+$")  # 파일 ID 화이트리스트
 _FORBIDDEN_MONGO_OPS = {"$where", "$function"}
-
-# ───────────────────────── 경로 유틸 ─────────────────────────
-def _safe_path(dbms: str, qid: str, ext: str) -> Path:
-    """
-    파일 경로를 안전하게 생성(디렉터리 탈출 방지, 존재 확인).
-    BE/sql/{dbms}/{qid}.{ext}
-    """
-    if not _ID_RE.match(qid or ""):
-        raise ValueError("invalid id")
-    base = (_BASE / dbms.lower()).resolve()
-    p = (base / f"{qid}.{ext}").resolve()
-    if not str(p).startswith(str(base)):
-        raise ValueError("path traversal")
-    if not p.exists():
-        raise ValueError("file not found")
-    return p
+_PARAM_RE = re.compile(r"\{\{(\w+)\}\}|%\((\w+)\)s")  # Mongo 템플릿 치환 자리
+_DEFAULT_META = {"timeout_ms": 3000, "require_limit": False, "readonly": True}
 
 # ───────────────────────── SQL 프라그마 ─────────────────────────
 def _parse_pragma(first_line: str) -> Dict[str, Any]:
     """
     SQL 첫 줄이 '-- key=val key2=val2' 형태면 파싱.
-    예: -- timeout_ms=3000 require_limit=1 readonly=1
+    예: -- timeout_ms=3000 require_limit=1 readonly=1 isolation=read_committed
+        -- paginate=keyset key=entry_id   (services/keyset.py)
+        -- cache_ttl_sec=5                (services/result_cache.py, readonly 템플릿만)
     """
-    meta = {"timeout_ms": 3000, "require_limit": False, "readonly": True}
+    meta = dict(_DEFAULT_META)
     if not first_line.startswith("--"):
         return meta
     parts = first_line[2:].strip().split()
@@ -42,26 +36,23 @@ def _parse_pragma(first_line: str) -> Dict[str, Any]:
             k = k.strip(); v = v.strip()
             if k in ("require_limit", "readonly"):
                 meta[k] = v.lower() in ("1", "true", "y", "yes")
-            elif k == "timeout_ms":
+            elif k in ("timeout_ms", "cache_ttl_sec"):
                 try: meta[k] = int(v)
                 except: pass
+            elif k in ("isolation", "paginate"):
+                meta[k] = v.lower()
+            elif k == "key":
+                meta[k] = v
     return meta
 
-def _load_sql(dbms: str, query_id: str) -> Tuple[str, Dict[str, Any]]:
-    path = _safe_path(dbms, query_id, "sql")
-    txt = path.read_text(encoding="utf-8")
-    lines = txt.splitlines()
-    meta = _parse_pragma(lines[0].strip()) if lines else {"timeout_ms":3000,"require_limit":False,"readonly":True}
-    return txt, meta
-
-# ───────────────────────── SQL 실행 (RDB) ─────────────────────────
-def run_sql_file(dbms: str, query_id: str, params: Dict[str, Any]):
-    dbms = dbms.lower()
-    sql, meta = _load_sql(dbms, query_id)
-
-    # 보호장치: readonly면 SELECT만 허용
-    if meta.get("readonly", True) and not _SELECT_RE.match(sql):
+def _check_sql(dbms: str, sql: str, meta: Dict[str, Any]) -> None:
+    isolation_level(meta.get("isolation"), dbms)
+    check_sql_meta(meta)
+    # 보호장치: readonly면 SELECT만 허용 (맨 앞 프라그마 주석 줄은 건너뜀)
+    if meta.get("readonly", True) and not is_select(sql):
         raise ValueError("readonly 템플릿은 SELECT만 허용됩니다.")
+    if meta.get("cache_ttl_sec", 0) > 0 and not meta.get("readonly", True):
+        raise ValueError("cache_ttl_sec은 readonly 템플릿에만 쓸 수 있습니다.")
 
     # LIMIT 요구: DBMS별로 체크(Oracle은 rownum / fetch first 인정)
     if meta.get("require_limit", False):
@@ -74,20 +65,233 @@ def run_sql_file(dbms: str, query_id: str, params: Dict[str, Any]):
         if not has_limit:
             raise ValueError("LIMIT(또는 Oracle의 ROWNUM/FETCH FIRST) 절이 필요합니다.")
 
-    # 어댑터/타임아웃
+# ───────────────────────── 템플릿 레지스트리 ─────────────────────────
+class TemplateRegistry:
+    """
+    BE/sql/{dbms}/*.sql|json 메모리 캐시 (워커당 1개, 기동 시 전체 로드).
+    - SQL: 프라그마 파싱 + readonly/LIMIT 검증을 로드 시 1회
+    - Mongo: 치환 자리가 없는 템플릿은 JSON 파싱 + 파이프라인 검증까지 (반환 객체는 읽기 전용)
+    - reload_sec마다(요청 시점에) 파일 mtime을 점검해 바뀐/추가된/삭제된 파일만 반영. 0이면 점검 안 함
+    검증 실패한 템플릿도 목록에는 남기고, 사용할 때 그 오류를 ValueError로 낸다.
+    """
+
+    def __init__(self, base: Path = _BASE, reload_sec: float = 2.0):
+        self.base = base
+        self.reload_sec = reload_sec
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._checked: Optional[float] = None
+        self.reloads = 0
+
+    @staticmethod
+    def _compile(dbms: str, path: Path, mtime: int) -> Dict[str, Any]:
+        txt = path.read_text(encoding="utf-8")
+        entry: Dict[str, Any] = {"dbms": dbms, "id": path.stem, "mtime": mtime, "text": txt, "error": None}
+        try:
+            if dbms == "mongo":
+                entry["params"] = sorted({a or b for a, b in _PARAM_RE.findall(txt)})
+                if not entry["params"]:
+                    data = json.loads(txt)
+                    if mongo_find(data) is not None:
+                        _mongo_cache_ttl(data, [])
+                    elif not (isinstance(data, dict) and "operations" in data):
+                        for slots in (False, True):
+                            pipeline, meta = mongo_pipeline(data, slots)
+                            _validate_pipeline(pipeline)
+                            check_mongo_meta(meta, pipeline)
+                            _mongo_cache_ttl(meta, pipeline)
+                    entry["parsed"] = data
+            else:
+                lines = txt.splitlines()
+                entry["meta"] = _parse_pragma(lines[0].strip()) if lines else dict(_DEFAULT_META)
+                _check_sql(dbms, txt, entry["meta"])
+        except Exception as e:
+            entry["error"] = str(e)
+        return entry
+
+    def refresh(self, force: bool = False) -> int:
+        """디렉터리 스캔 → 다시 컴파일한 템플릿 수 (force=True면 전부)"""
+        with self._lock:
+            entries, compiled = {}, 0
+            for d in sorted(p for p in self.base.iterdir() if p.is_dir()):
+                dbms = d.name.lower()
+                for path in d.glob("*.json" if dbms == "mongo" else "*.sql"):
+                    if not _ID_RE.match(path.stem):
+                        continue
+                    key = (dbms, path.stem)
+                    mtime = path.stat().st_mtime_ns
+                    old = self._entries.get(key)
+                    if old is not None and old["mtime"] == mtime and not force:
+                        entries[key] = old
+                    else:
+                        entries[key] = self._compile(dbms, path, mtime)
+                        compiled += 1
+            changed = compiled or len(entries) != len(self._entries)
+            self._entries = entries
+            self._checked = time.monotonic()
+            if changed:
+                self.reloads += 1
+            return compiled
+
+    def _maybe_refresh(self) -> None:
+        if self._checked is None:
+            self.refresh()
+        elif self.reload_sec > 0 and time.monotonic() - self._checked >= self.reload_sec:
+            self.refresh()
+
+    def get(self, dbms: str, qid: str) -> Dict[str, Any]:
+        if not _ID_RE.match(qid or ""):
+            raise ValueError("invalid id")
+        self._maybe_refresh()
+        entry = self._entries.get((dbms.lower(), qid))
+        if entry is None:
+            raise ValueError("file not found")
+        if entry["error"]:
+            raise ValueError(entry["error"])
+        return entry
+
+    def list(self, dbms: Optional[str] = None) -> List[Dict[str, Any]]:
+        """목록 (본문 제외)"""
+        self._maybe_refresh()
+        out = []
+        for (d, qid), e in sorted(self._entries.items()):
+            if dbms and d != dbms.lower():
+                continue
+            item = {"dbms": d, "id": qid, "mtime": e["mtime"] / 1e9, "error": e["error"]}
+            if d == "mongo":
+                item["params"] = e.get("params", [])
+                item["kind"] = ("operations" if '"operations"' in e["text"]
+                                else "find" if '"find"' in e["text"] else "pipeline")
+                item["paginate"] = "keyset" if '"paginate"' in e["text"] else None
+            else:
+                item["meta"] = e.get("meta")
+                item["paginate"] = (e.get("meta") or {}).get("paginate")
+            out.append(item)
+        return out
+
+# 워커 단위 싱글톤 (app.py에서 TEMPLATE_RELOAD_SEC 적용 후 선로드)
+templates = TemplateRegistry()
+
+# ───────────────────────── SQL 실행 (RDB) ─────────────────────────
+def run_sql_file(dbms: str, query_id: str, params: Dict[str, Any], timeout_ms: Optional[int] = None):
+    """timeout_ms: 템플릿 timeout_ms보다 작으면 이 값으로 (fanout의 DBMS별 상한)"""
+    dbms = dbms.lower()
+    entry = templates.get(dbms, query_id)     # 검증은 로드 시 끝남
+    sql, meta = entry["text"], entry["meta"]
+    limit_ms = int(meta.get("timeout_ms", 3000))
+    if timeout_ms:
+        limit_ms = min(limit_ms, int(timeout_ms))
+
+    def load():
+        # 타임아웃/읽기 전용/격리 수준을 본문과 같은 커넥션에 적용 (DBMS별 방식은 어댑터 session())
+        with get_adapter(dbms).session(timeout_ms=limit_ms,
+                                       readonly=meta.get("readonly", True),
+                                       isolation=meta.get("isolation")) as s:
+            return s.execute_query(sql, params or {})
+
+    if not meta.get("readonly", True):
+        # 쓰기 템플릿(reset 등) 실행 후에는 그 DBMS 캐시를 비움
+        res = load()
+        result_cache.invalidate(dbms)
+        return res
+    # cache_ttl_sec 프라그마가 있는 readonly 템플릿만 결과 캐시 (템플릿이 바뀌면 mtime으로 키가 달라짐)
+    key = cache_key(dbms, query_id, params, entry["mtime"])
+    return result_cache.get_or_load(key, meta.get("cache_ttl_sec", 0), load)
+
+# ───────────────────────── keyset 페이지 ─────────────────────────
+def _page_size(params: Dict[str, Any]) -> int:
+    return _clamp_int((params or {}).get("limit", 100), 1, 1000)
+
+def page_sql_file(dbms: str, query_id: str, params: Dict[str, Any],
+                  cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    paginate=keyset 템플릿 1페이지 → (rows, next_cursor). cursor 없으면 첫 페이지.
+    params["limit"]: 페이지 크기 (1..1000, 기본 100). 마지막 페이지면 next_cursor=None
+    """
+    dbms = dbms.lower()
+    entry = templates.get(dbms, query_id)
+    meta = entry["meta"]
+    if meta.get("paginate") != "keyset":
+        raise ValueError(f"template does not support cursor paging: {query_id}")
+    key, limit = meta["key"], _page_size(params)
+    binds = {k: v for k, v in (params or {}).items() if k != "limit"}     # Oracle은 남는 바인드를 거부
+    binds["ks_limit"] = limit
+    if cursor:
+        binds["ks_after"] = decode_cursor(cursor)
+    sql = keyset_sql(dbms, entry["text"], key, after=bool(cursor))
+    with get_adapter(dbms).session(timeout_ms=int(meta.get("timeout_ms", 3000)), readonly=True,
+                                   isolation=meta.get("isolation")) as s:
+        rows = s.execute_query(sql, binds)
+    nxt = encode_cursor(row_key(rows[-1], key)) if len(rows) == limit else None
+    return rows, nxt
+
+# ───────────────────────── SQL 스트리밍 ─────────────────────────
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _cell(v: Any) -> Any:
+    """JSON/CSV 값: Decimal → 문자열(정밀도 유지), 날짜 → ISO"""
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    return str(v)
+
+def _encode_ndjson(rows: List[Dict[str, Any]], header: bool) -> Iterator[bytes]:
+    for r in rows:
+        yield json.dumps(r, default=_cell, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def _encode_csv(rows: List[Dict[str, Any]], header: bool) -> Iterator[bytes]:
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    if header and rows:
+        w.writerow(rows[0].keys())
+    for r in rows:
+        w.writerow("" if v is None else _cell(v) for v in r.values())
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+
+_ENCODERS = {"ndjson": _encode_ndjson, "csv": _encode_csv}
+
+def stream_sql_file(dbms: str, query_id: str, params: Dict[str, Any], fmt: str = "ndjson",
+                    chunk_rows: int = 500, max_rows: int = 100000, flush_bytes: int = 256 * 1024,
+                    timeout_ms: int = 60000) -> Iterator[bytes]:
+    """
+    SELECT 템플릿 결과를 서버 측 커서로 chunk_rows개씩 읽어 NDJSON/CSV bytes로 스트리밍.
+    워커 메모리 상한 ≈ chunk_rows행 + flush_bytes 버퍼 (결과 전체를 들고 있지 않음). max_rows에서 중단.
+    timeout_ms는 프라그마 값 대신 적용 (스트리밍은 전송 시간까지 포함되므로 별도 상한).
+    첫 chunk까지 여기서 읽으므로 연결/SQL 오류는 응답 시작 전에 예외로 난다.
+    """
+    dbms = dbms.lower()
+    if fmt not in _ENCODERS:
+        raise ValueError(f"unsupported format: {fmt} (use {', '.join(_ENCODERS)})")
+    entry = templates.get(dbms, query_id)
+    sql, meta = entry["text"], entry["meta"]
+    if not is_select(sql):
+        raise ValueError("stream은 SELECT 템플릿만 지원합니다.")
     adapter = get_adapter(dbms)
-    tms = int(meta.get("timeout_ms", 3000))
-    try:
-        if dbms == "postgres":
-            adapter.execute_query(f"SET LOCAL statement_timeout = {tms}")
-        elif dbms == "mysql":
-            adapter.execute_query(f"SET SESSION MAX_EXECUTION_TIME={tms}")
-        # oracle은 adapter에서 conn.callTimeout을 설정할 수 있음
-    except Exception:
-        # 일부 드라이버/권한에서 set 실패 가능 → 무시하고 본문 실행
-        pass
+    encode = _ENCODERS[fmt]
+    chunk_rows = _clamp_int(chunk_rows, 1, 10000)
 
-    return adapter.execute_query(sql, params or {})
+    def gen():
+        sent, buf, size = 0, [], 0
+        with adapter.session(timeout_ms=timeout_ms, readonly=True, isolation=meta.get("isolation")) as s:
+            for rows in s.stream(sql, params or {}, chunk_rows):
+                rows = rows[:max_rows - sent]
+                for b in encode(rows, header=sent == 0):
+                    buf.append(b)
+                    size += len(b)
+                    if size >= flush_bytes:
+                        yield b"".join(buf)
+                        buf, size = [], 0
+                sent += len(rows)
+                if buf:
+                    yield b"".join(buf)
+                    buf, size = [], 0
+                if sent >= max_rows:
+                    break
+
+    it = gen()
+    first = next(it, None)
+    return itertools.chain([first] if first is not None else [], it)
 
 # ───────────────────────── Mongo 유틸 ─────────────────────────
 def _validate_pipeline(pipeline: Any) -> None:
@@ -103,6 +307,17 @@ def _validate_pipeline(pipeline: Any) -> None:
         if op in _FORBIDDEN_MONGO_OPS:
             raise ValueError(f"forbidden operator: {op}")
 
+def _check_forbidden(x: Any) -> None:
+    """find 필터 안의 위험 연산자 (중첩 포함)"""
+    if isinstance(x, dict):
+        for k, v in x.items():
+            if k in _FORBIDDEN_MONGO_OPS:
+                raise ValueError(f"forbidden operator: {k}")
+            _check_forbidden(v)
+    elif isinstance(x, list):
+        for v in x:
+            _check_forbidden(v)
+
 def _clamp_int(v: Any, lo: int, hi: int) -> int:
     try:
         v = int(v)
@@ -125,44 +340,163 @@ def _force_limit(pipeline: List[dict], limit: int) -> List[dict]:
         out.append({"$limit": int(limit)})
     return out
 
-# ───────────────────────── Mongo 실행 ─────────────────────────
-def run_mongo_file(collection: str, qid: str, params: dict):
+# ───────────────────────── Mongo 템플릿 ─────────────────────────
+def load_mongo_template(qid: str, params: dict = None) -> Any:
     """
-    파일(JSON) 실행 – aggregate pipeline 또는 operations 배열 지원
-
-    Aggregate 예: { "collection":"accounts", "id":"query.accounts.list_all", "params":{"limit":100} }
-    Operations 예: { "collection":"", "id":"reset.data_and_sequences", "params":{} }
+    BE/sql/mongo/{qid}.json 을 읽어 파라미터 치환 후 파싱.
+    - {{param}}     : 문자열은 따옴표로 감싸고, 숫자는 그대로
+    - "%(param)s"   : 이미 따옴표 안 → 값만 치환 (query.accounts.* 형식)
     """
-    path = _safe_path("mongo", qid, "json")
-    txt = path.read_text(encoding="utf-8")
+    entry = templates.get("mongo", qid)
+    if "parsed" in entry:
+        return entry["parsed"]
+    txt = entry["text"]
 
-    # 파라미터 치환 ({{param_name}} 형식)
     if params:
         for key, value in params.items():
-            # 문자열 값은 따옴표로 감싸고, 숫자는 그대로
             if isinstance(value, str):
                 txt = txt.replace(f'"{{{{{key}}}}}"', f'"{value}"')
                 txt = txt.replace(f'{{{{{key}}}}}', f'"{value}"')
             else:
                 txt = txt.replace(f'"{{{{{key}}}}}"', str(value))
                 txt = txt.replace(f'{{{{{key}}}}}', str(value))
+            txt = txt.replace(f'%({key})s', str(value))
+
+    return json.loads(txt)
+
+def collection_for(qid: str) -> str:
+    """query.<collection>.<name> → <collection> (컬렉션이 id에 없으면 ValueError)"""
+    parts = (qid or "").split(".")
+    if len(parts) < 3 or parts[0] != "query":
+        raise ValueError(f"cannot infer collection from id: {qid}")
+    return parts[1]
+
+def mongo_pipeline(data: Any, slots: bool = False) -> Tuple[List[dict], Dict[str, Any]]:
+    """
+    aggregate 템플릿 → (pipeline, meta).
+    배열 그대로 또는 {"paginate": "keyset", "key": "_id", "cache_ttl_sec": 5, "pipeline": [...]} (그 외는 ValueError)
+    slots=True이고 "slots_pipeline"이 있으면 그쪽 (잔액 버킷 합산 변형, query.accounts.*)
+    """
+    if isinstance(data, list):
+        return data, {}
+    if isinstance(data, dict) and isinstance(data.get("pipeline"), list):
+        meta = {k: v for k, v in data.items() if k not in ("pipeline", "slots_pipeline")}
+        if slots and isinstance(data.get("slots_pipeline"), list):
+            return data["slots_pipeline"], meta
+        return data["pipeline"], meta
+    raise ValueError("Invalid MongoDB file format")
+
+def _balance_slots_on() -> bool:
+    """MONGO_BALANCE_SLOTS > 1일 때만 slots_pipeline ($lookup account_slots) 사용. 기본은 accounts 문서만 읽음"""
+    return has_app_context() and int(current_app.config.get("MONGO_BALANCE_SLOTS", 0) or 0) > 1
+
+def mongo_find(data: Any) -> Optional[Tuple[dict, Optional[dict], Optional[List[Tuple[str, int]]]]]:
+    """
+    find 템플릿 {"find": {필터}, "projection": {...}, "sort": {"_id": 1}, "cache_ttl_sec": 5}
+    → (filter, projection, sort 목록). find 템플릿이 아니면 None
+    """
+    if not (isinstance(data, dict) and "find" in data):
+        return None
+    flt, proj, sort = data["find"], data.get("projection"), data.get("sort")
+    if not isinstance(flt, dict) or not isinstance(proj, (dict, type(None))) or not isinstance(sort, (dict, type(None))):
+        raise ValueError("find template: find/projection/sort must be objects")
+    _check_forbidden(flt)
+    return flt, proj, list(sort.items()) if sort else None
+
+def _mongo_cache_ttl(meta: Dict[str, Any], pipeline: List[dict]) -> int:
+    """meta의 cache_ttl_sec (없으면 0). 쓰기 단계($out/$merge)가 있는 파이프라인이면 ValueError"""
+    try:
+        ttl = int(meta.get("cache_ttl_sec") or 0)
+    except (TypeError, ValueError):
+        raise ValueError("cache_ttl_sec must be an integer")
+    if ttl > 0 and any(op in st for st in pipeline for op in ("$out", "$merge")):
+        raise ValueError("cache_ttl_sec은 $out/$merge 없는 파이프라인에만 쓸 수 있습니다.")
+    return ttl
 
-    data = json.loads(txt)
+# ───────────────────────── Mongo 실행 ─────────────────────────
+def run_mongo_file(collection: str, qid: str, params: dict, as_json: bool = False,
+                   timeout_ms: Optional[int] = None):
+    """
+    파일(JSON) 실행 – aggregate pipeline, find 템플릿 또는 operations 배열 지원
+    as_json=True면 결과를 JSON bytes로 반환 (aggregate는 MongoAdapter.aggregate_json 고속 경로)
+    timeout_ms: maxTimeMS 상한 (기본 3000보다 작을 때만 적용)
+
+    Aggregate 예: { "collection":"accounts", "id":"query.accounts.list_all", "params":{"limit":100} }
+    Operations 예: { "collection":"", "id":"reset.data_and_sequences", "params":{} }
+    """
+    data = load_mongo_template(qid, params)
 
     mongo = get_adapter("mongo")
 
     # operations 형식: {"operations": [...]}
     if isinstance(data, dict) and "operations" in data:
-        return _run_mongo_operations(mongo, data["operations"], params)
+        res = _run_mongo_operations(mongo, data["operations"], params)
+        result_cache.invalidate("mongo")
+        if any(op.get("type") == "drop_collection" for op in data["operations"]):
+            # drop으로 사라진 멱등키/분개 Unique 인덱스 재생성 (서비스는 워커 기동 시 1회만 만든다)
+            from services.mongo_tx_service import get_mongo_tx_service
+            get_mongo_tx_service().ensure_indexes(force=True)
+        return res
 
-    # aggregate pipeline: [{"$match": {}}, ...]
-    elif isinstance(data, list):
-        _validate_pipeline(data)
-        lim = _clamp_int((params or {}).get("limit", 100), 1, 1000)
-        pipeline = _force_limit(data, lim)
-        return mongo.aggregate(collection, pipeline, maxTimeMS=3000)
+    lim = _clamp_int((params or {}).get("limit", 100), 1, 1000)
+    max_ms = min(3000, int(timeout_ms)) if timeout_ms else 3000
+    key = cache_key("mongo", qid, params, collection, as_json, templates.get("mongo", qid)["mtime"])
 
-    raise ValueError("Invalid MongoDB file format")
+    # find 템플릿: {"find": {...}, "projection": {...}, "sort": {...}}
+    find = mongo_find(data)
+    if find is not None:
+        flt, proj, sort = find
+        def load_find():
+            docs = mongo.find(collection, flt, proj, limit=lim, sort=sort, max_time_ms=max_ms)
+            return dumps_json(docs) if as_json else docs
+        return result_cache.get_or_load(key, _mongo_cache_ttl(data, []), load_find)
+
+    # aggregate pipeline: [{"$match": {}}, ...] 또는 {"paginate": ..., "pipeline": [...]}
+    data, meta = mongo_pipeline(data, _balance_slots_on())
+    _validate_pipeline(data)
+    pipeline = _force_limit(data, lim)
+
+    def load():
+        if as_json:
+            return mongo.aggregate_json(collection, pipeline, maxTimeMS=max_ms)
+        return mongo.aggregate(collection, pipeline, maxTimeMS=max_ms)
+
+    # aggregate는 읽기 전용 → 템플릿 meta의 cache_ttl_sec만 보고 캐시 (키: 컬렉션/반환 형식 포함)
+    return result_cache.get_or_load(key, _mongo_cache_ttl(meta, data), load)
+
+def page_mongo_file(collection: str, qid: str, params: dict,
+                    cursor: Optional[str] = None) -> Tuple[bytes, Optional[str]]:
+    """keyset 템플릿 1페이지 → (JSON 배열 bytes, next_cursor). page_sql_file과 같은 규칙"""
+    pipeline, meta = mongo_pipeline(load_mongo_template(qid, params), _balance_slots_on())
+    _validate_pipeline(pipeline)
+    if meta.get("paginate") != "keyset":
+        raise ValueError(f"template does not support cursor paging: {qid}")
+    check_mongo_meta(meta, pipeline)
+    key, limit = meta["key"], _page_size(params)
+    after = decode_cursor(cursor, mongo=True) if cursor else None
+    pipeline = _force_limit(keyset_pipeline(pipeline, key, after), limit)
+    docs = get_adapter("mongo").aggregate_docs(collection, pipeline, maxTimeMS=3000)
+    nxt = encode_cursor(row_key(docs[-1], key)) if len(docs) == limit else None
+    return dumps_json(docs), nxt
+
+def stream_mongo_file(collection: str, qid: str, params: dict, batch_size: int = 500,
+                      max_rows: int = 100000) -> Iterator[bytes]:
+    """
+    aggregate/find 템플릿 결과를 NDJSON 청크로 스트리밍 (/db/file/mongo "stream": true).
+    limit은 1..max_rows로 보정. 템플릿 검증/어댑터 조회는 호출 시점에 끝나므로 오류는 응답 전에 난다.
+    """
+    data = load_mongo_template(qid, params)
+    if isinstance(data, dict) and "operations" in data:
+        raise ValueError("stream은 aggregate pipeline / find 템플릿만 지원합니다.")
+    lim = _clamp_int((params or {}).get("limit", max_rows), 1, max_rows)
+    batch_size = _clamp_int(batch_size, 1, 10000)
+    find = mongo_find(data)
+    if find is not None:
+        flt, proj, sort = find
+        return get_adapter("mongo").find_ndjson(collection, flt, proj, limit=lim, batch_size=batch_size, sort=sort)
+    data, _ = mongo_pipeline(data, _balance_slots_on())
+    _validate_pipeline(data)
+    return get_adapter("mongo").aggregate_ndjson(collection, _force_limit(data, lim), batch_size=batch_size)
 
 def _convert_to_decimal128(obj: Any) -> Any:
     """
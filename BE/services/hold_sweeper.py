@@ -0,0 +1,190 @@
+# services/hold_sweeper.py
+"""
+오래된 OPEN(status=1) hold 정리.
+RDG 클라이언트가 hold 후 타임아웃되고 release까지 실패하면 hold가 열린 채 남아 hold_amount가 쌓인다.
+TTL보다 오래된 hold를 (status, created_at) 인덱스 범위 스캔으로 batch 단위 조회하고
+DBMS별 기존 해제 경로(sp_remittance_release / MongoTxService.remittance_release)로 해제한다.
+- batch 크기, batch 수, batch 사이 대기로 부하 상한 (라이브 워크로드와 경합 최소화)
+- 해제는 멱등 (프로시저가 hold 행을 잠그고 상태 확인) → 워커 여러 개가 동시에 돌아도 중복 해제 없음
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from db.router import get_adapter
+from services.proc_service import exec_proc
+
+SWEEP_DBMS = ("mysql", "postgres", "oracle", "mongo")
+
+# ORDER BY created_at + status 동등 조건 → (status, created_at) 인덱스 범위 스캔
+STALE_SQL = {
+    "mysql": (
+        "SELECT idempotency_key FROM holds "
+        "WHERE status = '1' AND created_at < NOW() - INTERVAL %(ttl)s SECOND "
+        "ORDER BY created_at LIMIT %(lim)s"
+    ),
+    "postgres": (
+        "SELECT idempotency_key FROM holds "
+        "WHERE status = '1' AND created_at < now() - make_interval(secs => %(ttl)s) "
+        "ORDER BY created_at LIMIT %(lim)s"
+    ),
+    "oracle": (
+        "SELECT idempotency_key FROM holds "
+        "WHERE status = '1' AND created_at < SYSTIMESTAMP - NUMTODSINTERVAL(:ttl, 'SECOND') "
+        "ORDER BY created_at FETCH FIRST :lim ROWS ONLY"
+    ),
+}
+
+_MAX_ERRORS = 5
+_MAX_BATCH = 1000
+
+
+def _stale_keys(dbms: str, ttl_sec: int, limit: int) -> List[str]:
+    """TTL 지난 OPEN hold의 멱등키 (오래된 순, 최대 limit개)"""
+    if dbms == "mongo":
+        from services.mongo_tx_service import get_mongo_tx_service
+        cutoff = datetime.utcnow() - timedelta(seconds=ttl_sec)   # created_at은 utcnow 기준
+        cur = (get_mongo_tx_service().HOLD
+               .find({"status": "1", "created_at": {"$lt": cutoff}}, {"_id": 0, "idempotency_key": 1})
+               .sort("created_at", 1).limit(limit))
+        return [d["idempotency_key"] for d in cur]
+    rows = get_adapter(dbms).execute_query(STALE_SQL[dbms], {"ttl": int(ttl_sec), "lim": int(limit)})
+    return [r["idempotency_key"] for r in rows]
+
+
+def _release(dbms: str, key: str) -> Dict[str, Any]:
+    """기존 해제 경로 호출 → {"status", "result"}"""
+    if dbms == "mongo":
+        from services.mongo_tx_service import get_mongo_tx_service
+        return get_mongo_tx_service().remittance_release({"idempotency_key": key})
+    return exec_proc({"dbms": dbms, "name": "sp_remittance_release", "args": [key]})
+
+
+def sweep(dbms: str, ttl_sec: int = 300, batch_size: int = 100, max_batches: int = 10,
+          pause_ms: int = 50) -> Dict[str, Any]:
+    """
+    DBMS 1개 정리 (앱 컨텍스트 안에서 호출).
+    반환: scanned / released / skipped(이미 확정·해제) / failed 건수와 조회·해제 지연
+    """
+    dbms = dbms.lower()
+    if dbms not in SWEEP_DBMS:
+        raise ValueError(f"Unsupported DBMS: {dbms}")
+    batch_size = max(1, min(int(batch_size), _MAX_BATCH))
+    rep: Dict[str, Any] = {"dbms": dbms, "scanned": 0, "released": 0, "skipped": 0, "failed": 0,
+                           "batches": 0, "scan_ms": 0.0, "release_ms": 0.0, "errors": []}
+    t0 = time.perf_counter()
+    for i in range(max_batches):
+        ts = time.perf_counter()
+        keys = _stale_keys(dbms, ttl_sec, batch_size)
+        rep["scan_ms"] += (time.perf_counter() - ts) * 1000
+        if not keys:
+            break
+        rep["batches"] += 1
+        rep["scanned"] += len(keys)
+        progressed = 0
+        for key in keys:
+            tr = time.perf_counter()
+            try:
+                res = _release(dbms, key)
+            except Exception as e:
+                rep["failed"] += 1
+                if len(rep["errors"]) < _MAX_ERRORS:
+                    rep["errors"].append(f"{key}: {e}")
+            else:
+                rep["released" if (res or {}).get("result") == "OK" else "skipped"] += 1
+                progressed += 1
+            rep["release_ms"] += (time.perf_counter() - tr) * 1000
+        # 마지막 batch이거나 전부 실패(같은 키가 다시 조회됨)면 중단
+        if len(keys) < batch_size or not progressed:
+            break
+        if i + 1 < max_batches and pause_ms > 0:
+            time.sleep(pause_ms / 1000)
+
+    handled = rep["released"] + rep["skipped"] + rep["failed"]
+    rep["avg_release_ms"] = round(rep["release_ms"] / handled, 2) if handled else 0.0
+    rep["scan_ms"] = round(rep["scan_ms"], 2)
+    rep["release_ms"] = round(rep["release_ms"], 2)
+    rep["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return rep
+
+
+def _sweep_in_app(app, dbms: str, **kw) -> Dict[str, Any]:
+    with app.app_context():
+        try:
+            return sweep(dbms, **kw)
+        except Exception as e:
+            return {"dbms": dbms, "error": str(e)}
+
+
+def sweep_all(app, dbms_list=SWEEP_DBMS, **kw) -> Dict[str, Dict[str, Any]]:
+    """DBMS별 정리를 병렬로 (DBMS끼리는 독립). kw: sweep()의 ttl_sec/batch_size/max_batches/pause_ms"""
+    dbms_list = [d.lower() for d in dbms_list]
+    with ThreadPoolExecutor(max_workers=len(dbms_list) or 1, thread_name_prefix="hold-sweep") as ex:
+        reports = list(ex.map(lambda d: _sweep_in_app(app, d, **kw), dbms_list))
+    return dict(zip(dbms_list, reports))
+
+
+class HoldSweeper:
+    """HOLD_SWEEP_INTERVAL_SEC 주기로 sweep_all (워커당 데몬 스레드 1개)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.interval_sec = 0
+        self.opts: Dict[str, Any] = {}
+        self.dbms: List[str] = []
+        self.runs = 0
+        self.last_run: Optional[float] = None
+        self.last: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def options(cfg) -> Dict[str, Any]:
+        return {
+            "ttl_sec": cfg.get("HOLD_SWEEP_TTL_SEC", 300),
+            "batch_size": cfg.get("HOLD_SWEEP_BATCH", 100),
+            "max_batches": cfg.get("HOLD_SWEEP_MAX_BATCHES", 10),
+            "pause_ms": cfg.get("HOLD_SWEEP_PAUSE_MS", 50),
+        }
+
+    def start(self, app):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            cfg = app.config
+            self.interval_sec = cfg.get("HOLD_SWEEP_INTERVAL_SEC", 0)
+            self.opts = self.options(cfg)
+            self.dbms = list(cfg.get("HOLD_SWEEP_DBMS", SWEEP_DBMS))
+            self._stop.clear()
+            self._thread = threading.Thread(target=partial(self._loop, app), name="hold-sweeper", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, app):
+        while not self._stop.wait(self.interval_sec):
+            reports = sweep_all(app, self.dbms, **self.opts)
+            with self._lock:
+                self.last = reports
+                self.last_run = time.time()
+                self.runs += 1
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive() and not self._stop.is_set(),
+                "interval_sec": self.interval_sec,
+                "dbms": self.dbms,
+                **self.opts,
+                "runs": self.runs,
+                "last_run": self.last_run,
+                "last": self.last,
+            }
+
+
+# 워커 단위 싱글톤
+sweeper = HoldSweeper()
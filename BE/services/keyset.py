@@ -0,0 +1,113 @@
+# services/keyset.py
+"""
+템플릿 keyset 페이지네이션 (OFFSET 없이 "key > 마지막 값" + 정렬 + LIMIT).
+- SQL  : 첫 줄 프라그마 `-- paginate=keyset key=entry_id`
+- Mongo: {"paginate": "keyset", "key": "_id", "pipeline": [...]} (key로 $sort하는 단계 필요)
+cursor는 마지막 행의 key 값을 담은 불투명 토큰 (base64url JSON, 타입 태그로 ObjectId/Decimal/날짜 유지).
+"""
+import base64
+import datetime as _dt
+import json
+import re
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from bson.decimal128 import Decimal128
+from bson.objectid import ObjectId
+
+_KEY_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_MONGO_KEY_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+
+
+# ---------- cursor ----------
+def _tag(v: Any) -> Any:
+    if isinstance(v, ObjectId):
+        return {"$oid": str(v)}
+    if isinstance(v, Decimal128):
+        return {"$dec": str(v.to_decimal())}
+    if isinstance(v, Decimal):
+        return {"$dec": str(v)}
+    if isinstance(v, _dt.datetime):
+        return {"$date": v.isoformat()}
+    return v
+
+def encode_cursor(value: Any) -> str:
+    raw = json.dumps({"k": _tag(value)}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str, mongo: bool = False) -> Any:
+    """토큰 → key 값 (mongo=True면 Decimal 대신 Decimal128). 잘못된 토큰은 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        v = json.loads(raw)["k"]
+    except Exception:
+        raise ValueError("invalid cursor")
+    if isinstance(v, dict):
+        if "$oid" in v:
+            return ObjectId(v["$oid"])
+        if "$dec" in v:
+            return Decimal128(v["$dec"]) if mongo else Decimal(v["$dec"])
+        if "$date" in v:
+            return _dt.datetime.fromisoformat(v["$date"])
+        raise ValueError("invalid cursor")
+    return v
+
+def row_key(row: Dict[str, Any], key: str) -> Any:
+    """행에서 key 값 (SQL 드라이버별 컬럼 대소문자 차이 무시)"""
+    if key in row:
+        return row[key]
+    lk = key.lower()
+    for k, v in row.items():
+        if k.lower() == lk:
+            return v
+    raise ValueError(f"keyset key not in result: {key}")
+
+
+# ---------- SQL ----------
+def check_sql_meta(meta: Dict[str, Any]) -> None:
+    if meta.get("paginate") is None:
+        return
+    if meta["paginate"] != "keyset":
+        raise ValueError(f"unsupported paginate: {meta['paginate']} (use keyset)")
+    if not _KEY_RE.match(meta.get("key") or ""):
+        raise ValueError("paginate=keyset needs key=<column>")
+
+def keyset_sql(dbms: str, sql: str, key: str, after: bool) -> str:
+    """
+    템플릿을 인라인 뷰로 감싸 key > :ks_after / ORDER BY key / LIMIT :ks_limit.
+    세 DBMS 모두 조건을 뷰 안으로 밀어 넣으므로 (key 포함 인덱스가 있으면) 페이지 위치와 무관하게 같은 비용
+    """
+    body = sql.rstrip().rstrip(";")
+    if dbms == "oracle":
+        ph_after, tail = ":ks_after", " FETCH FIRST :ks_limit ROWS ONLY"
+    else:
+        ph_after, tail = "%(ks_after)s", " LIMIT %(ks_limit)s"
+    where = f" WHERE ks.{key} > {ph_after}" if after else ""
+    return f"SELECT * FROM (\n{body}\n) ks{where} ORDER BY ks.{key}{tail}"
+
+
+# ---------- Mongo ----------
+def check_mongo_meta(meta: Dict[str, Any], pipeline: List[dict]) -> None:
+    if meta.get("paginate") is None:
+        return
+    if meta["paginate"] != "keyset":
+        raise ValueError(f"unsupported paginate: {meta['paginate']} (use keyset)")
+    key = meta.get("key") or ""
+    if not _MONGO_KEY_RE.match(key):
+        raise ValueError('paginate=keyset needs "key"')
+    if _sort_index(pipeline, key) is None:
+        raise ValueError(f"keyset pipeline needs a $sort on {key} (ascending)")
+
+def _sort_index(pipeline: List[dict], key: str) -> Optional[int]:
+    for i, st in enumerate(pipeline):
+        if "$sort" in st:
+            first = next(iter(st["$sort"].items()), None)
+            return i if first is not None and first[0] == key and first[1] == 1 else None
+    return None
+
+def keyset_pipeline(pipeline: List[dict], key: str, after: Any) -> List[dict]:
+    """key로 정렬하는 $sort 바로 앞에 {key: {$gt: after}} 삽입 (앞의 $match와 합쳐져 인덱스 범위 스캔)"""
+    if after is None:
+        return list(pipeline)
+    i = _sort_index(pipeline, key)
+    return pipeline[:i] + [{"$match": {key: {"$gt": after}}}] + pipeline[i:]
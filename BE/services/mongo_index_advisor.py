@@ -0,0 +1,182 @@
+# services/mongo_index_advisor.py
+"""
+Mongo 인덱스 점검 (BE/sql/mongo 쿼리 템플릿 + MongoTxService 조회 패턴).
+- 템플릿을 샘플 파라미터로 렌더링 → explain(executionStats)
+- COLLSCAN 단계, 조회 문서 수(docs examined) vs 반환 문서 수 리포트
+- 걸린 쿼리는 첫 $match(동등 → $sort → 범위, ESR) / $lookup foreignField 로 인덱스 제안
+- create=True면 기존 인덱스로 커버되지 않는 제안만 생성
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.file_sql_service import (_BASE, _balance_slots_on, _force_limit, _validate_pipeline, collection_for,
+                                       load_mongo_template, mongo_find, mongo_pipeline)
+
+SAMPLE_PARAMS: Dict[str, Any] = {"account_id": "100001", "name": "a"}
+
+# 템플릿 밖에서 도는 단건 조회 (confirm/hold 경로)
+SERVICE_QUERIES: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("svc.holds.by_idem_status", "holds", {"idempotency_key": "advisor-sample", "status": "1"}),
+    ("svc.holds.stale", "holds", {"status": "1", "created_at": {"$lt": datetime(2000, 1, 1)}}),
+    ("svc.transactions.by_idem", "transactions", {"idempotency_key": "advisor-sample"}),
+    ("svc.ledger_entries.by_txn", "ledger_entries", {"txn_id": "advisor-sample", "account_id": "100001"}),
+    ("svc.account_slots.by_account", "account_slots", {"account_id": "100001"}),
+]
+
+_RANGE_OPS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$regex", "$exists"}
+_EXPLAIN_LIMIT = 100
+_MAX_TIME_MS = 5000
+
+
+# ---------- 인덱스 제안 ----------
+def suggest_indexes(pipeline: List[dict]) -> List[Dict[str, Any]]:
+    """
+    파이프라인에서 인덱스 후보 추출.
+    - 맨 앞 $match: 동등 필드 → (바로 뒤 $sort) → 범위 필드 순 (ESR). _id로 시작하면 기본 인덱스로 충분
+    - $lookup localField/foreignField: from 컬렉션의 foreignField
+    반환: [{"collection": None(=대상 컬렉션) | str, "keys": [(field, dir), ...]}]
+    """
+    out: List[Dict[str, Any]] = []
+    if pipeline and "$match" in pipeline[0]:
+        eq, rng = [], []
+        for k, v in pipeline[0]["$match"].items():
+            if k.startswith("$"):
+                continue
+            (rng if isinstance(v, dict) and _RANGE_OPS & set(v) else eq).append(k)
+        sort = list(pipeline[1]["$sort"].items()) if len(pipeline) > 1 and "$sort" in pipeline[1] else []
+        keys = [(k, 1) for k in eq]
+        keys += [(k, int(d)) for k, d in sort if k not in eq]
+        keys += [(k, 1) for k in rng if k not in dict(keys)]
+        if keys and keys[0][0] != "_id":
+            out.append({"collection": None, "keys": keys})
+    for st in pipeline:
+        lk = st.get("$lookup")
+        if isinstance(lk, dict) and lk.get("foreignField") not in (None, "_id"):
+            out.append({"collection": lk["from"], "keys": [(lk["foreignField"], 1)]})
+    return out
+
+def _covered(col, keys: List[Tuple[str, int]]) -> Optional[str]:
+    """keys로 시작하는 인덱스가 이미 있으면 그 이름"""
+    for name, info in col.index_information().items():
+        if [(k, int(d)) for k, d in info["key"]][:len(keys)] == keys:
+            return name
+    return None
+
+
+# ---------- explain 파싱 ----------
+def _walk(node: Any, acc: Dict[str, Any]) -> None:
+    """winningPlan/실행 통계를 재귀 탐색 (rejectedPlans 제외)"""
+    if isinstance(node, list):
+        for v in node:
+            _walk(v, acc)
+        return
+    if not isinstance(node, dict):
+        return
+    stage = node.get("stage")
+    if isinstance(stage, str):
+        acc["stages"].add(stage)
+        if node.get("indexName"):
+            acc["indexes"].add(node["indexName"])
+    # $lookup 단계 통계 (5.0+): collectionScans / indexesUsed
+    if node.get("collectionScans"):
+        acc["stages"].add("COLLSCAN")
+    acc["indexes"].update(node.get("indexesUsed") or [])
+    acc["docs_examined"] += int(node.get("totalDocsExamined") or 0)
+    acc["keys_examined"] += int(node.get("totalKeysExamined") or 0)
+    for k, v in node.items():
+        if k != "rejectedPlans":
+            _walk(v, acc)
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    acc = {"stages": set(), "indexes": set(), "docs_examined": 0, "keys_examined": 0}
+    _walk(explain, acc)
+    return {
+        "collscan": "COLLSCAN" in acc["stages"],
+        "stages": sorted(acc["stages"]),
+        "indexes_used": sorted(acc["indexes"]),
+        "docs_examined": acc["docs_examined"],
+        "keys_examined": acc["keys_examined"],
+    }
+
+
+# ---------- 실행 ----------
+def _check(db, qid: str, coll: str, pipeline: List[dict], find_filter: Optional[dict], max_ratio: float):
+    if find_filter is not None:
+        explain = db.command("explain", {"find": coll, "filter": find_filter, "limit": _EXPLAIN_LIMIT},
+                             verbosity="executionStats")
+        returned = int(explain.get("executionStats", {}).get("nReturned", 0))
+    else:
+        explain = db.command("explain", {"aggregate": coll, "pipeline": pipeline, "cursor": {}},
+                             verbosity="executionStats")
+        returned = sum(1 for _ in db[coll].aggregate(pipeline, maxTimeMS=_MAX_TIME_MS))
+    entry = {"id": qid, "collection": coll, **summarize_explain(explain), "returned": returned}
+    entry["ratio"] = round(entry["docs_examined"] / max(returned, 1), 1)
+    entry["flagged"] = entry["collscan"] or entry["docs_examined"] > max(returned, 1) * max_ratio
+    return entry
+
+def _targets(params: Dict[str, Any]):
+    """(qid, collection, pipeline, find_filter) — 템플릿 전부 + 서비스 조회"""
+    for path in sorted((_BASE / "mongo").glob("query.*.json")):
+        qid = path.stem
+        data = load_mongo_template(qid, params)
+        find = mongo_find(data)
+        if find is not None:
+            yield qid, collection_for(qid), [{"$match": find[0]}], find[0]
+            continue
+        pipeline, _ = mongo_pipeline(data, _balance_slots_on())     # 실제로 실행될 변형
+        _validate_pipeline(pipeline)
+        yield qid, collection_for(qid), _force_limit(pipeline, _EXPLAIN_LIMIT), None
+    for qid, coll, f in SERVICE_QUERIES:
+        yield qid, coll, [{"$match": f}], f
+
+def advise(db, params: Optional[Dict[str, Any]] = None, create: bool = False,
+           max_ratio: float = 10) -> Dict[str, Any]:
+    """
+    db: pymongo Database. params: 템플릿 샘플 파라미터 (SAMPLE_PARAMS 덮어쓰기)
+    반환: {"queries": [...], "created": [...]}
+    """
+    params = {**SAMPLE_PARAMS, **(params or {})}
+    queries, created = [], []
+    for qid, coll, pipeline, find_filter in _targets(params):
+        try:
+            entry = _check(db, qid, coll, pipeline, find_filter, max_ratio)
+        except Exception as e:
+            queries.append({"id": qid, "collection": coll, "error": str(e)})
+            continue
+        entry["suggested"] = []
+        if entry["flagged"]:
+            for sug in suggest_indexes(pipeline):
+                target = sug["collection"] or coll
+                col = db[target]
+                covered = _covered(col, sug["keys"])
+                item = {"collection": target, "keys": sug["keys"], "existing": covered}
+                if create and not covered:
+                    item["created"] = col.create_index(sug["keys"])
+                    created.append({"collection": target, "index": item["created"]})
+                entry["suggested"].append(item)
+        queries.append(entry)
+    return {"queries": queries, "created": created}
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """콘솔 출력용 한 줄 요약"""
+    lines = []
+    for q in report["queries"]:
+        if "error" in q:
+            lines.append(f"  ERR   {q['id']:40} {q['error']}")
+            continue
+        mark = "FLAG" if q["flagged"] else "ok"
+        plan = "COLLSCAN" if q["collscan"] else (",".join(q["indexes_used"]) or "-")
+        lines.append(
+            f"  {mark:5} {q['id']:40} {plan:24} "
+            f"examined={q['docs_examined']} returned={q['returned']} ratio={q['ratio']}"
+        )
+        for s in q["suggested"]:
+            keys = ", ".join(f"{k}:{d}" for k, d in s["keys"])
+            if s.get("created"):
+                state = f"created {s['created']}"
+            elif s["existing"]:
+                state = f"covered by {s['existing']}"
+            else:
+                state = "missing"
+            lines.append(f"        -> {s['collection']} {{{keys}}} {state}")
+    return lines
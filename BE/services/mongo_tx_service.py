@@ -1,8 +1,17 @@
 # services/mongo_tx_service.py
-from typing import Any, Dict, Tuple
+import copy
+import os
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
 from bson.decimal128 import Decimal128
-from pymongo.errors import DuplicateKeyError
+from bson.int64 import Int64
+from flask import current_app
+from pymongo import ReadPreference, ReturnDocument, UpdateOne
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from datetime import datetime
 from db.router import get_adapter
 
@@ -19,275 +28,586 @@ def _neg_d128(v) -> Decimal128:
     d = v.to_decimal() if isinstance(v, Decimal128) else _dec(v)
     return Decimal128(-d)
 
-def _idem_insert(col, doc: dict, unique_filter: Dict[str, Any]) -> Tuple[bool, str]:
+_LEDGER_KEY = ("txn_id", "account_id", "amount")
+
+def _idem_insert(col, doc: dict, unique_filter: Dict[str, Any], session=None) -> Tuple[bool, str]:
     """
-    멱등 insert.
-    - unique_filter에 해당 문서가 이미 있으면 'ALREADY'
-    - 없으면 insert 시도, Unique 충돌은 'ALREADY'로 간주
+    멱등 insert (왕복 1회).
+    - unique_filter로 upsert, 나머지 필드는 $setOnInsert → 이미 있으면 아무것도 바꾸지 않고 'ALREADY'
+    - 동시 upsert가 Unique에 걸리면 'ALREADY'로 간주
     """
-    old = col.find_one(unique_filter, {"_id": 1})
-    if old:
-        return False, "ALREADY"
+    rest = {k: v for k, v in doc.items() if k not in unique_filter}
     try:
-        col.insert_one(doc)
-        return True, "CREATED"
+        res = col.update_one(unique_filter, {"$setOnInsert": rest}, upsert=True, session=session)
     except DuplicateKeyError:
         return False, "ALREADY"
+    return (True, "CREATED") if res.upserted_id is not None else (False, "ALREADY")
+
+def _ledger_pair(col, entries, session=None) -> None:
+    """
+    분개 여러 건 멱등 insert (왕복 1회).
+    Unique 키로 upsert + $setOnInsert → 이미 있는 분개는 그대로 (트랜잭션 안에서도 에러 없음).
+    동시 upsert 경합(11000)만 있으면 무시.
+    """
+    ops = [
+        UpdateOne({k: e[k] for k in _LEDGER_KEY},
+                  {"$setOnInsert": {k: v for k, v in e.items() if k not in _LEDGER_KEY}}, upsert=True)
+        for e in entries
+    ]
+    try:
+        col.bulk_write(ops, ordered=False, session=session)
+    except BulkWriteError as e:
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+            raise
+
+def _ledger_unpair(col, entries, session=None) -> None:
+    """_ledger_pair 되돌리기 (같은 Unique 키 삭제, 없으면 그대로)"""
+    for e in entries:
+        col.delete_one({k: e[k] for k in _LEDGER_KEY}, session=session)
+
+def _undo_on_error(s, step: Callable[[], Any], undo: Callable[[], Any]):
+    """
+    선점(hold 상태 / 분개 marker) 뒤 단계 실행. 예외(네트워크, 타임아웃, write concern 실패 등)면
+    선점을 되돌리고 예외를 다시 낸다 → 재시도가 ALREADY_* 로 끝나지 않고 처음부터 다시 처리.
+    트랜잭션 엔진(s 있음)은 전체가 롤백되므로 되돌리지 않는다. 되돌리기 실패는 원래 예외를 가리지 않게 무시.
+    """
+    try:
+        return step()
+    except Exception:
+        if s is None:
+            try:
+                undo()
+            except Exception:
+                pass
+        raise
+
+# ---------- 금액 저장 표현 ----------
+AMOUNT_SCALE = 4                    # 소수 4자리 = SQL DBMS의 DECIMAL(19,4)
+_MINOR = 10 ** AMOUNT_SCALE
+
+class AmountCodec:
+    """
+    Mongo 금액 저장 표현 (MONGO_AMOUNT_MODE).
+    - decimal128 (기본): Decimal128
+    - int64: 최소 단위(1/10^4) 정수 → 비교/$inc/$subtract가 정수 연산, 클라이언트 Decimal 변환 없음
+    모드를 바꾸면 scripts/migrate_mongo_amounts.py로 기존 문서를 변환해야 한다 (또는 reset_data).
+    """
+    MODES = ("decimal128", "int64")
+
+    def __init__(self, mode: str = "decimal128"):
+        mode = (mode or "decimal128").lower()
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown MONGO_AMOUNT_MODE: {mode} (use {', '.join(self.MODES)})")
+        self.mode = mode
+        self.is_int = mode == "int64"
+
+    @staticmethod
+    def to_minor(v: Any) -> int:
+        d = v.to_decimal() if isinstance(v, Decimal128) else _dec(v)
+        q = d * _MINOR
+        if q != q.to_integral_value():
+            raise ValueError(f"amount has more than {AMOUNT_SCALE} decimal places: {d}")
+        return int(q)
+
+    def encode(self, v: Any):
+        """요청 금액(단위: str/int/Decimal) → 저장 표현"""
+        return Int64(self.to_minor(v)) if self.is_int else _d128(v)
+
+    def coerce(self, stored: Any):
+        """저장된 금액(어느 표현이든) → 현재 모드 표현 (마이그레이션 전 문서 호환)"""
+        if self.is_int:
+            if isinstance(stored, Int64):
+                return stored
+            return Int64(stored) if isinstance(stored, int) else self.encode(stored)
+        if isinstance(stored, Decimal128):
+            return stored
+        return Decimal128(Decimal(int(stored)) / _MINOR) if isinstance(stored, int) else _d128(stored)
+
+    def neg(self, v: Any):
+        return Int64(-int(v)) if self.is_int else _neg_d128(v)
+
+    def zero(self):
+        return Int64(0) if self.is_int else _d128(0)
+
+    def to_decimal(self, stored: Any) -> Decimal:
+        """저장 표현 → 단위 금액 Decimal"""
+        if isinstance(stored, Decimal128):
+            return stored.to_decimal()
+        return Decimal(int(stored)) / _MINOR if isinstance(stored, int) else _dec(stored)
+
+def _slot_id(acct: str, i: int) -> str:
+    return f"{acct}:{i}"
+
+def _split_evenly(total: int, n: int) -> List[int]:
+    """정수 금액을 n개로 나눔 (나머지는 0번 슬롯)"""
+    base = total // n
+    return [total - base * (n - 1)] + [base] * (n - 1)
+
+# ---------- 내구성 프로파일 (작업 종류별 write concern) ----------
+DURABILITY_OPS = ("txn", "hold", "ledger", "balance")
+DURABILITY_PROFILES: Dict[str, Dict[str, WriteConcern]] = {
+    "default": {},                                                        # 클라이언트 기본값
+    "bench":   dict.fromkeys(DURABILITY_OPS, WriteConcern(w=1, j=False)),
+    "safe":    dict.fromkeys(DURABILITY_OPS, WriteConcern(w="majority", j=True)),
+}
+
+def parse_durability(spec: Optional[str]) -> Dict[str, WriteConcern]:
+    """
+    "bench" | "safe" | "default" 또는 "bench,ledger=safe" (기본 프로파일 + 작업별 덮어쓰기)
+    반환: {op: WriteConcern} — 없는 op는 클라이언트 기본값
+    """
+    tokens = [t.strip() for t in str(spec or "default").lower().split(",") if t.strip()]
+    if tokens and "=" not in tokens[0]:
+        base, overrides = tokens[0], tokens[1:]
+    else:
+        base, overrides = "default", tokens
+    if base not in DURABILITY_PROFILES:
+        raise ValueError(f"Unknown durability profile: {base} (use {', '.join(DURABILITY_PROFILES)})")
+    concerns = dict(DURABILITY_PROFILES[base])
+    for tok in overrides:
+        op, _, prof = tok.partition("=")
+        if op not in DURABILITY_OPS or prof not in DURABILITY_PROFILES:
+            raise ValueError(f"Invalid durability override: {tok} (<{'|'.join(DURABILITY_OPS)}>=<profile>)")
+        if op in DURABILITY_PROFILES[prof]:
+            concerns[op] = DURABILITY_PROFILES[prof][op]
+        else:
+            concerns.pop(op, None)
+    return concerns
+
+def _durability_key(spec: Optional[str]) -> str:
+    return ",".join(t.strip() for t in str(spec or "default").lower().split(",") if t.strip()) or "default"
 
 class MongoTxService:
     """
     싱글 노드 Mongo에서도 동작하는 '프로시저성' 서비스.
     - 세션/트랜잭션 미사용
     - 문서 단위 원자 연산 + 멱등키(Unique)로 정합성 확보
+    - 상태 전이는 조건부 find_one_and_update로 '선점'한 뒤 잔액을 움직인다 (조회 후 갱신 왕복 제거).
+      잔액 단계가 실패하거나 예외면 선점을 되돌린다 → 재시도는 처음부터 다시 처리
     collections:
-      accounts(_id, balance:Decimal128, hold_amount:Decimal128)
+      accounts(_id, balance, hold_amount)    ← 금액은 AmountCodec 표현 (Decimal128 | Int64 최소 단위)
       transactions(idempotency_key:Unique, status, type, ...)
       holds(idempotency_key:Unique, status, account_id, amount)
       ledger_entries(Unique(txn_id, account_id, amount))
+      account_slots(_id="<account_id>:<n>", account_id, slot, balance, hold_amount)  ← hot 계좌 버킷
+
+    잔액 버킷(balance_slots > 1): hot_accounts의 잔액/hold_amount를 슬롯 문서 N개에 나눠 담아
+    같은 문서에 $inc가 몰리는 쓰기 경합을 분산한다.
+    - 출금/보류는 임의 슬롯 → 실패 시 잔액이 되는 아무 슬롯 → 그래도 없으면 accounts 문서
+      1건이 슬롯 1개(또는 accounts 문서) 안에서 처리돼야 하므로, reset_data 직후 1건 상한 ≈ 잔액/N
+      (N개 슬롯에 나눠 담은 잔액을 합쳐 쓰지 않음). 더 큰 출금/보류는 잔액 부족(5)
+    - 보류한 슬롯은 holds.slot에 기록 → 확정/해제는 같은 슬롯에서
+    - 입금은 임의 슬롯, 조회는 accounts.balance + 슬롯 합 (query.accounts.* 의 slots_pipeline, 버킷을 켰을 때만)
+    - 켜거나 끈 뒤에는 reset_data()로 잔액을 다시 배치
+
+    내구성 프로파일(durability): txn / hold / ledger / balance 작업별 write concern.
+    서비스 기본값 + 요청 body의 "durability"로 덮어쓰기 (프로파일별 서비스 사본을 캐시)
+
+    확정 단계는 잔액 → 분개(bulk_write 1회) → txn 상태 순서. 중간 단계가 예외면 앞 단계를 되돌리고
+    txn 상태는 쓰지 않는다 → 잔액/분개가 빠진 txn은 확정으로 보이지 않고 재시도가 처음부터 처리.
     """
 
-    def __init__(self):
-        mongo = get_adapter("mongo")
+    def __init__(self, mongo=None, balance_slots: int = 0, hot_accounts=(), durability: str = "default",
+                 amount_mode: str = "decimal128"):
+        """mongo: MongoAdapter (생략 시 워커 공유 어댑터)"""
+        mongo = mongo or get_adapter("mongo")
+        self.amt = AmountCodec(amount_mode)
         self.client = mongo.client
         self.db = mongo.db
-        self.ACC    = self.db.accounts
-        self.TXN    = self.db.transactions
-        self.HOLD   = self.db.holds
-        self.LEDGER = self.db.ledger_entries
-
-    # 최초 1회만 호출하면 좋은 인덱스 (있으면 OK)
-    def ensure_indexes(self):
+        self.durability = _durability_key(durability)
+        self._apply_durability(parse_durability(self.durability))
+        self.balance_slots = max(int(balance_slots or 0), 0)
+        self.hot_accounts = frozenset(str(a) for a in (hot_accounts or ()))
+        self._indexes_ready = False
+        self._variants: Dict[str, "MongoTxService"] = {}
+        self._variants_lock = threading.Lock()
+
+    def _apply_durability(self, concerns: Dict[str, WriteConcern]):
+        """작업 종류별 write concern으로 컬렉션 바인딩 (없으면 클라이언트 기본값)"""
+        def bind(name: str, op: str):
+            col = getattr(self.db, name)
+            return col.with_options(write_concern=concerns[op]) if op in concerns else col
+        self.ACC    = bind("accounts", "balance")
+        self.SLOTS  = bind("account_slots", "balance")
+        self.TXN    = bind("transactions", "txn")
+        self.HOLD   = bind("holds", "hold")
+        self.LEDGER = bind("ledger_entries", "ledger")
+
+    def with_durability(self, spec: Optional[str]) -> "MongoTxService":
+        """프로파일이 다른 서비스 사본 (컬렉션 바인딩만 다름, 클라이언트/캐시 공유)"""
+        key = _durability_key(spec)
+        if key == self.durability:
+            return self
+        with self._variants_lock:
+            svc = self._variants.get(key)
+            if svc is None:
+                svc = copy.copy(self)
+                svc.durability = key
+                svc._apply_durability(parse_durability(key))
+                self._variants[key] = svc
+            return svc
+
+    # 워커 기동 시 1회 (있으면 OK). drop 이후 등 재생성이 필요하면 force=True
+    def ensure_indexes(self, force: bool = False):
+        if self._indexes_ready and not force:
+            return
         self.TXN.create_index("idempotency_key", unique=True)
         self.HOLD.create_index("idempotency_key", unique=True)
+        self.HOLD.create_index([("status", 1), ("created_at", 1)])      # 오래된 hold 정리 (hold_sweeper)
         self.LEDGER.create_index([("txn_id", 1), ("account_id", 1), ("amount", 1)], unique=True)
+        self.LEDGER.create_index([("account_id", 1), ("_id", 1)])        # 계좌별 원장 keyset 페이지
+        self.SLOTS.create_index("account_id")
+        self._indexes_ready = True
+
+    # ---------- 엔진 경계 ----------
+    def _run(self, fn, body: Dict[str, Any]):
+        """기본 엔진: 세션 없이 실행 (MongoTxTransactionalService가 트랜잭션으로 재정의)"""
+        return fn(body, None)
+
+    def _call(self, method: str, body: Dict[str, Any]):
+        """body.durability가 있으면 해당 프로파일 사본에서 실행"""
+        svc = self.with_durability(body["durability"]) if body.get("durability") else self
+        return svc._run(getattr(svc, method), body)
 
-    # 1) 송금 보류(sp_remittance_hold 대체)
     def remittance_hold(self, body: Dict[str, Any]):
+        return self._call("_remittance_hold", body)
+
+    def receive_prepare(self, body: Dict[str, Any]):
+        return self._call("_receive_prepare", body)
+
+    def confirm_debit_local(self, body: Dict[str, Any]):
+        return self._call("_confirm_debit_local", body)
+
+    def confirm_credit_local(self, body: Dict[str, Any]):
+        return self._call("_confirm_credit_local", body)
+
+    def transfer_confirm_internal(self, body: Dict[str, Any]):
+        return self._call("_transfer_confirm_internal", body)
+
+    def remittance_release(self, body: Dict[str, Any]):
+        return self._call("_remittance_release", body)
+
+    # ---------- 공통 ----------
+    def _upsert_txn(self, idem: str, doc: Dict[str, Any], set_fields: Optional[Dict[str, Any]] = None, s=None):
+        """
+        txn 멱등 생성 + _id/status 반환 (왕복 1회, find_one + insert + find_one 대체).
+        set_fields는 기존 문서에도 적용, doc의 나머지는 새로 만들 때만.
+        """
+        set_fields = set_fields or {}
+        update: Dict[str, Any] = {"$setOnInsert": {k: v for k, v in doc.items() if k not in set_fields}}
+        if set_fields:
+            update["$set"] = set_fields
+        for attempt in (0, 1):
+            try:
+                return self.TXN.find_one_and_update(
+                    {"idempotency_key": idem}, update,
+                    projection={"_id": 1, "status": 1}, upsert=True, return_document=ReturnDocument.AFTER, session=s
+                )
+            except DuplicateKeyError:
+                # 같은 키로 동시에 upsert → 진 쪽은 재시도하면 기존 문서에 매칭된다
+                if attempt:
+                    raise
+
+    def _claim_hold(self, idem: str, from_status, to_status: str, s=None):
+        """hold 상태 전이 선점: 조건이 맞으면 바꾸고 이전 문서, 아니면 None"""
+        return self.HOLD.find_one_and_update(
+            {"idempotency_key": idem, "status": from_status},
+            {"$set": {"status": to_status}},
+            projection={"status": 1, "account_id": 1, "amount": 1, "slot": 1}, session=s
+        )
+
+    # ---------- 잔액 (일반 계좌: accounts 문서 / hot 계좌: account_slots 슬롯) ----------
+    def _slotted(self, acct: str) -> bool:
+        return self.balance_slots > 1 and acct in self.hot_accounts
+
+    def _balance_doc(self, acct: str, slot: Optional[int]):
+        """(컬렉션, _id): slot이 None이면 accounts 문서"""
+        return (self.ACC, acct) if slot is None else (self.SLOTS, _slot_id(acct, slot))
+
+    def _pick_slot(self, acct: str, cond: Dict[str, Any], inc: Dict[str, Any], s=None) -> Optional[int]:
+        """조건부 $inc를 임의 슬롯에 시도 → 실패 시 조건 맞는 아무 슬롯 (왕복 최대 2). 반환: 슬롯 번호 / None"""
+        i = random.randrange(self.balance_slots)
+        if self.SLOTS.update_one({"_id": _slot_id(acct, i), **cond}, {"$inc": inc}, session=s).modified_count == 1:
+            return i
+        doc = self.SLOTS.find_one_and_update({"account_id": acct, **cond}, {"$inc": inc},
+                                             projection={"slot": 1}, session=s)
+        return doc["slot"] if doc else None
+
+    def _hold_funds(self, acct: str, amt, s=None) -> Tuple[bool, Optional[int]]:
+        """(balance - hold_amount) >= amt 조건부로 hold_amount↑. 반환 (성공, 슬롯 | None=accounts 문서)"""
+        cond = {"$expr": {"$gte": [{"$subtract": ["$balance", "$hold_amount"]}, amt]}}
+        inc = {"hold_amount": amt}
+        if self._slotted(acct):
+            slot = self._pick_slot(acct, cond, inc, s)
+            if slot is not None:
+                return True, slot
+        # 버킷 계좌도 슬롯이 안 되면 accounts 문서 (슬롯 없이 리셋된 데이터 / 버킷 켜기 전 잔액)
+        return self.ACC.update_one({"_id": acct, **cond}, {"$inc": inc}, session=s).modified_count == 1, None
+
+    def _capture_hold(self, acct: str, amt, slot: Optional[int], s=None) -> bool:
+        """hold_amount >= amt 조건부로 hold↓, balance↓ (보류한 슬롯에서)"""
+        col, _id = self._balance_doc(acct, slot)
+        neg = self.amt.neg(amt)
+        res = col.update_one({"_id": _id, "hold_amount": {"$gte": amt}},
+                             {"$inc": {"hold_amount": neg, "balance": neg}}, session=s)
+        return res.modified_count == 1
+
+    def _release_funds(self, acct: str, amt, slot: Optional[int], s=None):
+        col, _id = self._balance_doc(acct, slot)
+        col.update_one({"_id": _id}, {"$inc": {"hold_amount": self.amt.neg(self.amt.coerce(amt))}}, session=s)
+
+    def _debit(self, acct: str, amt, s=None) -> Tuple[bool, Optional[int]]:
+        """보류 없는 출금: balance >= amt 조건부로 balance↓. 반환 (성공, 슬롯 | None=accounts 문서)"""
+        cond = {"balance": {"$gte": amt}}
+        inc = {"balance": self.amt.neg(amt)}
+        if self._slotted(acct):
+            slot = self._pick_slot(acct, cond, inc, s)
+            if slot is not None:
+                return True, slot
+        return self.ACC.update_one({"_id": acct, **cond}, {"$inc": inc}, session=s).modified_count == 1, None
+
+    def _credit(self, acct: str, amt, s=None) -> Optional[int]:
+        """입금: 버킷 계좌는 임의 슬롯 (없으면 생성). 반환: 슬롯 | None=accounts 문서"""
+        if not self._slotted(acct):
+            self.ACC.update_one({"_id": acct}, {"$inc": {"balance": amt}}, session=s)
+            return None
+        i = random.randrange(self.balance_slots)
+        self.SLOTS.update_one(
+            {"_id": _slot_id(acct, i)},
+            {"$inc": {"balance": amt},
+             "$setOnInsert": {"account_id": acct, "slot": i, "hold_amount": self.amt.zero()}},
+            upsert=True, session=s
+        )
+        return i
+
+    def _refund(self, acct: str, amt, slot: Optional[int], held: bool, s=None):
+        """출금 되돌리기 (같은 슬롯/문서에 balance↑, 보류 확정이었으면 hold_amount↑도)"""
+        col, _id = self._balance_doc(acct, slot)
+        inc = {"balance": amt, "hold_amount": amt} if held else {"balance": amt}
+        col.update_one({"_id": _id}, {"$inc": inc}, session=s)
+
+    def _uncredit(self, acct: str, amt, slot: Optional[int], s=None):
+        """입금 되돌리기 (입금한 슬롯/문서에서 balance↓)"""
+        col, _id = self._balance_doc(acct, slot)
+        col.update_one({"_id": _id}, {"$inc": {"balance": self.amt.neg(amt)}}, session=s)
+
+    # 1) 송금 보류(sp_remittance_hold 대체)
+    #    왕복: 성공 3 (txn upsert, 조건부 $inc, hold upsert) / 실패 4 (+ 계좌 확인, txn 상태)
+    def _remittance_hold(self, body: Dict[str, Any], s=None):
         src       = str(body["src_account_id"])
         dst       = str(body["dst_account_id"])
         dst_bank  = body.get("dst_bank", "")
-        amount128 = _d128(body["amount"])
-        amount    = _dec(body["amount"])
+        amount = self.amt.encode(body["amount"])
         idem      = body["idempotency_key"]
         typ       = body.get("type", "1")  # 1: 내부, 2: 외부송금, 3: 외부수취
         c_at = datetime.utcnow()
 
-        # txn 멱등 생성
-        _idem_insert(self.TXN, {
+        # txn 멱등 생성 (+ _id/status)
+        tx = self._upsert_txn(idem, {
             "type": typ,
             "status": "1",
             "src_account_id": src,
             "dst_account_id": dst,
             "dst_bank": dst_bank,
-            "amount": amount128,
-            "idempotency_key": idem,
+            "amount": amount,
             "created_at": c_at
-        }, {"idempotency_key": idem})
-
-        tx = self.TXN.find_one({"idempotency_key": idem}, {"_id": 1})
+        }, s=s)
         txn_id = tx["_id"]
 
-        # 송금 계좌 존재 확인
-        if self.ACC.count_documents({"_id": src}) == 0:
-            self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "6"}})  # 계좌 없음
-            return {"txn_id": str(txn_id), "status": "6"}
-
-        # (balance - hold_amount) >= amount 조건부로 hold_amount 증가
-        res = self.ACC.update_one(
-            {"_id": src, "$expr": {"$gte": [{"$subtract": ["$balance", "$hold_amount"]}, amount128]}},
-            {"$inc": {"hold_amount": amount128}}
-        )
-        if res.modified_count != 1:
-            self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "5"}})  # 잔액부족
-            return {"txn_id": str(txn_id), "status": "5"}
+        # (balance - hold_amount) >= amount 조건부로 hold_amount 증가 (버킷 계좌는 슬롯 선택)
+        held, slot = self._hold_funds(src, amount, s)
+        if not held:
+            # 실패 시에만 계좌 존재 확인 (6: 계좌 없음, 5: 잔액부족)
+            status = "5" if self.ACC.find_one({"_id": src}, {"_id": 1}, session=s) else "6"
+            self.TXN.update_one({"_id": txn_id}, {"$set": {"status": status}}, session=s)
+            return {"txn_id": str(txn_id), "status": status}
 
         # holds 멱등 생성(이미 있으면 OK)
-        _idem_insert(self.HOLD, {
-            "account_id": src, "amount": amount128, "status": "1",
+        hold_doc = {
+            "account_id": src, "amount": amount, "status": "1",
             "idempotency_key": idem,
             "created_at": c_at
-        }, {"idempotency_key": idem})
+        }
+        if slot is not None:
+            hold_doc["slot"] = slot
+        _idem_insert(self.HOLD, hold_doc, {"idempotency_key": idem}, session=s)
 
-        self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "1"}})
+        if tx.get("status") != "1":   # 이전 시도에서 5/6으로 끝난 txn 재시도
+            self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "1"}}, session=s)
         return {"txn_id": str(txn_id), "status": "1"}
 
     # 2) 수금 준비(sp_receive_prepare 대체)
-    def receive_prepare(self, body: Dict[str, Any]):
+    #    왕복: 2 (계좌 확인, txn upsert — 계좌 없음이면 같은 upsert에서 status=6)
+    def _receive_prepare(self, body: Dict[str, Any], s=None):
         src       = str(body["src_account_id"])
         dst       = str(body["dst_account_id"])
         dst_bank  = body.get("dst_bank", "")
-        amount128 = _d128(body["amount"])
+        amount = self.amt.encode(body["amount"])
         idem      = body["idempotency_key"]
         typ       = body.get("type", "3")
         c_at = datetime.utcnow()
 
-        _idem_insert(self.TXN, {
+        exists = self.ACC.find_one({"_id": dst}, {"_id": 1}, session=s) is not None
+        doc = {
             "type": typ, "status": "1",
             "src_account_id": src, "dst_account_id": dst, "dst_bank": dst_bank,
-            "amount": amount128, "idempotency_key": idem,
+            "amount": amount,
             "created_at": c_at
-        }, {"idempotency_key": idem})
-
-        tx = self.TXN.find_one({"idempotency_key": idem}, {"_id": 1})
-        txn_id = tx["_id"]
+        }
+        tx = self._upsert_txn(idem, doc, None if exists else {"status": "6"}, s)
+        return {"txn_id": str(tx["_id"]), "status": "1" if exists else "6"}
 
-        if self.ACC.count_documents({"_id": dst}) == 0:
-            self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "6"}})
-            return {"txn_id": str(txn_id), "status": "6"}
+    def _unclaim_hold(self, idem: str, claimed: str, back_to: str, s=None):
+        """선점 후 다음 단계가 실패하면 hold 상태 원복"""
+        self.HOLD.update_one({"idempotency_key": idem, "status": claimed}, {"$set": {"status": back_to}}, session=s)
 
-        return {"txn_id": str(txn_id), "status": "1"}
+    def _hold_result(self, idem: str, txn_id, s=None):
+        """hold 선점 실패 시 사유 (confirm_debit_local 결과 형식)"""
+        hold = self.HOLD.find_one({"idempotency_key": idem}, {"status": 1}, session=s)
+        if not hold:
+            return {"txn_id": str(txn_id), "status": "1", "result": "HOLD_NOT_FOUND"}
+        if hold.get("status") == "3":
+            return {"txn_id": str(txn_id), "status": "1", "result": "HOLD_RELEASED"}
+        return {"txn_id": str(txn_id), "status": "2", "result": "ALREADY_CONFIRMED"}
 
     # 3) 출금 확정(동일 은행) — hold↓ + balance↓ + 분개(-)
-    def confirm_debit_local(self, body: Dict[str, Any]):
+    #    순차 왕복 5: txn 조회 → hold 선점 → 조건부 $inc → 분개 upsert → txn 상태
+    def _confirm_debit_local(self, body: Dict[str, Any], s=None):
         idem = body["idempotency_key"]
 
-        tx = self.TXN.find_one({"idempotency_key": idem})
+        tx = self.TXN.find_one({"idempotency_key": idem}, {"_id": 1, "src_account_id": 1, "amount": 1}, session=s)
         if not tx:
             return {"status": "1", "result": "TX_NOT_FOUND"}
 
         txn_id = tx["_id"]
         src    = str(tx["src_account_id"])
-        amt128 = tx["amount"] if isinstance(tx["amount"], Decimal128) else _d128(tx["amount"])
-        amt    = amt128.to_decimal()
+        amt = self.amt.coerce(tx["amount"])
         c_at = datetime.utcnow()
 
-        hold = self.HOLD.find_one({"idempotency_key": idem})
+        # hold 1 → 2 선점 (동시 확정 요청은 하나만 통과)
+        hold = self._claim_hold(idem, "1", "2", s)
         if not hold:
-            return {"txn_id": str(txn_id), "status": "1", "result": "HOLD_NOT_FOUND"}
-        if hold.get("status") == "3":
-            return {"txn_id": str(txn_id), "status": "1", "result": "HOLD_RELEASED"}
-        if hold.get("status") == "2":
-            return {"txn_id": str(txn_id), "status": "2", "result": "ALREADY_CONFIRMED"}
+            return self._hold_result(idem, txn_id, s)
 
-        # hold_amount >= amt 조건부로 hold↓, balance↓
-        res = self.ACC.update_one(
-            {"_id": src, "hold_amount": {"$gte": amt}},
-            {"$inc": {"hold_amount": -amt128, "balance": -amt128}}
-        )
-        if res.modified_count != 1:
+        # hold_amount >= amt 조건부로 hold↓, balance↓ (보류한 슬롯에서). 실패/예외면 선점 원복
+        neg = self.amt.neg(amt)
+        unclaim = lambda: self._unclaim_hold(idem, "2", "1", s)
+        if not _undo_on_error(s, lambda: self._capture_hold(src, amt, hold.get("slot"), s), unclaim):
+            unclaim()
             return {"txn_id": str(txn_id), "status": "1", "result": "CONCURRENCY_FAIL"}
 
-        # 분개(음수) 멱등
-        _idem_insert(self.LEDGER,
-            {"txn_id": txn_id, "account_id": src, "amount": -amt128,"created_at": c_at},
-            {"txn_id": txn_id, "account_id": src, "amount": -amt128}
-        )
-
-        self.HOLD.update_one({"idempotency_key": idem}, {"$set": {"status": "2"}})
-        self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "2"}})
+        # 분개(음수) 멱등. 예외면 분개/출금/선점 원복 → txn 상태는 분개가 성공한 뒤에
+        entries = [{"txn_id": txn_id, "account_id": src, "amount": neg, "created_at": c_at}]
+        def undo():
+            _ledger_unpair(self.LEDGER, entries, session=s)
+            self._refund(src, amt, hold.get("slot"), True, s)
+            unclaim()
+        _undo_on_error(s, lambda: _ledger_pair(self.LEDGER, entries, session=s), undo)
+        self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "2"}}, session=s)
         return {"txn_id": str(txn_id), "status": "2", "result": "OK"}
 
     # 4) 입금 확정(동일 은행) — balance↑ + 분개(+)
-    def confirm_credit_local(self, body: Dict[str, Any]):
+    #    순차 왕복 4: txn 조회 → 분개 upsert(선점) → $inc → txn 상태 / 이미 처리 3
+    def _confirm_credit_local(self, body: Dict[str, Any], s=None):
         idem = body["idempotency_key"]
 
-        tx = self.TXN.find_one({"idempotency_key": idem})
+        tx = self.TXN.find_one({"idempotency_key": idem}, {"_id": 1, "dst_account_id": 1, "amount": 1}, session=s)
         if not tx:
             return {"status": "1", "result": "TX_NOT_FOUND"}
 
         txn_id = tx["_id"]
         dst    = str(tx["dst_account_id"])
-        amt128 = tx["amount"] if isinstance(tx["amount"], Decimal128) else _d128(tx["amount"])
-        amt    = amt128.to_decimal()
+        amt = self.amt.coerce(tx["amount"])
         c_at = datetime.utcnow()
 
-        # 이미 분개 있으면 멱등 OK
-        if self.LEDGER.find_one({"txn_id": txn_id, "account_id": dst, "amount": amt128}):
-            self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "2"}})
-            return {"txn_id": str(txn_id), "status": "2", "result": "ALREADY_POSTED"}
-
-        # balance↑
-        self.ACC.update_one({"_id": dst}, {"$inc": {"balance": amt128}})
-
-        # 분개(양수) 멱등
-        _idem_insert(self.LEDGER,
-            {"txn_id": txn_id, "account_id": dst, "amount": amt128,"created_at": c_at},
-            {"txn_id": txn_id, "account_id": dst, "amount": amt128}
+        # 분개를 먼저 선점: 이미 있으면 멱등 OK (find_one + insert 대신 upsert 1회)
+        created, _ = _idem_insert(self.LEDGER,
+            {"txn_id": txn_id, "account_id": dst, "amount": amt, "created_at": c_at},
+            {"txn_id": txn_id, "account_id": dst, "amount": amt}, session=s
         )
+        set_done = lambda: self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "2"}}, session=s)
+        if not created:
+            set_done()
+            return {"txn_id": str(txn_id), "status": "2", "result": "ALREADY_POSTED"}
 
-        self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "2"}})
+        # balance↑ (예외면 분개 marker를 지워 재시도가 ALREADY_POSTED로 끝나지 않게) → txn 상태
+        _undo_on_error(s, lambda: self._credit(dst, amt, s),
+                       lambda: self.LEDGER.delete_one({"txn_id": txn_id, "account_id": dst, "amount": amt}))
+        set_done()
         return {"txn_id": str(txn_id), "status": "2", "result": "OK"}
 
     # 5) 내부 이체 확정 — 출금(보류/무보류) + 입금 + 양쪽 분개
-    def transfer_confirm_internal(self, body: Dict[str, Any]):
+    #    순차 왕복 6: txn 조회 → hold 선점 → 조건부 출금 → 입금 → 분개 2건(bulk_write 1회) → txn 상태
+    def _transfer_confirm_internal(self, body: Dict[str, Any], s=None):
         idem = body["idempotency_key"]
 
-        tx = self.TXN.find_one({"idempotency_key": idem})
+        tx = self.TXN.find_one({"idempotency_key": idem},
+                               {"_id": 1, "src_account_id": 1, "dst_account_id": 1, "amount": 1}, session=s)
         if not tx:
             return {"status": "1", "result": "TX_NOT_FOUND"}
 
         txn_id = tx["_id"]
         src    = str(tx["src_account_id"])
         dst    = str(tx["dst_account_id"])
-        amt128 = tx["amount"] if isinstance(tx["amount"], Decimal128) else _d128(tx["amount"])
-        amt    = amt128.to_decimal()
+        amt = self.amt.coerce(tx["amount"])
         c_at = datetime.utcnow()
 
-        hold = self.HOLD.find_one({"idempotency_key": idem})
-        if hold and hold.get("status") == "2":
+        # hold(2 아님) → 2 선점. 없으면 보류 없는 이체인지 / 이미 확정인지 구분
+        hold = self._claim_hold(idem, {"$ne": "2"}, "2", s)
+        if not hold and self.HOLD.find_one({"idempotency_key": idem}, {"_id": 1}, session=s):
             return {"status": "2", "result": "ALREADY_CONFIRMED"}
 
         # 출금(보류O: hold↓+balance↓, 보류X: balance↓)
+        neg = self.amt.neg(amt)
         if hold:
-            res = self.ACC.update_one(
-                {"_id": src, "hold_amount": {"$gte": amt}},
-                {"$inc": {"hold_amount": -amt128, "balance": -amt128}}
-            )
-            if res.modified_count != 1:
+            unclaim = lambda: self._unclaim_hold(idem, "2", hold["status"], s)
+            if not _undo_on_error(s, lambda: self._capture_hold(src, amt, hold.get("slot"), s), unclaim):
+                unclaim()
                 return {"status": "1", "result": "CONCURRENCY_FAIL"}
-            self.HOLD.update_one({"idempotency_key": idem}, {"$set": {"status": "2"}})
+            def undo_debit():
+                self._refund(src, amt, hold.get("slot"), True, s)
+                unclaim()
         else:
-            res = self.ACC.update_one(
-                {"_id": src, "balance": {"$gte": amt}},
-                {"$inc": {"balance": -amt128}}
-            )
-            if res.modified_count != 1:
+            debited, src_slot = self._debit(src, amt, s)
+            if not debited:
                 return {"status": "1", "result": "INSUFFICIENT_FUNDS"}
-
-        # 입금
-        self.ACC.update_one({"_id": dst}, {"$inc": {"balance": amt128}})
-
-        # 분개 멱등 (음수/양수)
-        _idem_insert(self.LEDGER,
-            {"txn_id": txn_id, "account_id": src, "amount": -amt128,"created_at": c_at},
-            {"txn_id": txn_id, "account_id": src, "amount": -amt128}
-        )
-        _idem_insert(self.LEDGER,
-            {"txn_id": txn_id, "account_id": dst, "amount":  amt128,"created_at": c_at},
-            {"txn_id": txn_id, "account_id": dst, "amount":  amt128}
-        )
-
-        self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "2"}})
+            undo_debit = lambda: self._refund(src, amt, src_slot, False, s)
+
+        # 입금 → 분개 멱등(음수·양수 한 bulk_write). 예외면 앞 단계 원복, txn 상태는 둘 다 성공한 뒤에
+        dst_slot = _undo_on_error(s, lambda: self._credit(dst, amt, s), undo_debit)
+        entries = [
+            {"txn_id": txn_id, "account_id": src, "amount": neg, "created_at": c_at},
+            {"txn_id": txn_id, "account_id": dst, "amount": amt, "created_at": c_at},
+        ]
+        def undo():
+            _ledger_unpair(self.LEDGER, entries, session=s)
+            self._uncredit(dst, amt, dst_slot, s)
+            undo_debit()
+        _undo_on_error(s, lambda: _ledger_pair(self.LEDGER, entries, session=s), undo)
+        self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "2"}}, session=s)
         return {"status": "2", "result": "OK"}
 
     # 6) 송금 보류 해제(sp_remittance_release 대체)
-    def remittance_release(self, body: Dict[str, Any]):
+    #    순차 왕복: 성공 3 (hold 선점 → hold_amount↓ → txn 상태) / 실패 3 (hold 선점, txn 조회, hold 조회)
+    def _remittance_release(self, body: Dict[str, Any], s=None):
         idem = body["idempotency_key"]
 
-        tx = self.TXN.find_one({"idempotency_key": idem})
-        if not tx:
-            return {"status": "1", "result": "TX_NOT_FOUND"}
-
-        txn_id = tx["_id"]
-        src = str(tx["src_account_id"])
-        amt128 = tx["amount"] if isinstance(tx["amount"], Decimal128) else _d128(tx["amount"])
-        amt = amt128.to_decimal()
-
-        hold = self.HOLD.find_one({"idempotency_key": idem})
+        # hold 1 → 3 선점 (hold 문서에 계좌/금액이 있으므로 txn 조회 불필요)
+        hold = self._claim_hold(idem, "1", "3", s)
         if not hold:
-            return {"status": "3", "result": "HOLD_NOT_FOUND"}
-        if hold.get("status") == "3":
-            return {"status": "3", "result": "ALREADY_RELEASED"}
-        if hold.get("status") == "2":
+            if not self.TXN.find_one({"idempotency_key": idem}, {"_id": 1}, session=s):
+                return {"status": "1", "result": "TX_NOT_FOUND"}
+            cur = self.HOLD.find_one({"idempotency_key": idem}, {"status": 1}, session=s)
+            if not cur:
+                return {"status": "3", "result": "HOLD_NOT_FOUND"}
+            if cur.get("status") == "3":
+                return {"status": "3", "result": "ALREADY_RELEASED"}
             return {"status": "2", "result": "ALREADY_CAPTURED"}
 
-        # hold_amount 감소
-        self.ACC.update_one({"_id": src}, {"$inc": {"hold_amount": -amt128}})
-
-        # hold 상태 변경
-        self.HOLD.update_one({"idempotency_key": idem}, {"$set": {"status": "3"}})
-        self.TXN.update_one({"_id": txn_id}, {"$set": {"status": "3"}})
-
+        # hold_amount 감소 (예외면 hold를 1로 되돌려 정리 대상에 남김) → txn 상태
+        _undo_on_error(s, lambda: self._release_funds(str(hold["account_id"]), hold["amount"], hold.get("slot"), s),
+                       lambda: self._unclaim_hold(idem, "3", "1", s))
+        self.TXN.update_one({"idempotency_key": idem}, {"$set": {"status": "3"}}, session=s)
         return {"status": "3", "result": "OK"}
 
     # 7) 데이터 리셋 (TRUNCATE 대체)
@@ -297,6 +617,8 @@ class MongoTxService:
         - 트랜잭션 데이터 삭제 (drop collection으로 빠르게)
         - 계정 잔액 초기화
         - 특정 계정에 초기 잔액 설정
+        - 잔액 버킷 사용 시 hot 계좌 잔액은 슬롯 N개에 균등 분배 (accounts.balance는 0)
+          → 그 계좌의 출금/보류 1건 상한은 초기 잔액/N (결과의 max_single_amount)
 
         Args:
             test_account_ids: 초기 잔액(100,000,000)을 설정할 계정 ID 리스트
@@ -312,25 +634,102 @@ class MongoTxService:
         self.LEDGER.drop()
         self.HOLD.drop()
         self.TXN.drop()
+        self.SLOTS.drop()
 
         # 인덱스 재생성 (drop 후 필요)
-        self.ensure_indexes()
+        self.ensure_indexes(force=True)
 
         # 2. 계정 잔액 초기화
         self.ACC.update_many(
             {},
-            {"$set": {"balance": _d128(0), "hold_amount": _d128(0)}}
+            {"$set": {"balance": self.amt.zero(), "hold_amount": self.amt.zero()}}
         )
 
-        # 3. 특정 계정에 초기 잔액 설정
+        # 3. 특정 계정에 초기 잔액 설정 (버킷 계좌는 슬롯으로)
+        initial = 100000000
+        slotted = sorted(a for a in self.hot_accounts if self._slotted(a))
         self.ACC.update_many(
-            {"_id": {"$in": test_account_ids}},
-            {"$set": {"balance": _d128(100000000)}}
+            {"_id": {"$in": [a for a in test_account_ids if a not in slotted]}},
+            {"$set": {"balance": self.amt.encode(initial)}}
         )
+        slot_docs = [
+            {"_id": _slot_id(acct, i), "account_id": acct, "slot": i,
+             "balance": self.amt.encode(amt), "hold_amount": self.amt.zero()}
+            for acct in slotted
+            for i, amt in enumerate(_split_evenly(initial if acct in test_account_ids else 0, self.balance_slots))
+        ]
+        if slot_docs:
+            self.SLOTS.insert_many(slot_docs, ordered=False)
 
         return {
             "result": "OK",
             "message": "MongoDB data reset completed",
             "test_accounts": test_account_ids,
-            "initial_balance": 100000000
+            "initial_balance": initial,
+            "amount_mode": self.amt.mode,
+            "slotted_accounts": {acct: self.balance_slots for acct in slotted},
+            "max_single_amount": {acct: initial // self.balance_slots for acct in slotted if acct in test_account_ids}
         }
+
+
+class MongoTxTransactionalService(MongoTxService):
+    """
+    MONGO_TX_ENGINE=transaction: 프로시저 1회 = 다중 문서 트랜잭션 1개.
+    $inc 후 holds/분개 insert 전에 죽어도 전부 롤백되어 hold_amount가 어긋나지 않는다.
+    - 레플리카셋 필요 (단일 노드도 가능: mongod --replSet rs0 후 rs.initiate())
+    - TransientTransactionError / UnknownTransactionCommitResult 는 with_transaction이 재시도
+    - 트랜잭션 안에서는 작업별 write concern을 쓸 수 없어 내구성 프로파일의 txn 값을 커밋에 적용
+      (default 프로파일 = majority)
+    """
+
+    def __init__(self, mongo=None, balance_slots: int = 0, hot_accounts=(), durability: str = "default",
+                 amount_mode: str = "decimal128"):
+        super().__init__(mongo, balance_slots, hot_accounts, durability, amount_mode)
+        if not self.client.admin.command("hello").get("setName"):
+            raise RuntimeError("MONGO_TX_ENGINE=transaction requires a replica set (mongod --replSet)")
+
+    def _apply_durability(self, concerns: Dict[str, WriteConcern]):
+        super()._apply_durability({})
+        self._commit_wc = concerns.get("txn") or WriteConcern("majority")
+
+    def _run(self, fn, body: Dict[str, Any]):
+        with self.client.start_session() as s:
+            return s.with_transaction(
+                lambda sess: fn(body, sess),
+                read_concern=ReadConcern("snapshot"),
+                write_concern=self._commit_wc,
+                read_preference=ReadPreference.PRIMARY,
+            )
+
+
+MONGO_TX_ENGINES = {
+    "idempotent": MongoTxService,
+    "transaction": MongoTxTransactionalService,
+}
+
+def build_mongo_tx_service(engine: str = "idempotent", mongo=None, balance_slots: int = 0, hot_accounts=(),
+                           durability: str = "default", amount_mode: str = "decimal128") -> MongoTxService:
+    cls = MONGO_TX_ENGINES.get((engine or "idempotent").lower())
+    if cls is None:
+        raise ValueError(f"Unknown MONGO_TX_ENGINE: {engine} (use {', '.join(MONGO_TX_ENGINES)})")
+    return cls(mongo, balance_slots, hot_accounts, durability, amount_mode)
+
+
+# ---------- 워커 단위 싱글톤 ----------
+_SERVICE: Optional[MongoTxService] = None
+_SERVICE_PID: Optional[int] = None
+_SERVICE_LOCK = threading.Lock()
+
+def get_mongo_tx_service() -> MongoTxService:
+    """워커(프로세스)당 MongoTxService 1개. 공유 MongoClient 위에서 컬렉션 바인딩을 재사용한다."""
+    global _SERVICE, _SERVICE_PID
+    with _SERVICE_LOCK:
+        if _SERVICE is None or _SERVICE_PID != os.getpid():
+            cfg = current_app.config
+            _SERVICE = build_mongo_tx_service(cfg.get("MONGO_TX_ENGINE", "idempotent"),
+                                              balance_slots=cfg.get("MONGO_BALANCE_SLOTS", 0),
+                                              hot_accounts=cfg.get("MONGO_HOT_ACCOUNTS", ()),
+                                              durability=cfg.get("MONGO_DURABILITY", "default"),
+                                              amount_mode=cfg.get("MONGO_AMOUNT_MODE", "decimal128"))
+            _SERVICE_PID = os.getpid()
+        return _SERVICE
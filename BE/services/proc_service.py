@@ -0,0 +1,175 @@
+# services/proc_service.py
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from flask import current_app
+from db.router import get_adapter
+from db.signatures import ProcSignature
+from services.result_cache import result_cache
+
+# (어댑터 메서드명, 위치 인자, 키워드 인자, 결과 정규화 함수)
+_Plan = Tuple[str, tuple, Dict[str, Any], Callable[[Any], Any]]
+
+
+def _legacy_payload(dbms: str, d: Dict[str, Any]) -> bool:
+    """out_count / out_types / out(커서 스펙)를 직접 보내는 기존 요청 형식인지"""
+    if "out_count" in d or "out_types" in d or d.get("out"):
+        return True
+    return dbms == "postgres" and "mode" in d
+
+
+def _normalize_pg(result, out_names: Optional[List[str]]):
+    # PostgreSQL 정규화: [{"p_txn_id": 123, "p_status": "1"}] → {"txn_id": 123, "status": "1"}
+    if out_names and isinstance(result, list) and len(result) > 0:
+        first_row = result[0]
+        normalized = {}
+        # 컬럼 이름에서 'p_' 접두사를 제거하고 매핑
+        for key, value in first_row.items():
+            clean_key = key.replace('p_', '') if key.startswith('p_') else key
+            normalized[clean_key] = value
+        return normalized
+    return result
+
+
+def _normalize_oracle(result, out_names: Optional[List[str]]):
+    # Oracle 정규화: {"out": [123, "1"], "all": [...]} → {"txn_id": 123, "status": "1"}
+    if out_names and isinstance(result, dict) and "out" in result:
+        out_values = result["out"]
+        normalized = {}
+        for i, name_key in enumerate(out_names):
+            if i < len(out_values):
+                normalized[name_key] = out_values[i]
+        return normalized
+    return result
+
+
+def _normalize_mysql(result, out_names: Optional[List[str]]):
+    # MySQL 정규화: {"resultset": ..., "out": {"out0": 123, "out1": "1"}} → {"txn_id": 123, "status": "1"}
+    if out_names and isinstance(result, dict) and "out" in result and result["out"]:
+        out_dict = result["out"]
+        normalized = {}
+        for i, name_key in enumerate(out_names):
+            out_key = f"out{i}"
+            if out_key in out_dict:
+                normalized[name_key] = out_dict[out_key]
+        return normalized
+    return result
+
+
+def _plan_legacy(dbms: str, name: str, args: List[Any], d: Dict[str, Any]) -> _Plan:
+    out_names = d.get("out_names")  # 예: ["txn_id", "status"]
+
+    if dbms == "postgres":
+        # FUNCTION 결과셋: SELECT * FROM func(...)
+        # PROCEDURE: CALL proc(...)
+        mode = (d.get("mode") or "proc").lower()
+        method = "call_function" if mode == "func" else "call_procedure"
+        return method, (name, args), {}, partial(_normalize_pg, out_names=out_names)
+
+    if dbms == "oracle":
+        out_spec = d.get("out")
+        if out_spec:
+            return "call_procedure_with_cursor", (name, args), {"out_spec": out_spec}, \
+                partial(_normalize_oracle, out_names=out_names)
+        kw = {"out_count": int(d.get("out_count", 0)), "out_types": d.get("out_types") or []}
+        return "call_procedure", (name, args), kw, partial(_normalize_oracle, out_names=out_names)
+
+    if dbms == "mysql":
+        kw = {"out_count": int(d.get("out_count", 0))}
+        return "call_procedure", (name, args), kw, partial(_normalize_mysql, out_names=out_names)
+
+    raise ValueError(f"Unsupported DBMS for procedure call: {dbms}")
+
+
+def _plan(dbms: str, name: str, args: List[Any], d: Dict[str, Any], sig: Optional[ProcSignature]) -> _Plan:
+    """호출할 어댑터 메서드/인자/결과 정규화 함수 (sync/async 공용)"""
+    if sig is None:
+        return _plan_legacy(dbms, name, args, d)
+
+    out_names = d.get("out_names") or list(sig.out_names)
+
+    if dbms == "postgres":
+        norm = partial(_normalize_pg, out_names=out_names)
+        if sig.kind == "func":
+            # RETURNS TABLE 컬럼은 인자가 아니므로 IN 값만 전달
+            if len(args) != sig.in_count:
+                raise ValueError(f"{name}: expected {sig.in_count} IN args, got {len(args)}")
+            return "call_function", (name, args), {}, norm
+        return "call_procedure", (name, sig.bind_args(args)), {}, norm
+
+    if not sig.tail_outs:
+        # MySQL/Oracle 어댑터는 끝의 out_count개 자리만 OUT 변수로 바인딩
+        raise ValueError(f"{name}: OUT/INOUT parameters must all follow IN parameters "
+                         "(use the legacy payload with out_count)")
+
+    if dbms == "oracle":
+        kw = {"out_count": sig.out_count, "out_types": list(sig.out_types)}
+        return "call_procedure", (name, sig.bind_args(args)), kw, partial(_normalize_oracle, out_names=out_names)
+
+    kw = {"out_count": sig.out_count}
+    return "call_procedure", (name, sig.bind_args(args)), kw, partial(_normalize_mysql, out_names=out_names)
+
+
+def _parse(d: Dict[str, Any]):
+    dbms = (d.get("dbms") or "").lower()
+    return dbms, d["name"], list(d.get("args", []) or []), _legacy_payload(dbms, d) or dbms == "mongo"
+
+
+def exec_proc(d: Dict[str, Any]):
+    """
+    /db/proc/exec 본체.
+    Body: {"dbms": "mysql|postgres|oracle", "name": "sp_x", "args": [IN 값...], "out_names": [...](선택)}
+    - out_count / out_types / mode 가 없으면 캐시된 시그니처에서 채운다 (클라이언트는 IN 값만 전송)
+    - 기존 형식(out_count 등 명시)은 그대로 동작
+    - 확정 프로시저가 끝나면 그 DBMS의 템플릿 결과 캐시를 비운다 (services/result_cache.py)
+    """
+    dbms, name, args, legacy = _parse(d)
+    adapter = get_adapter(dbms)
+    sig = None if legacy else adapter.signature(name)
+    method, a, kw, norm = _plan(dbms, name, args, d, sig)
+    res = norm(getattr(adapter, method)(*a, **kw))
+    result_cache.on_commit(dbms, name)
+    return res
+
+
+async def exec_proc_async(d: Dict[str, Any], adapter):
+    """exec_proc의 async 버전 (adapter: db.async_adapters 의 같은 이름 메서드를 가진 어댑터)"""
+    dbms, name, args, legacy = _parse(d)
+    sig = None if legacy else await adapter.signature(name)
+    method, a, kw, norm = _plan(dbms, name, args, d, sig)
+    return norm(await getattr(adapter, method)(*a, **kw))
+
+
+def _exec_group(app, items: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """같은 DBMS 항목들을 순서대로 실행 (항목별 실패는 결과에 담고 계속 진행)"""
+    out = []
+    with app.app_context():
+        for idx, d in items:
+            try:
+                out.append((idx, {"ok": True, "data": exec_proc(d)}))
+            except Exception as e:
+                out.append((idx, {"ok": False, "error": str(e)}))
+    return out
+
+
+def exec_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    /db/proc/batch 본체.
+    items: [{"dbms","name","args","out_names"}, ...] (exec_proc와 같은 형식)
+    DBMS별로 묶어 그룹 안에서는 순차, 그룹끼리는 스레드로 병렬 실행. 결과는 입력 순서대로.
+    """
+    app = current_app._get_current_object()
+    groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for i, d in enumerate(items):
+        groups.setdefault((d.get("dbms") or "").lower(), []).append((i, d))
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    if len(groups) == 1:
+        done = [_exec_group(app, next(iter(groups.values())))]
+    else:
+        with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="proc-batch") as ex:
+            done = list(ex.map(partial(_exec_group, app), groups.values()))
+    for group in done:
+        for idx, res in group:
+            results[idx] = res
+    return results
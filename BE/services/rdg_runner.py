@@ -26,6 +26,7 @@ class RDGConfig:
     max_amount: int = 100_000
     allow_same_db: bool = True
     log_level: str = "DEBUG"
+    mongo_durability: Optional[str] = None   # bench | safe | "bench,ledger=safe" (None = 서버 기본값)
 
     def __post_init__(self):
         if self.active_dbms is None:
@@ -104,6 +105,10 @@ class RDGRunner:
         env["MAX_AMOUNT"] = str(cfg.max_amount)
         env["ALLOW_SAME_DB"] = str(cfg.allow_same_db)
         env["LOG_LEVEL"] = cfg.log_level
+        if cfg.mongo_durability:
+            env["MONGO_DURABILITY"] = cfg.mongo_durability
+        else:
+            env.pop("MONGO_DURABILITY", None)
         if cfg.active_dbms:
             env["ACTIVE_DBMS"] = ",".join(cfg.active_dbms)
         env["ENV"] = "dev"  # 또는 "server"
@@ -302,6 +307,9 @@ class RDGRunner:
             actual_rps = 0.0
             success_rate = 0.0
             uptime_sec = 0.0
+            avg_latency_ms = 0.0
+            mongo_durability = None
+            mongo_latency = {}
 
             print(f"[DEBUG] Found {len(stats_block)} lines in stats block")
 
@@ -318,6 +326,18 @@ class RDGRunner:
                 elif match := re.search(r'실제 RPS:\s*([\d.]+)\s*\|\s*성공률:\s*([\d.]+)%', line):
                     actual_rps = float(match.group(1))
                     success_rate = float(match.group(2))
+                # Mongo 내구성: bench | 평균 지연: 4.21ms
+                elif match := re.search(r'Mongo 내구성:\s*(\S+)\s*\|\s*평균 지연:\s*([\d.]+)ms', line):
+                    mongo_durability = match.group(1)
+                    avg_latency_ms = float(match.group(2))
+                #   mongo/remittance/hold: n=120 avg=3.10ms p50=2.80ms p99=9.40ms
+                elif match := re.search(r'mongo/(\S+): n=(\d+) avg=([\d.]+)ms p50=([\d.]+)ms p99=([\d.]+)ms', line):
+                    mongo_latency[match.group(1)] = {
+                        "n": int(match.group(2)),
+                        "avg_ms": float(match.group(3)),
+                        "p50_ms": float(match.group(4)),
+                        "p99_ms": float(match.group(5)),
+                    }
 
             print(f"[DEBUG] Parsed stats: sent={sent}, success={success}, fail={fail}")
 
@@ -328,7 +348,9 @@ class RDGRunner:
                 "fail": fail,
                 "success_rate": success_rate,
                 "actual_rps": actual_rps,
-                "avg_latency_ms": 0.0,  # RDG_v1.py에서는 평균 레이턴시를 로그에 출력하지 않음
+                "avg_latency_ms": avg_latency_ms,  # Mongo 호출 평균 (SQL은 로그에 출력하지 않음)
+                "mongo_durability": mongo_durability,
+                "mongo_latency": mongo_latency,
                 "in_flight": 0,  # 실시간 추적 불가
                 "last_tick": time.time()
             }
@@ -347,6 +369,8 @@ class RDGRunner:
             "success_rate": 0.0,
             "actual_rps": 0.0,
             "avg_latency_ms": 0.0,
+            "mongo_durability": None,
+            "mongo_latency": {},
             "in_flight": 0,
             "last_tick": 0.0
         }
@@ -0,0 +1,88 @@
+# services/result_cache.py
+"""
+readonly 쿼리 템플릿 결과 캐시 (워커당 1개, LRU + 항목별 TTL).
+- 키: (dbms, 템플릿 id, 파라미터 JSON, ...) / TTL: 템플릿 프라그마 cache_ttl_sec (0 = 캐시 안 함)
+- 용량(max_entries)을 넘으면 가장 오래 안 쓴 항목부터 제거. 0이면 캐시 전체 끔
+- 송금 확정 프로시저(invalidate_procs) 호출이 끝나면 그 DBMS 항목을 비운다 (on_commit)
+캐시된 값은 호출자끼리 공유하므로 수정하지 않는다 (JSON 직렬화만).
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+# 잔액을 바꾸는 확정 프로시저 (Mongo는 같은 이름으로 mongo_proc 라우트에서 호출)
+DEFAULT_INVALIDATE_PROCS = ("sp_transfer_confirm_internal", "sp_confirm_debit_local", "sp_confirm_credit_local")
+
+
+def cache_key(dbms: str, qid: str, params: Any, *extra: Hashable) -> Tuple:
+    """파라미터는 키 순서와 무관하게 같은 키 (Decimal/날짜 등은 문자열로)"""
+    return (dbms.lower(), qid, json.dumps(params or {}, sort_keys=True, default=str)) + extra
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 256, invalidate_procs: Iterable[str] = DEFAULT_INVALIDATE_PROCS):
+        self.max_entries = max_entries
+        self.invalidate_procs = {p.lower() for p in invalidate_procs}
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expired = self.invalidations = 0
+
+    def get_or_load(self, key: Tuple, ttl_sec: float, load: Callable[[], Any]) -> Any:
+        """캐시에 있으면 그 값, 없거나 만료면 load() 결과를 ttl_sec 동안 저장 (ttl_sec<=0이면 항상 load)"""
+        if ttl_sec <= 0 or self.max_entries <= 0:
+            return load()
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                if item[0] > now:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return item[1]
+                del self._items[key]
+                self.expired += 1
+            self.misses += 1
+        # DB 호출은 락 밖에서 (같은 키 동시 miss는 둘 다 실행, 나중 값이 남음)
+        value = load()
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl_sec, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, dbms: Optional[str] = None) -> int:
+        """dbms 항목(생략 시 전체) 제거 → 제거한 수"""
+        with self._lock:
+            if dbms is None:
+                keys = list(self._items)
+            else:
+                keys = [k for k in self._items if k[0] == dbms.lower()]
+            for k in keys:
+                del self._items[k]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def on_commit(self, dbms: str, proc_name: str) -> int:
+        """프로시저 호출 성공 후 훅: 확정 프로시저면 그 DBMS 캐시 비움"""
+        if (proc_name or "").lower() not in self.invalidate_procs:
+            return 0
+        return self.invalidate(dbms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._items), "max_entries": self.max_entries,
+                "hits": self.hits, "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions, "expired": self.expired, "invalidations": self.invalidations,
+                "invalidate_procs": sorted(self.invalidate_procs),
+            }
+
+
+# 워커 단위 싱글톤 (app.py에서 RESULT_CACHE_* 적용)
+result_cache = ResultCache()
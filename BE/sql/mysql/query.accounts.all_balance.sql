@@ -1,3 +1,4 @@
+-- cache_ttl_sec=5
 SELECT
   sum(balance) as balance
 FROM MDBS.accounts
\ No newline at end of file
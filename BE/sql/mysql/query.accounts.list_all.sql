@@ -1,3 +1,4 @@
+-- paginate=keyset key=account_id cache_ttl_sec=5
 SELECT
   *
 FROM
@@ -1,3 +1,4 @@
+-- paginate=keyset key=entry_id
 SELECT 
 	ENTRY_ID ,
 	TXN_ID ,
@@ -0,0 +1,208 @@
+# tests/test_adapters.py
+from contextlib import contextmanager
+
+from db.mysql_adapter import MySQLAdapter
+
+class _FakeCursor:
+    """execute() 후 미리 정한 결과셋들을 nextset()으로 순회"""
+    def __init__(self, result_sets):
+        self.result_sets = result_sets
+        self.executed = []
+        self._i = 0
+    def __enter__(self): return self
+    def __exit__(self, *a): pass
+    @property
+    def description(self):
+        rs = self.result_sets[self._i]
+        return [("c",)] if rs is not None else None
+    def execute(self, sql, params=()):
+        self.executed.append((sql, list(params)))
+    def fetchall(self):
+        return self.result_sets[self._i]
+    def nextset(self):
+        if self._i + 1 < len(self.result_sets):
+            self._i += 1
+            return True
+        return None
+
+class _FakeConn:
+    def __init__(self, cur): self.cur = cur
+    def cursor(self): return self.cur
+
+def _adapter_with(cur, fast_call):
+    a = MySQLAdapter({"host": "fake", "port": 0, "user": "u", "db": "t"}, fast_call=fast_call)
+    @contextmanager
+    def _conn():
+        yield _FakeConn(cur)
+    a._conn = a._call_conn = _conn
+    return a
+
+def test_mysql_fast_call_single_round_trip():
+    # 프로시저 결과셋 없음 → CALL 상태(None) → SELECT OUT
+    out_row = {"@_sp_remittance_hold_6": 7, "@_sp_remittance_hold_7": "1"}
+    cur = _FakeCursor([None, [out_row]])
+    a = _adapter_with(cur, fast_call=True)
+
+    res = a.call_procedure("sp_remittance_hold", [1, 2, "2", 100, "k", "1"], out_count=2)
+
+    assert res == {"resultset": None, "out": {"out0": 7, "out1": "1"}}
+    assert len(cur.executed) == 1
+    sql, params = cur.executed[0]
+    assert sql == ("CALL sp_remittance_hold(%s, %s, %s, %s, %s, %s, @_sp_remittance_hold_6, @_sp_remittance_hold_7); "
+                   "SELECT @_sp_remittance_hold_6, @_sp_remittance_hold_7")
+    assert params == [1, 2, "2", 100, "k", "1"]
+    assert a.stats()["round_trips"]["call_procedure"] == {"calls": 1, "round_trips": 1, "per_call": 1.0}
+
+def test_mysql_multi_statements_only_on_call_pool(monkeypatch):
+    import pymysql
+    from db import mysql_adapter
+    flags = []
+    class _Conn:
+        def __init__(self, **kw): flags.append(kw.get("client_flag", 0))
+        def cursor(self): return _FakeCursor([[{"a": 1}]])
+        def ping(self, reconnect=False): pass
+        def close(self): pass
+    monkeypatch.setattr(mysql_adapter.pymysql, "connect", lambda **kw: _Conn(**kw))
+    a = MySQLAdapter({"host": "multi-test", "port": 0, "user": "u", "db": "t"},
+                     {"min_size": 0}, fast_call=True)
+    a.execute_query("SELECT 1")
+    assert flags == [0]                                          # 사용자 SQL 풀은 단일 문장만
+    a._call_procedure_fast("p", ["x"], 0)
+    assert flags == [0, pymysql.constants.CLIENT.MULTI_STATEMENTS]
+    assert a.stats()["call_pool"]["name"] == "mysql-call"
+    a.close()
+
+def test_mysql_fast_call_keeps_first_resultset():
+    cur = _FakeCursor([[{"a": 1}], None, [{"@_p_1": "OK"}]])
+    a = _adapter_with(cur, fast_call=True)
+    res = a.call_procedure("p", ["x"], out_count=1)
+    assert res == {"resultset": [{"a": 1}], "out": {"out0": "OK"}}
+
+def test_mysql_session_same_connection():
+    cur = _FakeCursor([[{"a": 1}]])
+    a = _adapter_with(cur, fast_call=False)
+    with a.session(timeout_ms=500, readonly=True) as s:
+        assert s.execute_query("-- timeout_ms=500\nselect a FROM t", {}) == [{"a": 1}]
+    # 타임아웃은 힌트로 본문에 → 1왕복, autocommit SELECT라 READ ONLY 생략
+    assert cur.executed == [("-- timeout_ms=500\nselect /*+ MAX_EXECUTION_TIME(500) */ a FROM t", [])]
+
+    cur = _FakeCursor([[{"a": 1}]])
+    a = _adapter_with(cur, fast_call=False)
+    with a.session(isolation="read_committed") as s:
+        s.execute_query("SELECT 1")
+    assert [q for q, _ in cur.executed] == ["SET TRANSACTION ISOLATION LEVEL READ COMMITTED", "SELECT 1"]
+
+def test_mysql_stream_discards_connection_when_abandoned():
+    class _SSCur(_FakeCursor):
+        closed = False
+        def fetchmany(self, n):
+            rows, self.result_sets[0] = self.result_sets[0][:n], self.result_sets[0][n:]
+            return rows
+        def close(self): self.closed = True
+    class _Conn(_FakeConn):
+        open = True
+        def cursor(self, cls=None): return self.cur
+        def close(self): self.open = False
+
+    a = MySQLAdapter({"host": "fake", "port": 0, "user": "u", "db": "t"})
+    conn = _Conn(_SSCur([[{"a": i} for i in range(5)]]))
+    @contextmanager
+    def _conn():
+        yield conn
+    a._conn = _conn
+    with a.session(timeout_ms=100) as s:
+        assert [len(c) for c in s.stream("SELECT a FROM t", None, 2)] == [2, 2, 1]
+    assert conn.cur.closed and conn.open
+    assert conn.cur.executed[0][0] == "SELECT /*+ MAX_EXECUTION_TIME(100) */ a FROM t"
+
+    conn = _Conn(_SSCur([[{"a": i} for i in range(5)]]))
+    with a.session() as s:
+        it = s.stream("SELECT a FROM t", None, 2)
+        next(it)
+        it.close()                                  # 중간에 멈춤 → 남은 행 drain 대신 커넥션 폐기
+    assert not conn.open and not conn.cur.closed
+
+def test_mysql_closed_session_connection_not_pooled(monkeypatch):
+    from db import mysql_adapter
+    conns = []
+    class _Conn:
+        open = True
+        def __init__(self): conns.append(self)
+        def cursor(self, cls=None): return _FakeCursor([[{"a": len(conns)}]])
+        def close(self): self.open = False
+    monkeypatch.setattr(mysql_adapter.pymysql, "connect", lambda **kw: _Conn())
+    a = MySQLAdapter({"host": "reset-test", "port": 0, "user": "u", "db": "t"}, {"min_size": 0, "pre_ping": False})
+    with a.session():
+        conns[0].close()                      # stream 중단 / SET TRANSACTION 실패 후 run()이 닫은 상태로 정상 반납
+    with a.session() as s:
+        assert s.execute_query("SELECT a FROM t") == [{"a": 2}]
+    assert len(conns) == 2 and conns[1].open and a.stats()["pool"]["broken"] == 1   # pre_ping 없이도 폐기
+    a.close()
+
+def test_postgres_session_prefix_in_one_statement():
+    from db.postgres_adapter import PostgresAdapter
+
+    class _Cur(_FakeCursor):
+        def __init__(self): super().__init__([[{"a": 1}]])
+    class _Conn:
+        def __init__(self): self.cur = _Cur()
+        def __enter__(self): return self
+        def __exit__(self, *a): pass
+        def cursor(self): return self.cur
+
+    a = PostgresAdapter.__new__(PostgresAdapter)
+    from db.metrics import RoundTripCounter
+    a.rt = RoundTripCounter()
+    conn = _Conn()
+    @contextmanager
+    def _conn():
+        yield conn
+    a._conn = _conn
+    with a.session(timeout_ms=250, readonly=True, isolation="serializable") as s:
+        assert s.execute_query("SELECT 1", {}) == [{"a": 1}]
+    assert conn.cur.executed == [("SET TRANSACTION ISOLATION LEVEL SERIALIZABLE, READ ONLY; "
+                                  "SET LOCAL statement_timeout = 250; SELECT 1", [])]
+
+def test_isolation_level_names():
+    import pytest
+    from db.session import isolation_level, with_select_hint
+    assert isolation_level("Repeatable-Read") == "REPEATABLE READ" and isolation_level(None) is None
+    with pytest.raises(ValueError):
+        isolation_level("repeatable_read", "oracle")
+    assert with_select_hint("UPDATE t SET a=1", "X") == "UPDATE t SET a=1"
+
+def test_mongo_dumps_json_matches_legacy(monkeypatch):
+    import datetime as _dt
+    import json
+    from bson.decimal128 import Decimal128
+    from bson.int64 import Int64
+    from bson.objectid import ObjectId
+    from db import mongo_adapter
+    from db.mongo_adapter import _to_jsonable, dumps_json
+
+    doc = {"z": 1, "_id": ObjectId(), "amount": Decimal128("-1.2500"), "minor": Int64(12500),
+           "at": _dt.datetime(2025, 1, 1, 0, 0, 0, 123000), "nested": [{"b": Decimal128("0"), "a": None}],
+           "owner_name": "홍길동", "memo": "급여 이체 ✓"}
+    legacy = json.dumps(_to_jsonable([doc]), sort_keys=True, separators=(",", ":")).encode()
+    assert json.loads(dumps_json([doc])) == json.loads(legacy)     # orjson: 한글은 UTF-8 그대로 (바이트는 다름)
+    if mongo_adapter.orjson is not None:
+        assert "홍길동".encode() in dumps_json([doc]) and dumps_json([float("nan")]) == b"[null]"
+    monkeypatch.setattr(mongo_adapter, "orjson", None)        # orjson 없는 환경: jsonify와 바이트까지 같음
+    assert dumps_json([doc]) == legacy and b"\\ud64d" in legacy
+
+def test_ok_raw_matches_ok():
+    from app import app
+    from db.mongo_adapter import dumps_json
+    from utils.response import ok, ok_raw
+    with app.app_context():
+        assert ok_raw(b'[{"a":1}]').get_data() == ok([{"a": 1}])[0].get_data()
+        rows = [{"owner_name": "김철수"}]
+        raw = ok_raw(dumps_json(rows), next_cursor="다음")
+        assert raw.get_json() == ok(rows, next_cursor="다음")[0].get_json()
+
+def test_d128_str_matches_decimal():
+    from bson.decimal128 import Decimal128
+    from db.mongo_adapter import _d128_str
+    for v in ("0", "-0", "0.0000", "-1.2500", "100000000", "0.0001", "0.0000001", "1E+3", "NaN", "-Infinity",
+              "12345678901234567890123456789012.34"):
+        assert _d128_str(Decimal128(v)) == str(Decimal128(v).to_decimal()), v
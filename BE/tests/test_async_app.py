@@ -0,0 +1,103 @@
+# tests/test_async_app.py
+import asyncio
+from decimal import Decimal
+
+from aiohttp.test_utils import TestClient, TestServer
+
+import async_app
+from db.async_adapters import _pg_call_sql, _pg_coerce
+from db.signatures import ProcParam, ProcSignature
+
+class _FakeAsyncMySQL:
+    def __init__(self):
+        self.calls = []
+    async def signature(self, name):
+        return ProcSignature(name, "proc", (ProcParam("p_key", "IN", "varchar"),
+                                            ProcParam("p_status", "OUT", "varchar")))
+    async def call_procedure(self, name, params=None, out_count=0):
+        self.calls.append((name, params, out_count))
+        return {"resultset": None, "out": {"out0": "3"}}
+
+class _FakeMongo:
+    async def run(self, method, body):
+        return {"method": method, "amount": Decimal("1.50")}
+
+def _request(method, path, json, adapters):
+    async def go():
+        app = async_app.create_app()
+        app[async_app.REGISTRY]._adapters.update(adapters)
+        async with TestClient(TestServer(app)) as c:
+            r = await c.request(method, path, json=json)
+            return r.status, await r.json()
+    return asyncio.run(go())
+
+def test_async_proc_exec_uses_signature():
+    my = _FakeAsyncMySQL()
+    status, body = _request("POST", "/db/proc/exec",
+                            {"dbms": "mysql", "name": "sp_remittance_release", "args": ["k"]}, {"mysql": my})
+    assert status == 200
+    assert body == {"ok": True, "data": {"status": "3"}}
+    assert my.calls == [("sp_remittance_release", ["k", None], 1)]
+
+def test_async_mongo_proc_route():
+    status, body = _request("POST", "/mongo_proc/remittance/release", {"idempotency_key": "k"},
+                            {"mongo": _FakeMongo()})
+    assert status == 200
+    assert body["data"] == {"method": "remittance_release", "amount": "1.50"}
+    status, _ = _request("POST", "/mongo_proc/unknown", {}, {"mongo": _FakeMongo()})
+    assert status == 404
+
+def test_pg_binds():
+    assert _pg_call_sql("SELECT * FROM", "f", 2) == "SELECT * FROM f($1, $2)"
+    assert _pg_coerce("100", "numeric(19,4)") == Decimal("100")
+    assert _pg_coerce(7, "text") == "7"
+    assert _pg_coerce("7", "bigint") == 7
+
+class _Acquire:
+    """async with pool.acquire() as conn, conn.cursor() as cur 흉내"""
+    def __init__(self, obj): self.obj = obj
+    async def __aenter__(self): return self.obj
+    async def __aexit__(self, *a): pass
+
+class _FakeMyCursor:
+    def __init__(self, result_sets):
+        self.result_sets, self.executed = list(result_sets), []
+    @property
+    def description(self):
+        return bool(self.result_sets and self.result_sets[0] is not None) or None
+    async def execute(self, sql, params=()):
+        self.executed.append((sql, list(params)))
+    async def fetchall(self):
+        return self.result_sets[0]
+    async def nextset(self):
+        self.result_sets.pop(0)
+        return bool(self.result_sets) or None
+
+def test_async_mysql_legacy_payload_pads_out_args():
+    from db.async_adapters import AsyncMySQLAdapter
+    from services.proc_service import exec_proc_async
+    adapter = AsyncMySQLAdapter({})
+    cur = _FakeMyCursor([None, [{"@_sp_x_6": 7, "@_sp_x_7": "1"}]])
+    conn = type("C", (), {"cursor": lambda self: _Acquire(cur)})()
+    adapter._pool = type("P", (), {"acquire": lambda self: _Acquire(conn)})()
+
+    res = asyncio.run(exec_proc_async({"dbms": "mysql", "name": "sp_x", "args": [1, 2, 3, 4, 5, 6],
+                                       "out_count": 2, "out_names": ["txn_id", "status"]}, adapter))
+    sql, bound = cur.executed[0]
+    assert sql == "CALL sp_x(%s, %s, %s, %s, %s, %s, @_sp_x_6, @_sp_x_7); SELECT @_sp_x_6, @_sp_x_7"
+    assert bound == [1, 2, 3, 4, 5, 6]                          # IN 6개 전부 바인딩
+    assert res == {"txn_id": 7, "status": "1"}
+
+def test_async_pg_call_procedure_returns_out_row():
+    from db.async_adapters import AsyncPostgresAdapter
+    sig = ProcSignature("sp_hold", "proc", (ProcParam("p_key", "IN", "text"),
+                                            ProcParam("p_status", "OUT", "text")))
+    class _Pool:
+        async def fetch(self, sql, *args):
+            self.sql, self.args = sql, args
+            return [{"p_status": "1"}]
+    adapter = AsyncPostgresAdapter({})
+    adapter._pool = pool = _Pool()
+    adapter._sigs.put("sp_hold", sig)
+    assert asyncio.run(adapter.call_procedure("sp_hold", ["k", None])) == [{"p_status": "1"}]
+    assert pool.sql == "CALL sp_hold($1, $2)" and pool.args == ("k", None)
@@ -85,3 +85,100 @@ def test_run_all_mixed(client, monkeypatch):
     results = data["data"]
     assert len(results) == 4
     assert all("ok" in r for r in results)
+
+def test_file_mongo_stream_ndjson(client, monkeypatch):
+    from bson import encode
+    from bson.decimal128 import Decimal128
+    from db.mongo_adapter import _ndjson
+    from services import file_sql_service
+
+    seen = {}
+    class _StreamMongo:
+        def aggregate_ndjson(self, collection, pipeline, batch_size=500):
+            seen.update(collection=collection, pipeline=pipeline, batch_size=batch_size)
+            batches = [encode({"i": i, "amount": Decimal128("1.50")}) + encode({"i": i + 1}) for i in (0, 2)]
+            return _ndjson(batches + [b""])
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: _StreamMongo())
+    monkeypatch.setitem(flask_app.config, "MONGO_STREAM_MAX_ROWS", 5000)
+
+    resp = client.post("/db/file/mongo", json={"collection": "ledger_entries", "stream": True, "batch_size": 2,
+                                               "id": "query.ledger_entries.by_account_id",
+                                               "params": {"account_id": "100001", "limit": 99999}})
+    assert resp.status_code == 200 and resp.mimetype == "application/x-ndjson"
+    lines = [json.loads(x) for x in resp.get_data().splitlines()]
+    assert [r["i"] for r in lines] == [0, 1, 2, 3] and lines[0]["amount"] == "1.50"
+    assert seen["batch_size"] == 2 and seen["pipeline"][-1] == {"$limit": 5000}     # 스트리밍 상한으로 보정
+
+    bad = client.post("/db/file/mongo", json={"collection": "x", "id": "reset.data_and_sequences", "stream": True})
+    assert bad.status_code == 400
+
+def test_file_mongo_stream_find_template(client, monkeypatch, tmp_path):
+    from db.mongo_adapter import MongoAdapter
+    from bson import encode
+    from services import file_sql_service
+    from services.file_sql_service import TemplateRegistry
+
+    (tmp_path / "mongo").mkdir()
+    (tmp_path / "mongo" / "query.holds.by_status.json").write_text(
+        '{"find": {"status": {{status}}}, "projection": {"_id": 0}, "sort": {"created_at": 1}}', encoding="utf-8")
+    monkeypatch.setattr(file_sql_service, "templates", TemplateRegistry(tmp_path, reload_sec=0))
+
+    seen = {}
+    class _Cur:
+        def limit(self, n):
+            seen["limit"] = n
+            return [encode({"k": "a"}) + encode({"k": "b"}), encode({"k": "c"})]
+    class _Coll:
+        def find_raw_batches(self, query, projection, batch_size=0, **kw):
+            seen.update(query=query, projection=projection, batch_size=batch_size, **kw)
+            return _Cur()
+    mongo = MongoAdapter.__new__(MongoAdapter)
+    mongo.db = {"holds": _Coll()}
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: mongo)
+    monkeypatch.setitem(flask_app.config, "MONGO_STREAM_MAX_ROWS", 5000)
+
+    resp = client.post("/db/file/mongo", json={"collection": "holds", "stream": True, "batch_size": 2,
+                                               "id": "query.holds.by_status", "params": {"status": "1", "limit": 99999}})
+    assert resp.status_code == 200 and resp.mimetype == "application/x-ndjson"
+    assert [json.loads(x)["k"] for x in resp.get_data().splitlines()] == ["a", "b", "c"]
+    assert seen == {"query": {"status": "1"}, "projection": {"_id": 0}, "batch_size": 2,
+                    "sort": [("created_at", 1)], "limit": 5000}                 # 스트리밍 상한으로 보정
+
+    (tmp_path / "mongo" / "query.holds.bad.json").write_text('{"find": {"$where": "1"}}', encoding="utf-8")
+    file_sql_service.templates.refresh()
+    bad = client.post("/db/file/mongo", json={"collection": "holds", "id": "query.holds.bad", "stream": True})
+    assert bad.status_code == 400
+
+def test_file_sql_stream_ndjson_and_csv(client, monkeypatch):
+    from contextlib import contextmanager
+    from decimal import Decimal
+    from db.session import QuerySession
+    from services import file_sql_service
+
+    seen = {}
+    class _StreamRDB:
+        @contextmanager
+        def session(self, timeout_ms=None, readonly=False, isolation=None):
+            seen.update(timeout_ms=timeout_ms, readonly=readonly)
+            def stream(sql, params, chunk_rows):
+                seen["chunk_rows"] = chunk_rows
+                for i in range(0, 7, chunk_rows):
+                    yield [{"id": n, "amount": Decimal("1.5000"), "memo": "a,b"} for n in range(i, min(i + chunk_rows, 7))]
+            yield QuerySession(None, stream)
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: _StreamRDB())
+    monkeypatch.setitem(flask_app.config, "SQL_STREAM_MAX_ROWS", 5)
+    monkeypatch.setitem(flask_app.config, "SQL_STREAM_TIMEOUT_MS", 1234)
+
+    body = {"dbms": "mysql", "id": "query.ledger_entries.by_account_id", "params": {"account_id": 1},
+            "stream": True, "chunk_rows": 2}
+    resp = client.post("/db/file/sql", json=body)
+    assert resp.mimetype == "application/x-ndjson"
+    rows = [json.loads(x) for x in resp.get_data().splitlines()]
+    assert [r["id"] for r in rows] == [0, 1, 2, 3, 4] and rows[0]["amount"] == "1.5000"    # max_rows에서 중단
+    assert seen == {"timeout_ms": 1234, "readonly": True, "chunk_rows": 2}
+
+    resp = client.post("/db/file/sql", json={**body, "format": "csv"})
+    assert resp.mimetype == "text/csv"
+    assert resp.get_data(as_text=True).splitlines()[:2] == ["id,amount,memo", '0,1.5000,"a,b"']
+
+    assert client.post("/db/file/sql", json={**body, "format": "xml"}).status_code == 400
@@ -0,0 +1,43 @@
+# tests/test_fanout_service.py
+import threading
+import time
+
+from services import fanout_service
+
+def test_fanout_endpoint_partial_failure(monkeypatch):
+    from app import app
+    release = threading.Event()
+    seen = {}
+    def fake_sql(dbms, qid, params, timeout_ms=None):
+        seen[dbms] = timeout_ms
+        if dbms == "oracle":
+            release.wait(2)                             # 응답 기한(timeout_ms)보다 늦음
+        if dbms == "postgres":
+            raise RuntimeError("connection refused")
+        time.sleep(0.05)
+        return [{"balance": dbms}]
+    def fake_mongo(collection, qid, params, as_json=False, timeout_ms=None):
+        seen["mongo"] = (collection, timeout_ms)
+        time.sleep(0.05)
+        return [{"balance": 1}]
+    monkeypatch.setattr(fanout_service, "run_sql_file", fake_sql)
+    monkeypatch.setattr(fanout_service, "run_mongo_file", fake_mongo)
+
+    t0 = time.perf_counter()
+    with app.test_client() as c:
+        res = c.post("/db/file/fanout", json={"id": "query.accounts.all_balance",
+                                              "timeout_ms": {"oracle": 200}}).get_json()
+    elapsed = time.perf_counter() - t0
+    release.set()
+
+    assert res["ok"] and res["failed"] == ["postgres", "oracle"]
+    data = res["data"]
+    assert data["mysql"]["ok"] and data["mysql"]["data"] == [{"balance": "mysql"}]
+    assert data["postgres"] == {"ok": False, "error": "connection refused", "timeout": False}
+    assert data["oracle"]["timeout"] and "200 ms" in data["oracle"]["error"]
+    assert seen["mongo"] == ("accounts", 5000) and seen["oracle"] == 200
+    assert elapsed < 1.0                                # 합이 아니라 가장 늦은 기한만큼
+
+    with app.test_client() as c:
+        bad = c.post("/db/file/fanout", json={"id": "query.accounts.all_balance", "dbms": ["mysql", "db2"]})
+    assert bad.status_code == 400
@@ -0,0 +1,97 @@
+# tests/test_file_sql_service.py
+import os
+
+import pytest
+
+from services.file_sql_service import TemplateRegistry
+
+def _write(path, txt, mtime=None):
+    path.write_text(txt, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+def test_template_registry_compile_and_reload(tmp_path):
+    (tmp_path / "mysql").mkdir()
+    (tmp_path / "mongo").mkdir()
+    _write(tmp_path / "mysql" / "query.a.ok.sql", "-- timeout_ms=500 require_limit=1 readonly=0\nSELECT 1 LIMIT 1", 10**9)
+    _write(tmp_path / "mysql" / "query.a.bad.sql", "DELETE FROM a")
+    _write(tmp_path / "mongo" / "query.a.all.json", '[{"$match": {}}]')
+    _write(tmp_path / "mongo" / "query.a.by_id.json", '[{"$match": {"_id": {{id}}}}]')
+
+    reg = TemplateRegistry(tmp_path, reload_sec=0)
+    assert reg.refresh() == 4
+    assert reg.get("MYSQL", "query.a.ok")["meta"]["timeout_ms"] == 500
+    with pytest.raises(ValueError, match="readonly"):
+        reg.get("mysql", "query.a.bad")                     # 검증 오류는 사용 시점에
+    assert reg.get("mongo", "query.a.all")["parsed"] == [{"$match": {}}]
+    assert reg.get("mongo", "query.a.by_id")["params"] == ["id"] and "parsed" not in reg.get("mongo", "query.a.by_id")
+    for bad in ("../x", "query.a.none"):
+        with pytest.raises(ValueError):
+            reg.get("mysql", bad)
+
+    _write(tmp_path / "mysql" / "query.a.ok.sql", "SELECT 2", 2 * 10**9)
+    (tmp_path / "mongo" / "query.a.all.json").unlink()
+    assert reg.get("mysql", "query.a.ok")["text"].endswith("SELECT 1 LIMIT 1")   # reload_sec=0 → 자동 점검 없음
+    assert reg.refresh() == 1                                               # 바뀐 파일만
+    assert reg.get("mysql", "query.a.ok")["text"] == "SELECT 2"
+    assert [t["id"] for t in reg.list("mongo")] == ["query.a.by_id"]
+
+def test_templates_endpoint():
+    from app import app
+    with app.test_client() as c:
+        data = c.get("/db/templates?dbms=mongo").get_json()["data"]
+    ids = {t["id"]: t for t in data["templates"]}
+    assert ids["reset.data_and_sequences"]["kind"] == "operations" and not ids["reset.data_and_sequences"]["error"]
+    assert ids["query.accounts.by_account_id"]["params"] == ["account_id"]
+    assert all(t["dbms"] == "mongo" for t in data["templates"])
+
+def test_mongo_reset_template_rebuilds_indexes(monkeypatch):
+    from services import file_sql_service, mongo_tx_service
+    dropped, ensured = [], []
+    class _Mongo:
+        def drop_collection(self, coll): dropped.append(coll)
+        def update_many(self, coll, query, update): return 0
+        def delete_many(self, coll, query): return 0
+    svc = type("S", (), {"ensure_indexes": lambda _s, force=False: ensured.append(force)})()
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: _Mongo())
+    monkeypatch.setattr(mongo_tx_service, "get_mongo_tx_service", lambda: svc)
+
+    res = file_sql_service.run_mongo_file("", "reset.data_and_sequences", {})
+    assert "transactions" in dropped and res["executed"] == len(dropped) + 2
+    assert ensured == [True]
+
+def test_mongo_find_template(monkeypatch, tmp_path):
+    from services import file_sql_service
+    (tmp_path / "mongo").mkdir()
+    _write(tmp_path / "mongo" / "query.holds.open.json", '{"find": {"status": "1"}, "sort": {"_id": -1}}')
+    reg = TemplateRegistry(tmp_path, reload_sec=0)
+    monkeypatch.setattr(file_sql_service, "templates", reg)
+    assert reg.list("mongo")[0]["kind"] == "find" and reg.get("mongo", "query.holds.open")["parsed"]
+    seen = {}
+    class _Mongo:
+        def find(self, collection, query, projection=None, limit=100, **kw):
+            seen.update(collection=collection, query=query, limit=limit, **kw)
+            return [{"status": "1"}]
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: _Mongo())
+    assert file_sql_service.run_mongo_file("holds", "query.holds.open", {"limit": 5000}) == [{"status": "1"}]
+    assert seen == {"collection": "holds", "query": {"status": "1"}, "limit": 1000,      # 비스트리밍 상한
+                    "sort": [("_id", -1)], "max_time_ms": 3000}
+
+def test_accounts_templates_join_slots_only_when_enabled(monkeypatch):
+    from app import app
+    from services import file_sql_service
+    from services.result_cache import ResultCache
+    seen = []
+    class _Mongo:
+        def aggregate(self, collection, pipeline, **kw):
+            seen.append([next(iter(st)) for st in pipeline])
+            return []
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: _Mongo())
+    monkeypatch.setattr(file_sql_service, "result_cache", ResultCache(max_entries=0))
+    with app.app_context():
+        for slots in (0, 4):
+            monkeypatch.setitem(app.config, "MONGO_BALANCE_SLOTS", slots)
+            file_sql_service.run_mongo_file("accounts", "query.accounts.by_account_id", {"account_id": "100001"})
+            file_sql_service.run_mongo_file("accounts", "query.accounts.all_balance", {})
+    assert seen[0] == ["$match", "$project", "$limit"] and seen[1] == ["$group", "$project", "$limit"]
+    assert "$lookup" in seen[2] and "$unionWith" in seen[3]
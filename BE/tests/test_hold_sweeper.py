@@ -0,0 +1,49 @@
+# tests/test_hold_sweeper.py
+import pytest
+
+from services import hold_sweeper
+
+@pytest.fixture
+def holds(monkeypatch):
+    """OPEN hold 목록을 흉내: 해제되면 목록에서 빠진다"""
+    state = {"open": [f"k{i}" for i in range(5)], "scans": [], "broken": set()}
+
+    def stale(dbms, ttl_sec, limit):
+        state["scans"].append(limit)
+        return state["open"][:limit]
+
+    def release(dbms, key):
+        if key in state["broken"]:
+            raise RuntimeError("lock timeout")
+        state["open"].remove(key)
+        return {"status": "3", "result": "ALREADY_CAPTURED" if key == "k0" else "OK"}
+
+    monkeypatch.setattr(hold_sweeper, "_stale_keys", stale)
+    monkeypatch.setattr(hold_sweeper, "_release", release)
+    return state
+
+def test_sweep_batches_until_drained(holds):
+    rep = hold_sweeper.sweep("mysql", ttl_sec=60, batch_size=2, max_batches=10, pause_ms=0)
+    assert (rep["scanned"], rep["released"], rep["skipped"], rep["failed"]) == (5, 4, 1, 0)
+    assert rep["batches"] == 3 and holds["scans"] == [2, 2, 2]
+    assert holds["open"] == []
+
+def test_sweep_respects_max_batches_and_stops_without_progress(holds):
+    rep = hold_sweeper.sweep("mongo", batch_size=2, max_batches=1, pause_ms=0)
+    assert rep["batches"] == 1 and len(holds["open"]) == 3
+
+    holds["broken"].update(holds["open"])
+    rep = hold_sweeper.sweep("oracle", batch_size=2, max_batches=10, pause_ms=0)
+    assert rep["batches"] == 1 and rep["failed"] == 2      # 같은 키만 다시 조회되므로 중단
+    assert rep["errors"][0].startswith("k2: lock timeout")
+
+def test_sweep_rejects_unknown_dbms():
+    with pytest.raises(ValueError):
+        hold_sweeper.sweep("sqlite")
+
+def test_sweep_route(holds):
+    from app import app as flask_app
+    res = flask_app.test_client().post("/db/holds/sweep", json={"dbms": ["postgres"], "batch_size": 10,
+                                                                "pause_ms": 0})
+    assert res.status_code == 200
+    assert res.get_json()["data"]["postgres"]["released"] == 4
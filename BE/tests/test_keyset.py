@@ -0,0 +1,72 @@
+# tests/test_keyset.py
+import json
+from contextlib import contextmanager
+from decimal import Decimal
+
+import pytest
+from bson.objectid import ObjectId
+
+from services import file_sql_service
+from services.keyset import decode_cursor, encode_cursor, keyset_pipeline, keyset_sql
+
+def test_cursor_round_trip_keeps_types():
+    oid = ObjectId()
+    assert decode_cursor(encode_cursor(oid), mongo=True) == oid
+    assert decode_cursor(encode_cursor(Decimal("12.50"))) == Decimal("12.50")
+    assert decode_cursor(encode_cursor(42)) == 42 and decode_cursor(encode_cursor("100001")) == "100001"
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_keyset_sql_and_pipeline():
+    sql = "-- paginate=keyset key=entry_id\nSELECT * FROM t WHERE a = :a ORDER BY entry_id;\n"
+    assert keyset_sql("oracle", sql, "entry_id", after=True) == (
+        "SELECT * FROM (\n-- paginate=keyset key=entry_id\nSELECT * FROM t WHERE a = :a ORDER BY entry_id\n) ks "
+        "WHERE ks.entry_id > :ks_after ORDER BY ks.entry_id FETCH FIRST :ks_limit ROWS ONLY")
+    assert keyset_sql("mysql", "SELECT 1", "id", after=False).endswith(") ks ORDER BY ks.id LIMIT %(ks_limit)s")
+
+    p = [{"$match": {"a": 1}}, {"$sort": {"_id": 1}}, {"$project": {"x": 1}}]
+    assert keyset_pipeline(p, "_id", 5)[1] == {"$match": {"_id": {"$gt": 5}}}
+    assert keyset_pipeline(p, "_id", None) == p
+
+def test_page_sql_file_next_cursor(monkeypatch):
+    seen = []
+    class _RDB:
+        @contextmanager
+        def session(self, **kw):
+            class _S:
+                def execute_query(self, sql, binds):
+                    seen.append((sql, dict(binds)))
+                    start = binds.get("ks_after", 0)
+                    return [{"ENTRY_ID": i} for i in range(start + 1, min(start + binds["ks_limit"], 5) + 1)]
+            yield _S()
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: _RDB())
+
+    rows, nxt = file_sql_service.page_sql_file("postgres", "query.ledger_entries.by_account_id",
+                                               {"account_id": 1, "limit": 2})
+    assert [r["ENTRY_ID"] for r in rows] == [1, 2] and decode_cursor(nxt) == 2
+    assert seen[0][1] == {"account_id": 1, "ks_limit": 2}                  # limit은 바인드에서 제외
+    rows, nxt = file_sql_service.page_sql_file("postgres", "query.ledger_entries.by_account_id",
+                                               {"account_id": 1, "limit": 2}, nxt)
+    assert [r["ENTRY_ID"] for r in rows] == [3, 4] and "ks.entry_id > %(ks_after)s" in seen[1][0]
+    rows, nxt = file_sql_service.page_sql_file("postgres", "query.ledger_entries.by_account_id",
+                                               {"account_id": 1, "limit": 2}, nxt)
+    assert [r["ENTRY_ID"] for r in rows] == [5] and nxt is None
+    with pytest.raises(ValueError):
+        file_sql_service.page_sql_file("postgres", "query.accounts.all_balance", {})
+
+def test_file_mongo_cursor_endpoint(monkeypatch):
+    from app import app
+    ids = [ObjectId() for _ in range(3)]
+    seen = []
+    class _Mongo:
+        def aggregate_docs(self, collection, pipeline, **kw):
+            seen.append(pipeline)
+            return [{"_id": i, "account_id": "100001"} for i in ids[:2]]
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: _Mongo())
+    body = {"collection": "ledger_entries", "id": "query.ledger_entries.by_account_id",
+            "params": {"account_id": "100001", "limit": 2}}
+    with app.test_client() as c:
+        first = c.post("/db/file/mongo", json={**body, "cursor": None}).get_json()
+        assert [d["_id"] for d in first["data"]] == [str(i) for i in ids[:2]]
+        c.post("/db/file/mongo", json={**body, "cursor": first["next_cursor"]})
+    assert seen[1][1] == {"$match": {"_id": {"$gt": ids[1]}}} and seen[1][-1] == {"$limit": 2}
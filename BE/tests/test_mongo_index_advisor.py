@@ -0,0 +1,43 @@
+# tests/test_mongo_index_advisor.py
+import pytest
+
+from services.file_sql_service import collection_for, load_mongo_template, mongo_pipeline
+from services.mongo_index_advisor import suggest_indexes, summarize_explain
+
+def test_template_render_and_collection():
+    assert mongo_pipeline(load_mongo_template("query.accounts.by_account_id", {"account_id": "100001"}))[0][0] == \
+        {"$match": {"_id": "100001"}}
+    assert mongo_pipeline(load_mongo_template("query.ledger_entries.by_account_id", {"account_id": "100001"}))[0][0] == \
+        {"$match": {"account_id": "100001"}}
+    assert collection_for("query.ledger_entries.by_name") == "ledger_entries"
+    with pytest.raises(ValueError):
+        collection_for("reset.data_and_sequences")
+
+def test_suggest_indexes_esr_and_lookup():
+    ledger, meta = mongo_pipeline(load_mongo_template("query.ledger_entries.by_account_id", {"account_id": "100001"}))
+    assert meta == {"paginate": "keyset", "key": "_id"}
+    assert suggest_indexes(ledger) == [{"collection": None, "keys": [("account_id", 1), ("_id", 1)]}]
+
+    by_id = load_mongo_template("query.accounts.by_account_id", {"account_id": "100001"})
+    assert suggest_indexes(mongo_pipeline(by_id)[0]) == []                      # 기본: accounts 문서만
+    assert suggest_indexes(mongo_pipeline(by_id, slots=True)[0]) == \
+        [{"collection": "account_slots", "keys": [("account_id", 1)]}]
+
+    ranged = [{"$match": {"status": "1", "created_at": {"$lt": 5}}}, {"$sort": {"created_at": 1}}]
+    assert suggest_indexes(ranged)[0]["keys"] == [("status", 1), ("created_at", 1)]
+
+def test_summarize_explain():
+    explain = {
+        "stages": [
+            {"$cursor": {
+                "queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "COLLSCAN"}},
+                                 "rejectedPlans": [{"stage": "IXSCAN", "indexName": "unused"}]},
+                "executionStats": {"nReturned": 3, "totalDocsExamined": 500, "totalKeysExamined": 0},
+            }},
+            {"$lookup": {}, "totalDocsExamined": 3, "collectionScans": 0, "indexesUsed": ["account_id_1"]},
+        ]
+    }
+    s = summarize_explain(explain)
+    assert s["collscan"] is True
+    assert s["indexes_used"] == ["account_id_1"]
+    assert (s["docs_examined"], s["keys_examined"]) == (503, 0)
@@ -0,0 +1,410 @@
+# tests/test_mongo_tx_service.py
+import pytest
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from services.mongo_tx_service import _idem_insert, _ledger_pair
+
+class _Res:
+    def __init__(self, upserted_id): self.upserted_id = upserted_id
+
+class _FakeCol:
+    """unique_filter 기준 upsert/insert만 흉내 (호출 수 = 왕복 수)"""
+    def __init__(self):
+        self.docs, self.calls = [], 0
+    def _find(self, f):
+        return next((d for d in self.docs if all(d.get(k) == v for k, v in f.items())), None)
+    def update_one(self, f, update, upsert=False, session=None):
+        self.calls += 1
+        if self._find(f):
+            return _Res(None)
+        self.docs.append({**f, **update["$setOnInsert"]})
+        return _Res(len(self.docs))
+    def bulk_write(self, ops, ordered=True, session=None):
+        self.calls += 1
+        for op in ops:
+            f, update = op._filter, op._doc
+            if not self._find(f):
+                self.docs.append({**f, **update["$setOnInsert"]})
+
+def test_idem_insert_single_round_trip():
+    col = _FakeCol()
+    assert _idem_insert(col, {"idempotency_key": "k", "status": "1"}, {"idempotency_key": "k"}) == (True, "CREATED")
+    assert _idem_insert(col, {"idempotency_key": "k", "status": "9"}, {"idempotency_key": "k"}) == (False, "ALREADY")
+    assert col.calls == 2
+    assert col.docs == [{"idempotency_key": "k", "status": "1"}]
+
+def test_idem_insert_race_is_already():
+    class _Racing(_FakeCol):
+        def update_one(self, *a, **kw):
+            raise DuplicateKeyError("E11000")
+    assert _idem_insert(_Racing(), {"k": 1, "x": 2}, {"k": 1}) == (False, "ALREADY")
+
+def test_ledger_pair_is_idempotent():
+    col = _FakeCol()
+    entries = [{"txn_id": 1, "account_id": "a", "amount": -5, "created_at": 1},
+               {"txn_id": 1, "account_id": "b", "amount": 5, "created_at": 1}]
+    _ledger_pair(col, entries)
+    _ledger_pair(col, [{**e, "created_at": 2} for e in entries])     # 재시도 → 기존 분개 유지
+    assert col.calls == 2
+    assert [d["created_at"] for d in col.docs] == [1, 1]
+
+    class _Racing(_FakeCol):
+        def bulk_write(self, ops, ordered=True, session=None):
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": 11000}]})
+    _ledger_pair(_Racing(), entries)     # 동시 upsert 경합은 무시
+
+    class _Broken(_FakeCol):
+        def bulk_write(self, ops, ordered=True, session=None):
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": 121}]})
+    with pytest.raises(BulkWriteError):
+        _ledger_pair(_Broken(), entries)
+
+class _FakeSession:
+    def __init__(self): self.txn_kwargs = None
+    def __enter__(self): return self
+    def __exit__(self, *a): pass
+    def with_transaction(self, cb, **kw):
+        self.txn_kwargs = kw
+        return cb(self)
+
+class _FakeClient:
+    def __init__(self, set_name):
+        self.session = _FakeSession()
+        self.admin = type("A", (), {"command": lambda _s, cmd: {"setName": set_name}})()
+    def start_session(self): return self.session
+
+class _FakeMongo:
+    def __init__(self, set_name="rs0"):
+        self.client = _FakeClient(set_name)
+        self.db = type("DB", (), {"__getattr__": lambda _s, n: _FakeCol()})()
+
+def test_engine_selection_and_transaction_boundary():
+    from services.mongo_tx_service import (MongoTxService, MongoTxTransactionalService,
+                                           build_mongo_tx_service)
+    assert type(build_mongo_tx_service("idempotent", _FakeMongo())) is MongoTxService
+    with pytest.raises(ValueError):
+        build_mongo_tx_service("nope", _FakeMongo())
+    with pytest.raises(RuntimeError):
+        build_mongo_tx_service("transaction", _FakeMongo(set_name=None))
+
+    svc = build_mongo_tx_service("TRANSACTION", mongo := _FakeMongo())
+    assert isinstance(svc, MongoTxTransactionalService)
+    seen = []
+    assert svc._run(lambda body, s: seen.append(s) or "done", {}) == "done"
+    assert seen == [mongo.client.session]
+    assert mongo.client.session.txn_kwargs["write_concern"].document == {"w": "majority"}
+
+class _SlotCol:
+    """조건부 $inc 결과만 흉내: full=True면 임의 슬롯 시도 실패"""
+    def __init__(self, full=False, fallback=None):
+        self.full, self.fallback, self.calls = full, fallback, []
+    def update_one(self, f, update, upsert=False, session=None):
+        self.calls.append(("update_one", f, update, upsert))
+        return type("R", (), {"modified_count": 0 if self.full else 1})()
+    def find_one_and_update(self, f, update, projection=None, session=None):
+        self.calls.append(("find_one_and_update", f, update))
+        return self.fallback
+
+def test_balance_slots_pick_and_fallback():
+    from bson.decimal128 import Decimal128
+    from services.mongo_tx_service import MongoTxService, _split_evenly
+    assert _split_evenly(100, 3) == [34, 33, 33]
+
+    svc = MongoTxService(_FakeMongo(), balance_slots=4, hot_accounts=["100001"])
+    amt = Decimal128("10")
+
+    svc.SLOTS = _SlotCol()
+    ok, slot = svc._hold_funds("100001", amt)
+    assert ok and svc.SLOTS.calls[0][1]["_id"] == f"100001:{slot}"
+
+    svc.SLOTS = _SlotCol(full=True, fallback={"slot": 2})          # 임의 슬롯 잔액 부족 → 다른 슬롯
+    assert svc._hold_funds("100001", amt) == (True, 2)
+    assert svc.SLOTS.calls[1][1]["account_id"] == "100001"
+    svc.SLOTS, svc.ACC = _SlotCol(full=True), _SlotCol(full=True)
+    assert svc._hold_funds("100001", amt) == (False, None)
+    assert svc.ACC.calls[0][1]["_id"] == "100001"                    # 슬롯이 다 안 되면 accounts 문서까지
+    svc.ACC = _SlotCol()                                            # 슬롯 없이 리셋된 잔액 (file 템플릿 등)
+    assert svc._hold_funds("100001", amt) == (True, None)
+    assert svc._debit("100001", amt) == (True, None) and svc.ACC.calls[-1][1]["_id"] == "100001"
+
+    svc.ACC = _SlotCol()                                            # hot 아님 → accounts 문서
+    assert svc._hold_funds("100002", amt) == (True, None)
+    svc._capture_hold("100002", amt, None)
+    assert [c[1]["_id"] for c in svc.ACC.calls] == ["100002", "100002"]
+
+    svc.SLOTS = _SlotCol()
+    svc._credit("100001", amt)
+    _, f, update, upsert = svc.SLOTS.calls[0]
+    assert upsert and update["$setOnInsert"]["account_id"] == "100001"
+    assert not MongoTxService(_FakeMongo(), balance_slots=1, hot_accounts=["100001"])._slotted("100001")
+
+def test_durability_profiles():
+    from services.mongo_tx_service import parse_durability
+    assert parse_durability(None) == {}
+    bench = parse_durability("bench")
+    assert bench["ledger"].document == {"w": 1, "j": False}
+    mixed = parse_durability("BENCH, ledger=safe, txn=default")
+    assert mixed["ledger"].document == {"w": "majority", "j": True}
+    assert mixed["hold"].document == {"w": 1, "j": False} and "txn" not in mixed
+    for bad in ("fast", "bench,ledger=fast", "bench,index=safe"):
+        with pytest.raises(ValueError):
+            parse_durability(bad)
+
+def test_durability_variant_binds_collections():
+    from services.mongo_tx_service import MongoTxService, MongoTxTransactionalService
+
+    class _WCCol(_FakeCol):
+        write_concern = None
+        def with_options(self, write_concern=None):
+            col = _WCCol()
+            col.write_concern = write_concern
+            return col
+
+    class _WCMongo(_FakeMongo):
+        def __init__(self, set_name="rs0"):
+            super().__init__(set_name)
+            self.db = type("DB", (), {"__getattr__": lambda _s, n: _WCCol()})()
+
+    svc = MongoTxService(_WCMongo())
+    assert svc.LEDGER.write_concern is None
+    v = svc.with_durability("Bench,ledger=safe")
+    assert v is svc.with_durability("bench,ledger=safe") and svc.with_durability("default") is svc
+    assert v.LEDGER.write_concern.document == {"w": "majority", "j": True}
+    assert v.ACC.write_concern.document == {"w": 1, "j": False}
+
+    seen = []
+    v._remittance_release = lambda body, s: seen.append(body) or "ok"
+    svc._variants["bench,ledger=safe"] = v
+    assert svc.remittance_release({"idempotency_key": "k", "durability": "bench,ledger=safe"}) == "ok"
+
+    tx = MongoTxTransactionalService(_WCMongo(), durability="bench")
+    assert tx.LEDGER.write_concern is None                        # 트랜잭션 안에서는 커밋에만 적용
+    tx._run(lambda body, s: None, {})
+    assert tx.client.session.txn_kwargs["write_concern"].document == {"w": 1, "j": False}
+
+def test_amount_codec_modes():
+    from decimal import Decimal
+    from bson.decimal128 import Decimal128
+    from bson.int64 import Int64
+    from services.mongo_tx_service import AmountCodec
+
+    i = AmountCodec("INT64")
+    assert i.encode("12.3456") == Int64(123456) and isinstance(i.encode(1), Int64)
+    assert i.coerce(Decimal128("1.5")) == 15000 and i.coerce(7) == Int64(7)   # 마이그레이션 전 문서 호환
+    assert i.neg(i.encode("2")) == -20000 and i.to_decimal(Int64(15000)) == Decimal("1.5")
+    with pytest.raises(ValueError):
+        i.encode("0.00001")
+
+    d = AmountCodec()
+    assert d.encode("1.5") == Decimal128("1.5") and d.coerce(Int64(15000)).to_decimal() == Decimal("1.5")
+    assert d.neg(d.encode("2")).to_decimal() == Decimal("-2") and d.zero() == Decimal128("0")
+    with pytest.raises(ValueError):
+        AmountCodec("float")
+
+def test_amount_validators_accept_codec_types():
+    # DB/Mongodb/table/*.js 검증기 ↔ AmountCodec 저장 타입 (int64 모드 쓰기가 DocumentValidationFailure 나지 않게)
+    import re
+    from pathlib import Path
+    from bson.decimal128 import Decimal128
+    from bson.int64 import Int64
+    from services.mongo_tx_service import AmountCodec
+    from scripts.migrate_mongo_amounts import AMOUNT_BSON_TYPES, AMOUNT_FIELDS
+
+    bson_alias = {Decimal128: "decimal", Int64: "long"}
+    stored = {bson_alias[type(AmountCodec(m).encode("1.5"))] for m in AmountCodec.MODES}
+    assert stored == set(AMOUNT_BSON_TYPES)
+
+    ddl_dir = Path(__file__).resolve().parents[2] / "DB" / "Mongodb" / "table"
+    checked = 0
+    for coll, fields in AMOUNT_FIELDS.items():
+        path = ddl_dir / f"{coll}.js"
+        if not path.exists():                                  # account_slots: 검증기 없음
+            continue
+        ddl = path.read_text(encoding="utf-8")
+        for f in fields:
+            m = re.search(rf"\b{f}:\s*\{{\s*bsonType:\s*(\[[^\]]*\]|\"\w+\")", ddl)
+            assert m, f"{coll}.{f}"
+            assert stored <= set(re.findall(r"\"(\w+)\"", m.group(1))), f"{coll}.{f}: {m.group(1)}"
+            checked += 1
+    assert checked == 5
+
+def test_migrate_widens_decimal_only_validator():
+    from scripts.migrate_mongo_amounts import widen_validators
+
+    def schema(t):
+        return {"$jsonSchema": {"properties": {"amount": {"bsonType": t}, "status": {"bsonType": "string"}}}}
+    class _DB:
+        def __init__(self):
+            self.validators = {"holds": schema("decimal"), "transactions": schema(["decimal", "long"])}
+            self.commands = []
+        def list_collections(self, filter):
+            v = self.validators.get(filter["name"])
+            return iter([{"name": filter["name"], "options": {"validator": v}}] if v else [])
+        def command(self, *args, **kw):
+            self.commands.append((args, kw))
+
+    db = _DB()
+    assert widen_validators(db, dry_run=True) == [("holds", ["amount"])] and db.commands == []
+    assert widen_validators(db) == [("holds", ["amount"])]
+    (cmd, coll), kw = db.commands[0]
+    assert (cmd, coll) == ("collMod", "holds")
+    assert kw["validator"]["$jsonSchema"]["properties"]["amount"]["bsonType"] == ["decimal", "long"]
+    assert db.validators["holds"]["$jsonSchema"]["properties"]["amount"]["bsonType"] == "decimal"   # 원본 불변
+
+class _MemCol:
+    """메모리 컬렉션: 같음/$ne/$gte 필터, $set/$inc/$setOnInsert, upsert. fail에 든 메서드는 AutoReconnect"""
+    def __init__(self, docs=(), fail=()):
+        self.docs = [dict(d) for d in docs]
+        self.fail = set(fail)
+    def _check(self, op):
+        if op in self.fail:
+            from pymongo.errors import AutoReconnect
+            raise AutoReconnect(f"{op} failed")
+    @staticmethod
+    def _match(d, f):
+        for k, v in f.items():
+            cur = d.get(k)
+            if isinstance(v, dict):
+                if "$ne" in v and cur == v["$ne"]:
+                    return False
+                if "$gte" in v and (cur is None or cur < v["$gte"]):
+                    return False
+            elif cur != v:
+                return False
+        return True
+    def _first(self, f):
+        return next((d for d in self.docs if self._match(d, f)), None)
+    def _upsert(self, f, update, upsert):
+        from bson.objectid import ObjectId
+        d, inserted = self._first(f), False
+        if d is None:
+            if not upsert:
+                return None, False
+            d = {k: v for k, v in f.items() if not isinstance(v, dict)}
+            d.setdefault("_id", ObjectId())
+            d.update(update.get("$setOnInsert", {}))
+            self.docs.append(d)
+            inserted = True
+        d.update(update.get("$set", {}))
+        for k, v in update.get("$inc", {}).items():
+            d[k] = d.get(k, 0) + v
+        return d, inserted
+    def find_one(self, f, projection=None, session=None):
+        self._check("find_one")
+        d = self._first(f)
+        return dict(d) if d else None
+    def find_one_and_update(self, f, update, projection=None, upsert=False, return_document=False, session=None):
+        self._check("find_one_and_update")
+        before = self._first(f)
+        before = dict(before) if before else None
+        d, _ = self._upsert(f, update, upsert)
+        return dict(d) if d is not None and return_document else before
+    def update_one(self, f, update, upsert=False, session=None):
+        self._check("update_one")
+        d, inserted = self._upsert(f, update, upsert)
+        return type("R", (), {"modified_count": int(d is not None and not inserted),
+                              "upserted_id": d["_id"] if inserted else None})()
+    def bulk_write(self, ops, ordered=True, session=None):
+        self._check("bulk_write")
+        for op in ops:
+            self._upsert(op._filter, op._doc, op._upsert)
+    def delete_one(self, f, session=None):
+        self._check("delete_one")
+        d = self._first(f)
+        if d is not None:
+            self.docs.remove(d)
+
+def _mem_service(balance=100, hold_amount=10, hold_status="1", **fail):
+    """int64 모드 서비스 + 메모리 컬렉션 (계좌 A→B, 금액 10, hold 1건). fail: {컬렉션: {메서드...}}"""
+    from bson.int64 import Int64
+    from services.mongo_tx_service import MongoTxService
+    svc = MongoTxService(_FakeMongo(), amount_mode="int64")
+    svc.ACC = _MemCol([{"_id": "A", "balance": Int64(balance), "hold_amount": Int64(hold_amount)},
+                       {"_id": "B", "balance": Int64(0), "hold_amount": Int64(0)}], fail.get("ACC", ()))
+    svc.TXN = _MemCol([{"_id": 1, "idempotency_key": "k", "status": "1", "src_account_id": "A",
+                        "dst_account_id": "B", "amount": Int64(10)}], fail.get("TXN", ()))
+    svc.HOLD = _MemCol([{"idempotency_key": "k", "status": hold_status, "account_id": "A", "amount": Int64(10)}]
+                       if hold_status else [], fail.get("HOLD", ()))
+    svc.LEDGER = _MemCol(fail=fail.get("LEDGER", ()))
+    return svc
+
+def _status(svc):
+    return svc.TXN.docs[0]["status"]
+
+def test_txn_status_written_after_dependent_writes():
+    from pymongo.errors import AutoReconnect
+    ok = _mem_service()
+    assert ok.transfer_confirm_internal({"idempotency_key": "k"}) == {"status": "2", "result": "OK"}
+    assert _status(ok) == "2" and len(ok.LEDGER.docs) == 2
+    assert (ok.ACC.docs[0]["balance"], ok.ACC.docs[0]["hold_amount"], ok.ACC.docs[1]["balance"]) == (90, 0, 10)
+
+    for method, kw in (("transfer_confirm_internal", {"LEDGER": {"bulk_write"}}),
+                       ("confirm_debit_local", {"LEDGER": {"bulk_write"}}),
+                       ("confirm_credit_local", {"ACC": {"update_one"}})):
+        svc = _mem_service(**kw)
+        with pytest.raises(AutoReconnect):
+            getattr(svc, method)({"idempotency_key": "k"})
+        assert _status(svc) == "1", method                  # 분개/잔액이 빠졌으면 확정으로 안 보임
+        assert _balances(svc) == [(100, 10), (0, 0)] and svc.LEDGER.docs == [], method    # 앞 단계 원복
+
+def test_transfer_credit_failure_leaves_no_ledger_and_restores_debit(monkeypatch):
+    from pymongo.errors import AutoReconnect
+    for hold_status in ("1", None):                                # 보류 확정 / 보류 없는 이체
+        svc = _mem_service(hold_amount=10 if hold_status else 0, hold_status=hold_status)
+        def credit(acct, amt, s=None):
+            raise AutoReconnect("credit failed")
+        monkeypatch.setattr(svc, "_credit", credit)
+        with pytest.raises(AutoReconnect):
+            svc.transfer_confirm_internal({"idempotency_key": "k"})
+        assert svc.LEDGER.docs == [] and _status(svc) == "1"     # 입금 전에는 분개를 쓰지 않음
+        assert _balances(svc) == [(100, 10 if hold_status else 0), (0, 0)]
+        assert [d["status"] for d in svc.HOLD.docs] == ([hold_status] if hold_status else [])
+
+        monkeypatch.undo()
+        assert svc.transfer_confirm_internal({"idempotency_key": "k"}) == {"status": "2", "result": "OK"}
+        assert _balances(svc) == [(90, 0), (10, 0)] and len(svc.LEDGER.docs) == 2
+
+def _balances(svc):
+    return [(d["balance"], d["hold_amount"]) for d in svc.ACC.docs]
+
+@pytest.mark.parametrize("method,fail,hold_after", [
+    ("confirm_debit_local", {"ACC": {"update_one"}}, "1"),            # 잔액 $inc 예외
+    ("confirm_debit_local", {"TXN": {"find_one"}}, "1"),              # 선점과 같이 보낸 txn 조회 예외
+    ("transfer_confirm_internal", {"ACC": {"update_one"}}, "1"),
+    ("remittance_release", {"ACC": {"update_one"}}, "1"),
+])
+def test_claim_undone_on_exception_and_retry_succeeds(method, fail, hold_after):
+    from pymongo.errors import AutoReconnect
+    svc = _mem_service(**fail)
+    with pytest.raises(AutoReconnect):
+        getattr(svc, method)({"idempotency_key": "k"})
+    assert svc.HOLD.docs[0]["status"] == hold_after and _status(svc) == "1"
+    assert _balances(svc) == [(100, 10), (0, 0)]                       # hold_amount 그대로 예약 (정리 대상 유지)
+
+    for col in (svc.ACC, svc.TXN):                                     # 장애 복구 후 재시도
+        col.fail.clear()
+    res = getattr(svc, method)({"idempotency_key": "k"})
+    assert res["result"] == "OK"
+    if method == "remittance_release":
+        assert svc.HOLD.docs[0]["status"] == "3" and _balances(svc) == [(100, 0), (0, 0)]
+    else:
+        assert svc.HOLD.docs[0]["status"] == "2" and svc.ACC.docs[0]["balance"] == 90
+
+def test_credit_marker_removed_on_exception_and_retry_succeeds():
+    from pymongo.errors import AutoReconnect
+    svc = _mem_service(ACC={"update_one"})
+    with pytest.raises(AutoReconnect):
+        svc.confirm_credit_local({"idempotency_key": "k"})
+    assert svc.LEDGER.docs == [] and _status(svc) == "1"
+
+    svc.ACC.fail.clear()
+    assert svc.confirm_credit_local({"idempotency_key": "k"})["result"] == "OK"
+    assert svc.confirm_credit_local({"idempotency_key": "k"})["result"] == "ALREADY_POSTED"
+    assert svc.ACC.docs[1]["balance"] == 10 and len(svc.LEDGER.docs) == 1    # 입금은 1번만
+
+def test_claim_not_undone_inside_transaction():
+    from pymongo.errors import AutoReconnect
+    svc = _mem_service(ACC={"update_one"})
+    with pytest.raises(AutoReconnect):
+        svc._confirm_debit_local({"idempotency_key": "k"}, s=object())     # 트랜잭션 엔진은 롤백에 맡김
+    assert svc.HOLD.docs[0]["status"] == "2"
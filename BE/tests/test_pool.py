@@ -0,0 +1,170 @@
+# tests/test_pool.py
+import threading
+import time
+import pytest
+
+from db.pool import ConnectionPool, PoolTimeout
+
+class _FakeConn:
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+    def close(self):
+        self.closed = True
+
+def _ping(c):
+    if not c.alive:
+        raise RuntimeError("gone")
+
+def _pool(**kw):
+    made = []
+    def factory():
+        c = _FakeConn()
+        made.append(c)
+        return c
+    kw.setdefault("min_size", 1)
+    kw.setdefault("max_size", 2)
+    kw.setdefault("wait_timeout_sec", 0.2)
+    return ConnectionPool(factory, ping=_ping, **kw), made
+
+def test_reuses_released_connection():
+    pool, made = _pool()
+    with pool.connection() as c1:
+        pass
+    with pool.connection() as c2:
+        pass
+    assert c1 is c2
+    assert len(made) == 1
+    assert pool.stats()["idle"] == 1
+
+def test_warmup_fills_min_size():
+    pool, made = _pool(min_size=2, max_size=4)
+    with pool.connection():
+        assert pool.stats()["open"] == 2
+    assert len(made) == 2
+
+def test_bounded_wait_times_out():
+    pool, _ = _pool(max_size=1)
+    conn = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.stats()["timeouts"] == 1
+
+def test_waiter_gets_released_connection():
+    pool, made = _pool(max_size=1, wait_timeout_sec=2)
+    conn = pool.acquire()
+    got = []
+    t = threading.Thread(target=lambda: got.append(pool.acquire()))
+    t.start()
+    time.sleep(0.05)
+    pool.release(conn)
+    t.join(1)
+    assert got == [conn]
+    assert len(made) == 1
+
+def test_pre_ping_evicts_dead_connection():
+    pool, made = _pool()
+    with pool.connection() as c1:
+        pass
+    c1.alive = False
+    with pool.connection() as c2:
+        pass
+    assert c2 is not c1 and c1.closed
+    assert pool.stats()["broken"] == 1
+
+def test_idle_recycle():
+    pool, made = _pool(idle_recycle_sec=0.01)
+    with pool.connection() as c1:
+        pass
+    time.sleep(0.03)
+    with pool.connection() as c2:
+        pass
+    assert c2 is not c1 and c1.closed
+    assert pool.stats()["recycled"] == 1
+
+def test_broken_connection_is_not_returned():
+    pool, made = _pool(is_broken=lambda c, e: isinstance(e, ConnectionError))
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("sql error")
+    assert pool.stats()["idle"] == 1
+    with pytest.raises(ConnectionError):
+        with pool.connection() as c:
+            raise ConnectionError("lost")
+    assert c.closed
+    assert pool.stats()["open"] == 0
+
+
+# ───── PostgresAdapter 풀 연결 (ping / reset / is_broken) ─────
+class _FakePgCursor:
+    def __init__(self, conn): self.conn = conn
+    def __enter__(self): return self
+    def __exit__(self, *a): pass
+    description = None
+    rowcount = 0
+    def execute(self, sql, params=()):
+        if self.conn.server_gone:
+            self.conn.closed = 2                       # psycopg2: 서버가 끊으면 실행 시점에 closed
+            import psycopg2
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.executed.append((sql, self.conn.autocommit))
+
+class _FakePgConn:
+    def __init__(self):
+        import psycopg2.extensions as ext
+        self.closed, self.autocommit, self.server_gone = 0, False, False
+        self.status, self.executed, self.rollbacks = ext.TRANSACTION_STATUS_IDLE, [], 0
+    def get_transaction_status(self): return self.status
+    def cursor(self, cursor_factory=None): return _FakePgCursor(self)
+    def rollback(self):
+        import psycopg2.extensions as ext
+        self.rollbacks += 1
+        self.status = ext.TRANSACTION_STATUS_IDLE
+    def commit(self): pass
+    def close(self): self.closed = 1
+    def __enter__(self): return self
+    def __exit__(self, *a): pass
+
+@pytest.fixture
+def pg(monkeypatch):
+    from db import postgres_adapter
+    from db.pool import drop_shared_pool
+    made = []
+    monkeypatch.setattr(postgres_adapter.psycopg2, "connect", lambda **kw: made.append(_FakePgConn()) or made[-1])
+    cfg = {"host": "pool-test", "port": 0, "user": "u", "password": "", "db": "t"}
+    a = postgres_adapter.PostgresAdapter(cfg, {"min_size": 0, "max_size": 2})
+    yield a, made
+    a.close()
+    drop_shared_pool(("postgres", "pool-test", 0, "u", "t"))
+
+def test_pg_pool_checkout_return_and_ping_round_trip(pg):
+    a, made = pg
+    a.execute_query("SELECT 2")
+    a.execute_query("SELECT 3")
+    assert len(made) == 1 and a.stats()["pool"]["idle"] == 1
+    # 두 번째 체크아웃에서 pre_ping: autocommit으로 SELECT 1 (트랜잭션 없이) 후 원래 값 복구
+    assert made[0].executed == [("SELECT 2", False), ("SELECT 1", True), ("SELECT 3", False)]
+    assert made[0].autocommit is False and a.stats()["round_trips"]["ping"]["calls"] == 1
+
+def test_pg_pool_rollback_on_release(pg):
+    import psycopg2.extensions as ext
+    a, made = pg
+    with a._conn() as conn:
+        conn.status = ext.TRANSACTION_STATUS_INTRANS      # 트랜잭션이 열린 채 반납
+    assert made[0].rollbacks == 1 and a.stats()["pool"]["idle"] == 1
+
+def test_pg_pool_evicts_server_disconnect(pg):
+    import psycopg2
+    a, made = pg
+    a.execute_query("SELECT 1")
+    made[0].server_gone = True                        # idle 중 서버가 끊음: 로컬 상태는 정상
+    a.execute_query("SELECT 2")                       # pre_ping 왕복에서 걸러져 새 커넥션으로
+    assert len(made) == 2 and made[1].executed[-1] == ("SELECT 2", False)
+    assert a.stats()["pool"]["broken"] == 1
+
+    with pytest.raises(psycopg2.OperationalError):
+        with a._conn() as conn, conn.cursor() as cur:  # 사용 중 끊김 → is_broken으로 폐기
+            conn.server_gone = True
+            cur.execute("SELECT 3")
+    assert a.stats()["pool"]["broken"] == 2 and a.stats()["pool"]["open"] == 0
@@ -0,0 +1,125 @@
+# tests/test_proc_service.py
+import pytest
+
+from db import router
+from db.signatures import ProcParam, ProcSignature, SignatureCache
+from services.proc_service import exec_proc
+
+HOLD_SIG = ProcSignature("sp_remittance_hold", "proc", (
+    ProcParam("p_src", "IN", "bigint"),
+    ProcParam("p_amount", "IN", "decimal"),
+    ProcParam("P_TXN_ID", "OUT", "number"),
+    ProcParam("p_status", "OUT", "varchar2"),
+))
+
+class _FakeOracle:
+    def __init__(self):
+        self.calls = []
+        self.loads = 0
+        self._sigs = SignatureCache()
+    def _load(self, name):
+        self.loads += 1
+        return HOLD_SIG
+    def signature(self, name):
+        return self._sigs.get(name, self._load)
+    def call_procedure(self, name, params=None, out_count=0, out_types=None):
+        self.calls.append((name, params, out_count, out_types))
+        return {"out": [7, "1"], "all": params}
+
+@pytest.fixture
+def oracle():
+    fake = _FakeOracle()
+    router.set_adapter("oracle", fake)
+    yield fake
+    router.set_adapter("oracle", None)
+
+def test_signature_derived_values():
+    assert HOLD_SIG.in_count == 2
+    assert HOLD_SIG.out_names == ("txn_id", "status")
+    assert HOLD_SIG.bind_args([1, "10"]) == [1, "10", None, None]
+    with pytest.raises(ValueError):
+        HOLD_SIG.bind_args([1])
+
+def test_exec_proc_uses_cached_signature(oracle):
+    for _ in range(2):
+        res = exec_proc({"dbms": "oracle", "name": "sp_remittance_hold", "args": [1, "10"]})
+        assert res == {"txn_id": 7, "status": "1"}
+    assert oracle.loads == 1
+    assert oracle.calls[0] == ("sp_remittance_hold", [1, "10", None, None], 2, ["number", "varchar2"])
+
+def test_exec_proc_legacy_payload(oracle):
+    res = exec_proc({"dbms": "oracle", "name": "sp_x", "args": [1, None], "out_count": 1,
+                     "out_types": ["NUMBER"], "out_names": ["txn_id"]})
+    assert res == {"txn_id": 7}
+    assert oracle.loads == 0
+
+def test_signature_cache_invalidate():
+    cache = SignatureCache()
+    cache.get("MDBS.sp_x", lambda n: HOLD_SIG)
+    assert cache.invalidate("mdbs.SP_X") == 1
+    assert cache.invalidate() == 0
+
+def test_proc_batch_keeps_order_and_errors(oracle):
+    from app import app as flask_app
+    client = flask_app.test_client()
+    items = [
+        {"dbms": "oracle", "name": "sp_remittance_hold", "args": [1, "10"]},
+        {"dbms": "sqlite", "name": "x"},
+        {"dbms": "oracle", "name": "sp_remittance_hold", "args": [1]},
+    ]
+    res = client.post("/db/proc/batch", json={"items": items})
+    assert res.status_code == 200
+    data = res.get_json()["data"]
+    assert data[0] == {"ok": True, "data": {"txn_id": 7, "status": "1"}}
+    assert data[1]["ok"] is False and "Unsupported" in data[1]["error"]
+    assert data[2]["ok"] is False and "expected 2 IN args" in data[2]["error"]
+    assert client.post("/db/proc/batch", json={"items": []}).status_code == 400
+
+def test_signature_inout_and_interleaved_out():
+    sig = ProcSignature("sp_y", "proc", (
+        ProcParam("p_a", "IN", "int"),
+        ProcParam("p_b", "INOUT", "int"),
+        ProcParam("p_c", "OUT", "int"),
+        ProcParam("p_d", "IN", "int"),
+    ))
+    assert (sig.in_count, sig.out_count, sig.out_names) == (3, 2, ("b", "c"))
+    assert sig.bind_args([1, 2, 4]) == [1, 2, None, 4]            # 선언 순서, 인자 자리 = 파라미터 수
+    assert not sig.tail_outs and HOLD_SIG.tail_outs
+
+def test_exec_proc_rejects_non_trailing_outs(oracle):
+    sig = ProcSignature("sp_y", "proc", (ProcParam("p_a", "OUT", "number"), ProcParam("p_b", "IN", "number")))
+    oracle._sigs.put("sp_y", sig)
+    with pytest.raises(ValueError, match="follow IN"):
+        exec_proc({"dbms": "oracle", "name": "sp_y", "args": [1]})
+    assert oracle.calls == []
+
+def test_exec_pg_procedure_maps_out_row():
+    from contextlib import contextmanager
+    from db.metrics import RoundTripCounter
+    from db.postgres_adapter import PostgresAdapter
+    sig = ProcSignature("sp_remittance_hold", "proc", (
+        ProcParam("p_src", "IN", "bigint"),
+        ProcParam("p_txn_id", "INOUT", "bigint"),
+        ProcParam("p_status", "OUT", "varchar"),
+    ))
+    executed = []
+    class _Cur:
+        description = (("p_txn_id",), ("p_status",))
+        def __enter__(self): return self
+        def __exit__(self, *a): pass
+        def execute(self, sql, params): executed.append((sql, params))
+        def fetchall(self): return [{"p_txn_id": 7, "p_status": "1"}]
+    class _Conn:
+        closed = False
+        def cursor(self, cursor_factory=None): return _Cur()
+    pg = PostgresAdapter.__new__(PostgresAdapter)
+    pg.fast_call, pg.rt, pg._sigs = True, RoundTripCounter(), SignatureCache()
+    pg._sigs.put("sp_remittance_hold", sig)
+    pg._conn = contextmanager(lambda: (yield _Conn()))
+    router.set_adapter("postgres", pg)
+    try:
+        res = exec_proc({"dbms": "postgres", "name": "sp_remittance_hold", "args": [1, 0]})
+    finally:
+        router.set_adapter("postgres", None)
+    assert executed == [("CALL sp_remittance_hold(%s, %s, %s)", [1, 0, None])]
+    assert res == {"txn_id": 7, "status": "1"}
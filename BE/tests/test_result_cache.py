@@ -0,0 +1,64 @@
+# tests/test_result_cache.py
+from contextlib import contextmanager
+
+from services import file_sql_service, result_cache as rc
+from services.result_cache import ResultCache, cache_key
+
+def test_result_cache_lru_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rc.time, "monotonic", lambda: now[0])
+    c = ResultCache(max_entries=2)
+    calls = []
+    def load(v):
+        return lambda: calls.append(v) or v
+
+    assert c.get_or_load(("mysql", "a"), 5, load(1)) == 1
+    assert c.get_or_load(("mysql", "a"), 5, load(2)) == 1              # hit
+    c.get_or_load(("mysql", "b"), 5, load(3))
+    c.get_or_load(("mysql", "a"), 5, load(4))                          # a 최근 사용 → b가 LRU
+    c.get_or_load(("oracle", "c"), 5, load(5))
+    assert list(c._items) == [("mysql", "a"), ("oracle", "c")] and c.evictions == 1
+    now[0] += 5
+    assert c.get_or_load(("mysql", "a"), 5, load(6)) == 6 and c.expired == 1
+    assert c.get_or_load(("mysql", "x"), 0, load(7)) == 7 and ("mysql", "x") not in c._items   # ttl 0 = 캐시 안 함
+    assert calls == [1, 3, 5, 6, 7]
+    st = c.stats()
+    assert (st["hits"], st["misses"], st["entries"]) == (2, 4, 2)
+
+    assert c.on_commit("mysql", "sp_remittance_hold") == 0
+    assert c.on_commit("mysql", "SP_TRANSFER_CONFIRM_INTERNAL") == 1
+    assert list(c._items) == [("oracle", "c")]
+    assert cache_key("mysql", "q", {"b": 1, "a": 2}) == cache_key("MySQL", "q", {"a": 2, "b": 1})
+
+def test_run_sql_file_caches_readonly_template(monkeypatch):
+    cache = ResultCache()
+    monkeypatch.setattr(file_sql_service, "result_cache", cache)
+    calls = []
+    class _RDB:
+        @contextmanager
+        def session(self, **kw):
+            class _S:
+                def execute_query(self, sql, params):
+                    calls.append(sql)
+                    return [{"balance": len(calls)}]
+            yield _S()
+    monkeypatch.setattr(file_sql_service, "get_adapter", lambda d: _RDB())
+
+    for _ in range(3):
+        assert file_sql_service.run_sql_file("mysql", "query.accounts.all_balance", {}) == [{"balance": 1}]
+    file_sql_service.run_sql_file("mysql", "query.accounts.by_account_id", {"account_id": 1})   # TTL 없음
+    file_sql_service.run_sql_file("mysql", "query.accounts.by_account_id", {"account_id": 1})
+    assert len(calls) == 3 and cache.hits == 2
+    cache.on_commit("mysql", "sp_confirm_debit_local")
+    assert file_sql_service.run_sql_file("mysql", "query.accounts.all_balance", {}) == [{"balance": 4}]
+
+def test_cache_endpoints(monkeypatch):
+    from app import app
+    from routes import db_routes
+    cache = ResultCache()
+    cache.get_or_load(("mongo", "q"), 5, lambda: b"[]")
+    monkeypatch.setattr(db_routes, "result_cache", cache)
+    with app.test_client() as c:
+        assert c.get("/db/cache").get_json()["data"]["entries"] == 1
+        assert c.post("/db/cache/invalidate", json={"dbms": "mysql"}).get_json()["data"] == {"removed": 0}
+        assert c.post("/db/cache/invalidate").get_json()["data"] == {"removed": 1}
@@ -0,0 +1,61 @@
+# tests/test_router.py
+import pytest
+
+from app import app as flask_app
+from db import router
+
+class _FakeAdapter:
+    def __init__(self, *a, **kw):
+        self.closed = False
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def fake_build(monkeypatch):
+    built = []
+    def _build(d, cfg):
+        a = _FakeAdapter()
+        built.append((d, a))
+        return a
+    monkeypatch.setattr(router, "_build", _build)
+    router.close_adapters()
+    yield built
+    router.close_adapters()
+    router.clear_adapter_overrides()
+
+def test_adapter_is_reused_per_process(fake_build):
+    with flask_app.app_context():
+        a1 = router.get_adapter("mysql")
+        a2 = router.get_adapter("MYSQL")
+        m = router.get_adapter("mongo")
+    assert a1 is a2
+    assert m is not a1
+    assert [d for d, _ in fake_build] == ["mysql", "mongo"]
+
+def test_unsupported_dbms():
+    with pytest.raises(ValueError):
+        router.get_adapter("sqlite")
+
+def test_recreated_after_fork(fake_build, monkeypatch):
+    with flask_app.app_context():
+        a1 = router.get_adapter("postgres")
+        monkeypatch.setattr(router, "_PID", -1)   # fork 흉내
+        a2 = router.get_adapter("postgres")
+    assert a1 is not a2
+    assert not a1.closed   # 부모 쪽 리소스는 닫지 않음
+
+def test_close_adapters(fake_build):
+    with flask_app.app_context():
+        a = router.get_adapter("oracle")
+    router.close_adapters()
+    assert a.closed
+    with flask_app.app_context():
+        assert router.get_adapter("oracle") is not a
+
+def test_override_for_tests(fake_build):
+    fake = _FakeAdapter()
+    router.set_adapter("mongo", fake)
+    assert router.get_adapter("mongo") is fake   # app context 없이도 동작
+    router.set_adapter("mongo", None)
+    with flask_app.app_context():
+        assert router.get_adapter("mongo") is not fake
@@ -46,3 +46,23 @@ def test_exec_echo(client):
     assert data["ok"] is True
     assert data["data"]["returncode"] == 0
     assert "hello" in data["data"]["stdout"]
+
+def test_reset_uses_mongo_service_reset(client, monkeypatch):
+    from services import mongo_tx_service
+    from routes.system_routes import MONGO_RESET_ACCOUNTS
+    calls = []
+    svc = type("S", (), {"reset_data": lambda _s, ids: calls.append(ids) or {"result": "OK"}})()
+    monkeypatch.setattr(mongo_tx_service, "get_mongo_tx_service", lambda: svc)
+    resp = client.post("/system/reset", json={"password": os.getenv("RESET_PASSWORD", "0897")})
+    assert resp.get_json()["data"]["results"]["mongo"] == "OK"
+    assert calls == [MONGO_RESET_ACCOUNTS]
+
+def test_reset_invalidates_result_cache(client, monkeypatch):
+    from services import mongo_tx_service
+    from services.result_cache import cache_key, result_cache
+    svc = type("S", (), {"reset_data": lambda _s, ids: {"result": "OK"}})()
+    monkeypatch.setattr(mongo_tx_service, "get_mongo_tx_service", lambda: svc)
+    for dbms in ("mysql", "postgres", "oracle", "mongo"):
+        result_cache.get_or_load(cache_key(dbms, "query.accounts.balance", {}), 60, lambda: [{"balance": 1}])
+    client.post("/system/reset", json={"password": os.getenv("RESET_PASSWORD", "0897")})
+    assert result_cache.stats()["entries"] == 0
@@ -1,10 +1,19 @@
 # utils/response.py
-from flask import jsonify
+import json
 
-def ok(data, status: int = 200):
-    """성공 응답 표준 포맷"""
-    return jsonify({"ok": True, "data": data}), status
+from flask import Response, jsonify
+
+def ok(data, status: int = 200, **extra):
+    """성공 응답 표준 포맷 (extra: data 옆에 붙는 키, 예: next_cursor)"""
+    return jsonify({"ok": True, "data": data, **extra}), status
 
 def fail(message: str, status: int = 400):
     """실패 응답 표준 포맷"""
     return jsonify({"ok": False, "error": message}), status
+
+def ok_raw(data_json: bytes, status: int = 200, **extra):
+    """data가 이미 JSON bytes일 때 재직렬화 없이 ok() 포맷으로 감싸기 (키 정렬/공백 없음은 jsonify와 같음)
+    바깥 키는 jsonify와 같은 바이트, data는 넘겨받은 그대로 (dumps_json/orjson이면 한글이 UTF-8 그대로)"""
+    items = [("data", data_json)] + [(k, json.dumps(v).encode()) for k, v in {"ok": True, **extra}.items()]
+    body = b",".join(json.dumps(k).encode() + b":" + v for k, v in sorted(items))
+    return Response(b"{" + body + b"}\n", status=status, mimetype="application/json")
@@ -6,8 +6,8 @@ db.createCollection("accounts", {
       _id:         { bsonType: "string", minLength: 3 }, // 계좌번호
       name:        { bsonType: "string", minLength: 1, maxLength: 20 },
       status:      { bsonType: "string", minLength: 1, maxLength: 1 }, // 한 글자 코드
-      balance:     { bsonType: "decimal" },      // Decimal128
-      hold_amount: { bsonType: "decimal" },      // Decimal128
+      balance:     { bsonType: ["decimal","long"] },   // Decimal128 | Int64 최소 단위 (MONGO_AMOUNT_MODE)
+      hold_amount: { bsonType: ["decimal","long"] },   // Decimal128 | Int64 최소 단위
       created_at:  { bsonType: "date" },
       updated_at:  { bsonType: ["date","null"] }
     }
@@ -4,7 +4,7 @@ db.createCollection("holds", {
     required: ["account_id","amount","status","idempotency_key","created_at"],
     properties: {
       account_id:      { bsonType: "string", maxLength: 7 },
-      amount:          { bsonType: "decimal" },
+      amount:          { bsonType: ["decimal","long"] },   // Decimal128 | Int64 최소 단위 (MONGO_AMOUNT_MODE)
       status:          { bsonType: "string", minLength: 1, maxLength: 1, },
       idempotency_key: { bsonType: "string", minLength: 1, maxLength: 100 },
       created_at:      { bsonType: "date" },
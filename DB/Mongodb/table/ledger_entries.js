@@ -5,7 +5,7 @@ db.createCollection("ledger_entries", {
     properties: {
       txn_id:     { bsonType: "objectId" },
       account_id: { bsonType: "string", maxLength: 7 },
-      amount:     { bsonType: "decimal" },
+      amount:     { bsonType: ["decimal","long"] },   // Decimal128 | Int64 최소 단위 (MONGO_AMOUNT_MODE)
       created_at: { bsonType: "date" },
       updated_at: { bsonType: ["date","null"] }
     }
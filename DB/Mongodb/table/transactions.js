@@ -9,7 +9,7 @@ db.createCollection("transactions", {
       dst_account_id:  { bsonType: ["string","null"], maxLength: 7 },
       src_bank:        { bsonType: ["string","null"], maxLength: 2 },
       dst_bank:        { bsonType: ["string","null"], maxLength: 2 },
-      amount:          { bsonType: "decimal" },
+      amount:          { bsonType: ["decimal","long"] },   // Decimal128 | Int64 최소 단위 (MONGO_AMOUNT_MODE)
       idempotency_key: { bsonType: "string", minLength: 1, maxLength: 100 },
       created_at:      { bsonType: "date" },
       updated_at:      { bsonType: ["date","null"] }
@@ -9,6 +9,7 @@ CREATE TABLE `holds` (
   PRIMARY KEY (`hold_id`),
   UNIQUE KEY `ux_hold_idemp` (`idempotency_key`),
   KEY `fk_hold_account` (`account_id`),
+  KEY `ix_hold_status_created` (`status`,`created_at`),
   CONSTRAINT `fk_hold_account` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`account_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci
 
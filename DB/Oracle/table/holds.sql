@@ -8,4 +8,6 @@ CREATE TABLE holds (
   updated_at      TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL,
   CONSTRAINT fk_hold_account FOREIGN KEY (account_id) REFERENCES accounts(account_id),
   CONSTRAINT ux_hold_idemp UNIQUE (idempotency_key)
-);
\ No newline at end of file
+);
+-- 오래된 OPEN hold 정리 (hold_sweeper)
+CREATE INDEX ix_hold_status_created ON holds (status, created_at);
\ No newline at end of file
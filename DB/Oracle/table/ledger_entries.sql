@@ -7,4 +7,6 @@ CREATE TABLE ledger_entries (
   updated_at  TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL,
   CONSTRAINT fk_ledger_txn     FOREIGN KEY (txn_id)    REFERENCES transactions(txn_id),
   CONSTRAINT fk_ledger_account FOREIGN KEY (account_id) REFERENCES accounts(account_id)
-);
\ No newline at end of file
+);
+-- 계좌별 원장 keyset 페이지 (WHERE account_id = ? AND entry_id > ? ORDER BY entry_id)
+CREATE INDEX ix_ledger_account_entry ON ledger_entries (account_id, entry_id);
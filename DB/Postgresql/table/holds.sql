@@ -7,3 +7,5 @@ CREATE TABLE holds (
   created_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
   updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
 );
+-- 오래된 OPEN hold 정리 (hold_sweeper)
+CREATE INDEX ix_hold_status_created ON holds (status, created_at);
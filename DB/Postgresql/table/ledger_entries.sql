@@ -5,4 +5,6 @@ CREATE TABLE ledger_entries (
   amount      NUMERIC(19,4) NOT NULL,
   created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
   updated_at  TIMESTAMPTZ NOT NULL DEFAULT now()
-);
\ No newline at end of file
+);
+-- 계좌별 원장 keyset 페이지 (WHERE account_id = ? AND entry_id > ? ORDER BY entry_id)
+CREATE INDEX ix_ledger_account_entry ON ledger_entries (account_id, entry_id);
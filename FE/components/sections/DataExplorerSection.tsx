@@ -192,55 +192,33 @@ export default function DataExplorerSection() {
   const handleLoadBalances = async () => {
     setIsLoadingBalances(true)
     try {
-      const balances: BankBalance[] = []
-
-      // 각 DBMS별로 총 잔액 조회
-      for (const bank of banks) {
-        try {
-          let response
-
-          // MongoDB는 /db/file/mongo 엔드포인트 사용
-          if (bank.value === "mongo") {
-            response = await fetch(`${API_BASE}/db/file/mongo`, {
-              method: "POST",
-              headers: { "Content-Type": "application/json" },
-              body: JSON.stringify({
-                collection: "accounts",
-                id: "query.accounts.all_balance",
-                params: {}
-              })
-            })
-          } else {
-            response = await fetch(`${API_BASE}/db/file/sql`, {
-              method: "POST",
-              headers: { "Content-Type": "application/json" },
-              body: JSON.stringify({
-                dbms: bank.value,
-                id: "query.accounts.all_balance",
-                params: {}
-              })
-            })
-          }
-
-          const result = await response.json()
-
-          if (result.ok && Array.isArray(result.data) && result.data.length > 0) {
-            // query.accounts.all_balance는 sum(balance) as balance를 반환
-            const rawAmount = result.data[0].BALANCE || result.data[0].balance || 0
-            const totalAmount = Math.floor(Number(rawAmount))  // 소수점 제거
+      // 4개 DBMS 총 잔액을 한 번에 병렬 조회 (일부 DBMS 실패/시간 초과는 0으로 표시)
+      const response = await fetch(`${API_BASE}/db/file/fanout`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          id: "query.accounts.all_balance",
+          dbms: banks.map((bank) => bank.value),
+          params: {}
+        })
+      })
+      const result = await response.json()
+      if (!result.ok) {
+        throw new Error(result.error || "fanout failed")
+      }
 
-            balances.push({
-              bank: bank.label,
-              total_amount: totalAmount
-            })
-          } else {
-            balances.push({ bank: bank.label, total_amount: 0 })
-          }
-        } catch (error) {
-          console.error(`Failed to load balance for ${bank.label}:`, error)
-          balances.push({ bank: bank.label, total_amount: 0 })
+      const balances: BankBalance[] = banks.map((bank) => {
+        const r = result.data?.[bank.value]
+        if (r?.ok && Array.isArray(r.data) && r.data.length > 0) {
+          // query.accounts.all_balance는 sum(balance) as balance를 반환
+          const rawAmount = r.data[0].BALANCE || r.data[0].balance || 0
+          return { bank: bank.label, total_amount: Math.floor(Number(rawAmount)) }  // 소수점 제거
         }
-      }
+        if (r && !r.ok) {
+          console.error(`Failed to load balance for ${bank.label}:`, r.error)
+        }
+        return { bank: bank.label, total_amount: 0 }
+      })
 
       setBankBalances(balances)
     } catch (error) {